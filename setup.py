@@ -14,6 +14,7 @@ setup(
     entry_points={
         "console_scripts": [
             "zenflowapp = src.main:main",
+            "zenflowapp-core = src.core.daemon:main",
         ],
     },
 
@@ -0,0 +1 @@
+# Micro-benchmarks; run each module with `python -m src.benchmarks.<name>`
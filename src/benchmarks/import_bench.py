@@ -0,0 +1,91 @@
+"""
+import_bench.py
+
+Cold import-time budget check built on ``python -X importtime``.
+
+    python -m src.benchmarks.import_bench [--repeat N] [--top N]
+
+Imports each budgeted module in a fresh interpreter (best of N runs), prints
+the slowest imports underneath it, and exits with status 1 if a module is
+over its budget or if one of the lazily loaded dependencies was imported
+eagerly.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+# Cumulative cold import budget per entry module, in milliseconds.
+IMPORT_BUDGET_MS = {
+    # Qt, theme, config and the startup splash: everything before the splash shows
+    "src.main": 200,
+    # The main window and screen registry, imported while the splash is up
+    "src.main_window": 200,
+}
+
+# Heavy or optional dependencies that must only load on first use.
+LAZY_MODULES = ("psutil", "win32gui", "win32process", "websockets", "asyncio", "numpy")
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def import_times(module):
+    """{imported module: (self us, cumulative us)} for a cold `import module`."""
+    env = dict(os.environ, PYTHONPATH=_REPO_ROOT, QT_QPA_PLATFORM="offscreen")
+    # Run from a scratch directory: importing src.main opens zenflow.log in the cwd.
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd, env=env, capture_output=True, text=True,
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        try:
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue  # header line
+    return times
+
+
+def run(repeat=3):
+    """[(module, best ms, budget ms, slowest times, eager lazy modules)]"""
+    results = []
+    for module, budget in IMPORT_BUDGET_MS.items():
+        best = None
+        for _ in range(repeat):
+            times = import_times(module)
+            if best is None or times[module][1] < best[module][1]:
+                best = times
+        eager = [name for name in LAZY_MODULES if name in best]
+        results.append((module, best[module][1] / 1000, budget, best, eager))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, ms, budget, times, eager in run(args.repeat):
+        over = ms > budget
+        failed = failed or over or bool(eager)
+        print(f"{module}: {ms:.1f} ms (budget {budget} ms){'  OVER BUDGET' if over else ''}")
+        slowest = sorted(times.items(), key=lambda kv: kv[1][1], reverse=True)
+        for name, (_, cumulative) in slowest[1:args.top + 1]:
+            print(f"    {cumulative / 1000:>8.1f} ms  {name}")
+        if eager:
+            print(f"    imported eagerly (should be lazy): {', '.join(eager)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""
+theme_bench.py
+
+Screen construction and style re-polish benchmark.
+
+    python -m src.benchmarks.theme_bench [--repeat N]
+
+Builds every screen N times (including polishing all child widgets, which is
+where stylesheets are parsed) and then times a full application re-polish,
+the cost paid whenever the application stylesheet changes.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+
+def _screens():
+    from src.screens.splash_screen import SplashScreen
+    from src.screens.intent_screen import IntentScreen
+    from src.screens.app_setup_screen import AppSetupScreen
+    from src.screens.focus_dashboard_screen import FocusDashboardScreen
+    from src.screens.settings_screen import SettingsScreen
+    from src.screens.session_summary_screen import SessionSummaryScreen
+    from src.screens.blocked_overlay_screen import BlockedOverlayScreen
+    from src.screens.history_screen import HistoryScreen
+    return {
+        "splash": lambda state: SplashScreen(None),
+        "intent": lambda state: IntentScreen(None, state),
+        "app_setup": lambda state: AppSetupScreen(None, state),
+        "dashboard": lambda state: FocusDashboardScreen(None, state),
+        "settings": lambda state: SettingsScreen(None, state),
+        "summary": lambda state: SessionSummaryScreen(None, state),
+        "overlay": lambda state: BlockedOverlayScreen(None, "YouTube"),
+        "history": lambda state: HistoryScreen(None, state),
+    }
+
+
+def _sample_state():
+    from src.utils.store import default_state
+    state = default_state()
+    state["selectedCategories"] = ["Coding", "Writing"]
+    state["sessionHistory"] = [
+        {
+            "startTime": "Thu Dec 11 21:00:19 2025",
+            "endedAt": "Thu Dec 11 21:50:19 2025",
+            "elapsedSeconds": 3000,
+            "selectedCategories": ["Coding"],
+            "sessionRules": {"allowedApps": ["VS Code"], "blockedApps": ["YouTube"]},
+            "distractionAttempts": 2,
+        }
+    ]
+    return state
+
+
+_app = None
+
+
+def _application():
+    global _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from src.theme import apply_global_theme
+
+    if _app is None:
+        _app = QApplication.instance() or QApplication(sys.argv)
+        apply_global_theme(_app)
+    return _app
+
+
+def run(repeat=20):
+    from PyQt5.QtWidgets import QWidget
+
+    app = _application()
+
+    results = {}
+    alive = []
+    for name, build in _screens().items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            screen = build(_sample_state())
+            screen.ensurePolished()
+            for child in screen.findChildren(QWidget):
+                child.ensurePolished()
+            alive.append(screen)
+        results[name] = (time.perf_counter() - start) * 1000 / repeat
+
+    widgets = sum(len(s.findChildren(QWidget)) + 1 for s in alive)
+    start = time.perf_counter()
+    app.setStyleSheet(app.styleSheet())
+    for screen in alive:
+        for child in screen.findChildren(QWidget):
+            child.ensurePolished()
+    repolish_ms = (time.perf_counter() - start) * 1000
+
+    for screen in alive:
+        screen.deleteLater()
+    return results, repolish_ms, widgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    results, repolish_ms, widgets = run(args.repeat)
+    print(f"{'screen':<12}{'build+polish (ms)':>20}")
+    for name, ms in results.items():
+        print(f"{name:<12}{ms:>20.2f}")
+    print(f"{'total':<12}{sum(results.values()):>20.2f}")
+    print(f"re-polish of {widgets} widgets: {repolish_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""
+tray_bench.py
+
+Memory before and after the main window goes to the tray.
+
+    python -m src.benchmarks.tray_bench
+
+Opens the window on a running session, visits every screen, then enters
+tray mode and reopens the window, printing RSS and live widget counts for
+each step and how long the rebuild took. Exits with status 1 if widgets
+outlive tray mode (beyond the overlay and the empty window) or RSS went up.
+Runs against a scratch data directory with the core daemon embedded.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+# Widgets that stay in tray mode: the prewarmed overlay and the window shell.
+TRAY_WIDGET_BUDGET = 40
+
+
+def _pump(app, seconds):
+    from PyQt5.QtCore import QEvent
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.005)
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def run():
+    """[(step, rss KB or None, live widgets, ms)]"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    data_dir = os.environ["ZENFLOW_DATA_DIR"] = tempfile.mkdtemp(prefix="zenflow-tray-bench-")
+    from PyQt5.QtWidgets import QApplication
+    from src.theme import apply_global_theme
+    from src.main_window import MainWindow
+    from src.utils.config import AppConfig
+    from src.screens.registry import SCREENS, process_rss_kb, trim_process_memory
+    from src.tray import TrayIcon
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    apply_global_theme(app)
+    steps = []
+
+    def step(name, ms=None):
+        steps.append((name, process_rss_kb(), len(QApplication.allWidgets()), ms))
+
+    config = AppConfig(os.path.join(data_dir, "config.json"))
+    config.set("settings.core_daemon", "embedded")
+    window = MainWindow(config)
+    if window.tray is None:
+        # No system tray offscreen; the icon just stays invisible
+        window.tray = TrayIcon(window)
+    window.show()
+    _pump(app, 1.0)
+    window.state["sessionRules"] = {"allowedApps": ["code"], "blockedApps": ["steam"]}
+    window.state["activeSessionData"] = {"startTime": time.ctime(), "startEpoch": time.time(),
+                                         "distractionAttempts": 0}
+    for name in SCREENS:
+        if name not in ("splash", "dashboard"):
+            window._show_screen(name)
+            _pump(app, 0.05)
+    window.show_dashboard()
+    _pump(app, 0.3)
+    step("open, all screens visited")
+
+    window.enter_tray_mode()
+    _pump(app, 0.1)
+    step("tray, screens deleted")
+    trim_process_memory()
+    step("tray, heap trimmed")
+
+    window._record_distraction("Steam", "launch")
+    started = time.perf_counter()
+    window.show_from_tray()
+    app.processEvents()
+    step("reopened", (time.perf_counter() - started) * 1000)
+    counted = window.dashboard_screen.distraction_count
+
+    window.quit_app()
+    _pump(app, 0.1)
+    return steps, counted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args(argv)
+    steps, counted = run()
+    print(f"{'step':<28}{'RSS (KB)':>10}{'widgets':>9}{'ms':>8}")
+    for name, rss, widgets, ms in steps:
+        rss_text = "n/a" if rss is None else str(rss)
+        ms_text = "" if ms is None else f"{ms:.1f}"
+        print(f"{name:<28}{rss_text:>10}{widgets:>9}{ms_text:>8}")
+    opened, tray, trimmed = steps[0], steps[1], steps[2]
+    if opened[1] is not None:
+        print(f"tray mode: {opened[1] - trimmed[1]:+d} KB freed, "
+              f"{opened[2] - trimmed[2]} widgets deleted")
+    failed = tray[2] > TRAY_WIDGET_BUDGET
+    if failed:
+        print(f"  {tray[2]} widgets left in tray mode (budget {TRAY_WIDGET_BUDGET})")
+    if opened[1] is not None and trimmed[1] > opened[1]:
+        print("  RSS grew in tray mode")
+        failed = True
+    if counted != 1:
+        print(f"  distraction while in the tray counted {counted} times")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
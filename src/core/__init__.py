@@ -0,0 +1 @@
+# Headless core daemon (no Qt) and the UI's client for it; see daemon.py
@@ -0,0 +1,178 @@
+"""
+client.py
+
+The UI's connection to the core daemon (see daemon.py and protocol.py).
+
+CoreClient.connect() uses the running daemon, or starts one as a separate
+process (python -m src.core, detached so it outlives the window). If that
+fails too (no interpreter to run, socket directory not writable) the daemon
+runs embedded on a thread of the UI process instead: blocking then stops
+with the window, as it did before the daemon existed.
+
+connect_async() does all of that on a thread, so a daemon that has to be
+started never holds up the window; it reports {"event": "connected",
+"mode": ...} when done. multiprocessing and subprocess are imported there
+too, keeping them out of the window's import time.
+
+Events from the daemon are read on a thread and passed to on_event there;
+the UI forwards them to the GUI thread through a queued Qt signal.
+"""
+
+from __future__ import annotations
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from src.utils import store
+
+logger = logging.getLogger(__name__)
+
+# How long to wait for a freshly started daemon to accept connections.
+DAEMON_START_TIMEOUT_S = 3.0
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def spawn_daemon():
+    """Start python -m src.core detached from this process."""
+    import subprocess
+    env = dict(os.environ, ZENFLOW_DATA_DIR=os.path.dirname(store.DATA_FILE))
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (_REPO_ROOT, env.get("PYTHONPATH")) if p)
+    if sys.platform.startswith("win"):
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
+    return subprocess.Popen([sys.executable, "-m", "src.core"], cwd=_REPO_ROOT, env=env,
+                            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, close_fds=True, **detach)
+
+
+class CoreClient:
+    def __init__(self, on_event: Callable[[Dict], None], config=None, spawn: bool = True):
+        self.on_event = on_event
+        self.config = config
+        self.spawn = spawn
+        self.mode: Optional[str] = None   # "connected", "spawned" or "embedded"
+        self._conn = None
+        self._send_lock = threading.Lock()
+        self._embedded = None
+        self._embedded_thread: Optional[threading.Thread] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None
+
+    def connect_async(self) -> None:
+        def run():
+            self.on_event({"event": "connected", "mode": self.connect()})
+        threading.Thread(target=run, name="core-connect", daemon=True).start()
+
+    def connect(self) -> Optional[str]:
+        """Connect (starting the daemon if needed) and ask for a snapshot."""
+        from src.core import protocol
+        conn = protocol.connect()
+        mode = "connected"
+        if conn is None and self.spawn:
+            conn = self._spawn_and_connect()
+            mode = "spawned"
+        if conn is None:
+            conn = self._start_embedded()
+            mode = "embedded"
+        if conn is None:
+            logger.error("Core daemon unavailable; blocking is off")
+            return None
+        self._conn = conn
+        self.mode = mode
+        threading.Thread(target=self._read_loop, args=(conn,), name="core-client", daemon=True).start()
+        self.send("hello")
+        logger.info(f"Core daemon {mode}")
+        return mode
+
+    def _spawn_and_connect(self):
+        from src.core import protocol
+        try:
+            process = spawn_daemon()
+        except OSError as e:
+            logger.warning(f"Could not start the core daemon: {e}")
+            return None
+        deadline = time.monotonic() + DAEMON_START_TIMEOUT_S
+        while time.monotonic() < deadline:
+            conn = protocol.connect()
+            if conn is not None:
+                return conn
+            if process.poll() is not None:
+                # Exited: it lost a race to another daemon, or failed to start.
+                return protocol.connect()
+            time.sleep(0.02)
+        logger.warning("Core daemon did not come up in time")
+        return None
+
+    def _start_embedded(self):
+        from src.core import protocol
+        from src.core.daemon import DaemonRunning, FocusDaemon
+        daemon = FocusDaemon(self.config, idle_exit_ms=None)
+        try:
+            daemon.start()
+        except DaemonRunning:
+            return protocol.connect()
+        except OSError as e:
+            logger.error(f"Could not run the core daemon: {e}")
+            return None
+        self._embedded = daemon
+        self._embedded_thread = threading.Thread(target=daemon.serve_forever, name="core-daemon", daemon=True)
+        self._embedded_thread.start()
+        return protocol.connect()
+
+    def send(self, op: str, **fields) -> bool:
+        conn = self._conn
+        if conn is None:
+            return False
+        try:
+            # connect() says hello from its own thread
+            with self._send_lock:
+                conn.send(dict(fields, op=op))
+            return True
+        except (OSError, EOFError):
+            self.reset()
+            return False
+
+    def reset(self) -> None:
+        """Forget a connection the daemon closed; connect() again later."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _read_loop(self, conn) -> None:
+        while True:
+            try:
+                event = conn.recv()
+            except (EOFError, OSError, TypeError):
+                # TypeError: close() on the GUI thread dropped the handle mid-recv
+                break
+            try:
+                self.on_event(event)
+            except Exception:
+                logger.exception("Core event handler failed")
+        if conn is self._conn:
+            self.on_event({"event": "disconnected"})
+
+    def close(self) -> None:
+        """Disconnect; an embedded daemon stops with the UI."""
+        # Forget the connection first, so its hang-up is not reported as lost
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            # Closing our end does not interrupt the reader's recv(), so the
+            # daemon would never see us leave; it hangs up instead.
+            with self._send_lock:
+                conn.send({"op": "shutdown" if self._embedded is not None else "bye"})
+        except (OSError, EOFError):
+            pass
+        if self._embedded is not None:
+            self._embedded_thread.join(timeout=2.0)
+            self._embedded = None
+        conn.close()
@@ -0,0 +1,757 @@
+"""
+daemon.py
+
+The headless core: everything that decides and enforces blocks, without Qt.
+
+FocusDaemon owns the store (zenflow_data.json), the watchers (browser tabs,
+foreground window, app launches), the compiled rules, daily budgets, hard
+enforcement and the overlay verdicts, all driven by one Scheduler from a
+single loop. The PyQt UI is a client (see client.py): it sends state changes
+and user decisions, and is told when to show or hide the overlay. Closing
+the window therefore does not stop blocking, and no widget tree has to stay
+resident for a session to be enforced.
+
+The daemon knows a session is running from state["activeSessionData"], as
+saved by the UI. It exits on its own once no UI is connected and no session
+is running for idle_exit_ms. When a block needs the overlay and no UI is
+connected, it starts one (ui_command).
+
+State keys in DAEMON_KEYS are maintained here; the daemon's values win over
+the copy in a state the UI saves.
+
+Run as its own process, the daemon reloads config.json when it changes (see
+config_watch.py, polled here since there is no Qt); embedded, the UI's
+reloads reach it through the shared AppConfig. Either way only the overlay
+timings are re-applied, and only when they changed.
+
+Run with: python -m src.core
+"""
+
+from __future__ import annotations
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Pipe, wait
+from queue import Empty, Queue
+from typing import Dict, List, Optional, Sequence
+
+from src.core import protocol
+from src.utils.store import load_state, save_state
+from src.utils.budgets import UsageBudgets
+from src.utils.config_watch import ConfigWatcher, POLL_MS as CONFIG_POLL_MS
+from src.utils.enforcement import Enforcer
+from src.utils.foreground import load_foreground_backend
+from src.utils.launch_monitor import LaunchMonitor
+from src.utils.metrics import LatencyStats
+from src.utils.processes import ProcessTable
+from src.utils.rules import OVERLAY, compile_rules, rules_key
+from src.utils.scheduler import Scheduler
+from src.utils.transitions import (
+    OverlayTransitionController,
+    DEFAULT_SHOW_DWELL_MS,
+    DEFAULT_HIDE_HYSTERESIS_MS,
+    DEFAULT_COALESCE_MS,
+)
+from src.web_watcher import WebWatcher
+
+logger = logging.getLogger(__name__)
+
+DAEMON_KEYS = ("budgetUsage", "suspendedProcesses")
+
+# Monitoring polls; the web queue may run late to share the desktop poll's wakeup.
+DESKTOP_POLL_MS = 500
+DESKTOP_POLL_TOLERANCE_MS = 100
+WEB_EVENTS_MS = 1000
+WEB_EVENTS_TOLERANCE_MS = 500
+
+# A blocked launch keeps the overlay up this long even if the app never
+# reaches the foreground (the desktop poll takes over once it does).
+LAUNCH_BLOCK_MS = 3000
+
+# Budget usage is written this often while budgets are set, besides every
+# save the UI asks for.
+STORE_FLUSH_MS = 5 * 60 * 1000
+
+DEFAULT_IDLE_EXIT_MS = 30 * 1000
+# At most one UI start per this interval when blocks keep coming.
+UI_RELAUNCH_MS = 15 * 1000
+
+BROWSER_EXES = ['chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'brave.exe']
+BROWSER_BLOCKED_SITES = ['instagram', 'youtube', 'facebook', 'twitter', 'tiktok', 'reddit', 'netflix', 'linkedin']
+
+SITE_NAMES = {
+    'instagram': 'Instagram',
+    'youtube': 'YouTube',
+    'facebook': 'Facebook',
+    'twitter': 'Twitter',
+    'tiktok': 'TikTok',
+    'reddit': 'Reddit',
+    'netflix': 'Netflix',
+    'linkedin': 'LinkedIn',
+    'twitch': 'Twitch',
+    'discord': 'Discord',
+    'spotify': 'Spotify',
+}
+
+APP_NAMES = {
+    'chrome.exe': 'Google Chrome',
+    'firefox.exe': 'Mozilla Firefox',
+    'msedge.exe': 'Microsoft Edge',
+    'iexplore.exe': 'Internet Explorer',
+    'opera.exe': 'Opera',
+    'brave.exe': 'Brave Browser',
+    'code.exe': 'Visual Studio Code',
+    'pycharm.exe': 'PyCharm',
+    'idea64.exe': 'IntelliJ IDEA',
+    'sublime_text.exe': 'Sublime Text',
+    'notepad++.exe': 'Notepad++',
+    'notepad.exe': 'Notepad',
+    'winword.exe': 'Microsoft Word',
+    'excel.exe': 'Microsoft Excel',
+    'powerpnt.exe': 'Microsoft PowerPoint',
+    'discord.exe': 'Discord',
+    'slack.exe': 'Slack',
+    'teams.exe': 'Microsoft Teams',
+    'zoom.exe': 'Zoom',
+    'spotify.exe': 'Spotify',
+    'itunes.exe': 'iTunes',
+    'vlc.exe': 'VLC Media Player',
+    'youtube.exe': 'YouTube',
+    'instagram.exe': 'Instagram',
+    'tiktok.exe': 'TikTok',
+    'twitter.exe': 'Twitter',
+    'facebook.exe': 'Facebook',
+    'reddit.exe': 'Reddit',
+    'netflix.exe': 'Netflix',
+}
+
+
+def site_from_title(window_title: str) -> str:
+    """Extract the website name from the browser window title."""
+    for site_key, site_name in SITE_NAMES.items():
+        if site_key in window_title.lower():
+            return site_name
+    # Fallback to generic browser detection
+    return "Blocked Website"
+
+
+def friendly_app_name(exe_name: str) -> str:
+    """Convert exe name to a more user-friendly name."""
+    # Remove .exe extension and convert to title case
+    base_name = exe_name.replace('.exe', '').title()
+    return APP_NAMES.get(exe_name, base_name)
+
+
+class DaemonRunning(RuntimeError):
+    """Another daemon already serves this data directory."""
+
+
+class FocusDaemon:
+    def __init__(self, config=None, ui_command: Optional[Sequence[str]] = None,
+                 idle_exit_ms: Optional[int] = DEFAULT_IDLE_EXIT_MS, watch_config: bool = False):
+        self.config = config
+        self.watch_config = watch_config and config is not None
+        self.config_watcher: Optional[ConfigWatcher] = None
+        self.ui_command = list(ui_command) if ui_command else None
+        self.idle_exit_ms = idle_exit_ms
+        self.state = load_state()
+        self.budgets = UsageBudgets(self.state)
+        self.rules = compile_rules(self.state)
+        self.scheduler = Scheduler()
+
+        # Coalesces rapid blocked/allowed flips into one overlay change
+        self.overlay_transitions = OverlayTransitionController(
+            self._config_value("settings.overlay_show_dwell_ms", DEFAULT_SHOW_DWELL_MS),
+            self._config_value("settings.overlay_hide_hysteresis_ms", DEFAULT_HIDE_HYSTERESIS_MS),
+            self._config_value("settings.distraction_coalesce_ms", DEFAULT_COALESCE_MS),
+        )
+        self._overlay: Optional[Dict] = None
+        # Overlay name -> what Allow Once lifts: {"exe" | "domain" | "budget": key}
+        self._overlay_targets: Dict[str, Dict[str, str]] = {}
+        self._reported_flaps = 0
+        self._config_unsubscribe = (config.subscribe(self._on_config_changed, "settings")
+                                    if config is not None else None)
+
+        # Per session, cleared when a new one starts
+        self.allowed_exes_session = set()
+        self.allowed_domains_session = set()
+        self.allowed_budgets_session = set()
+        self.current_blocked_exe = None
+        self.current_blocked_domain = None
+        self.current_web_domain = None
+        self._session_id = None
+
+        # Platform backend, loaded (with its imports) on the first poll
+        self.foreground_backend = None
+        self._foreground = (None, None)
+
+        self.web_event_queue = Queue()
+        self.web_watcher = WebWatcher(self.web_event_queue)
+        # Shared process table; refreshes periodically only while subscribed
+        self.processes = ProcessTable(scheduler=self.scheduler)
+        # Launches arrive on the monitor's thread and are handled in the loop
+        self._launches = Queue()
+        # Other work handed over from threads (config reloads), run in the loop
+        self._calls = Queue()
+        self.launch_monitor = LaunchMonitor(self.processes, self._on_launch, self.rules)
+        self.launch_latency = LatencyStats("launch.exec_to_match_ms")
+        self.enforcer = Enforcer(self.processes)
+
+        self.clients = []
+        self._accepted = Queue()
+        # Blocks decided while no UI was connected, recorded by the next one
+        self._pending_distractions: List[List[str]] = []
+        self._ui_started_at: Optional[float] = None
+        self._wake_reader, self._wake_writer = Pipe(duplex=False)
+        self._wake_lock = threading.Lock()
+        self._listener: Optional[Listener] = None
+        self._running = False
+
+    def _config_value(self, key, default):
+        if self.config is None:
+            return default
+        # Typed like the default: a hand-edited "500" still reads as 500
+        return self.config.setting(key, default, type(default)).value
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def start(self) -> None:
+        """Take the address and start the watchers; serve_forever() runs the loop."""
+        if self._listener is not None:
+            return
+        address = protocol.daemon_address()
+        running = protocol.connect()
+        if running is not None:
+            running.close()
+            raise DaemonRunning(address)
+        if protocol.address_family() == "AF_UNIX" and os.path.exists(address):
+            os.unlink(address)   # left by a daemon that did not exit cleanly
+        self._listener = Listener(address, family=protocol.address_family(), authkey=protocol.authkey())
+        self._running = True
+        threading.Thread(target=self._accept_loop, args=(self._listener,),
+                         name="core-accept", daemon=True).start()
+
+        self.web_watcher.start()
+        self.scheduler.add("monitor.web", self._process_web_events, WEB_EVENTS_MS,
+                           tolerance_ms=WEB_EVENTS_TOLERANCE_MS, group="monitor")
+        self.scheduler.add("monitor.desktop", self._check_active_window, DESKTOP_POLL_MS,
+                           tolerance_ms=DESKTOP_POLL_TOLERANCE_MS, group="monitor")
+        self.scheduler.add("store.flush", self._flush_store, STORE_FLUSH_MS,
+                           tolerance_ms=STORE_FLUSH_MS // 2)
+        if self.watch_config:
+            self.config_watcher = ConfigWatcher({"config": self.config.config_file}, self._on_config_reload,
+                                                self.scheduler, self._call_soon)
+            self.config_watcher.start(poll_ms=CONFIG_POLL_MS)
+        # Processes left suspended by a run that did not end cleanly
+        if self.state.get("suspendedProcesses"):
+            self.enforcer.adopt(self.state["suspendedProcesses"])
+            self.resume_suspended()
+        self._apply_state()
+        logger.info(f"Core daemon listening on {address} (pid {os.getpid()})")
+
+    def serve_forever(self) -> None:
+        self.start()
+        try:
+            while self._running:
+                self._run_once()
+        finally:
+            self._shutdown()
+
+    def stop(self) -> None:
+        """Leave serve_forever() (callable from any thread)."""
+        self._running = False
+        self._wake()
+
+    def _wake(self) -> None:
+        with self._wake_lock:
+            try:
+                self._wake_writer.send_bytes(b"")
+            except OSError:
+                pass
+
+    def _run_once(self) -> None:
+        delay = self.scheduler.next_wakeup_ms()
+        ready = wait([self._wake_reader] + self.clients, None if delay is None else delay / 1000)
+        for conn in ready:
+            if conn is self._wake_reader:
+                while self._wake_reader.poll():
+                    self._wake_reader.recv_bytes()
+            else:
+                self._receive(conn)
+        self._take_clients()
+        self._drain_launches()
+        self._drain_calls()
+        self.scheduler.run_due()
+
+    def _shutdown(self) -> None:
+        self.resume_suspended()
+        if self._config_unsubscribe is not None:
+            # Embedded, the config is the UI's and outlives this daemon
+            self._config_unsubscribe()
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        self.launch_monitor.stop()
+        self.web_watcher.stop()
+        self._flush_store(force=True)
+        for conn in self.clients:
+            conn.close()
+        self.clients = []
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        logger.info("Core daemon stopped")
+
+    # -- clients -------------------------------------------------------------
+
+    def _accept_loop(self, listener: Listener) -> None:
+        while True:
+            try:
+                conn = listener.accept()
+            except AuthenticationError:
+                logger.warning("Rejected a connection with the wrong key")
+                continue
+            except (OSError, EOFError):
+                return   # listener closed
+            self._accepted.put(conn)
+            self._wake()
+
+    def _take_clients(self) -> None:
+        changed = False
+        while True:
+            try:
+                self.clients.append(self._accepted.get_nowait())
+                changed = True
+            except Empty:
+                break
+        if changed:
+            self._schedule_idle_exit()
+
+    def _drop(self, conn) -> None:
+        if conn in self.clients:
+            self.clients.remove(conn)
+            conn.close()
+            self._schedule_idle_exit()
+
+    def _receive(self, conn) -> None:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            self._drop(conn)
+            return
+        handler = getattr(self, f"_op_{message.get('op')}", None)
+        if handler is None:
+            logger.warning(f"Unknown request {message.get('op')!r}")
+            return
+        try:
+            handler(conn, message)
+        except Exception:
+            logger.exception(f"Request {message.get('op')!r} failed")
+
+    def _send(self, conn, event: Dict) -> None:
+        try:
+            conn.send(event)
+        except (OSError, EOFError):
+            self._drop(conn)
+
+    def _broadcast(self, event: Dict) -> None:
+        for conn in list(self.clients):
+            self._send(conn, event)
+
+    def _schedule_idle_exit(self) -> None:
+        if self.idle_exit_ms is None or self.clients or self.session_active:
+            self.scheduler.cancel("daemon.idle_exit")
+        elif "daemon.idle_exit" not in self.scheduler.jobs:
+            self.scheduler.add("daemon.idle_exit", self.stop, delay_ms=self.idle_exit_ms)
+
+    def _start_ui(self) -> None:
+        """Open a UI to show the overlay when none is connected."""
+        if self.clients or not self.ui_command:
+            return
+        now = time.monotonic()
+        if self._ui_started_at is not None and now - self._ui_started_at < UI_RELAUNCH_MS / 1000:
+            return
+        self._ui_started_at = now
+        try:
+            subprocess.Popen(self.ui_command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL)
+            logger.info("Started the UI to show a block")
+        except OSError as e:
+            logger.warning(f"Could not start the UI: {e}")
+
+    # -- requests ------------------------------------------------------------
+
+    def _op_hello(self, conn, message) -> None:
+        self._send(conn, {
+            "event": "snapshot",
+            "overlay": self._overlay,
+            "distractions": self._pending_distractions,
+            "suspended": self._suspended_apps(),
+            "foreground": list(self._foreground),
+            "suppressedFlaps": self.overlay_transitions.suppressed_flaps,
+            "stats": self.stats(),
+        })
+        self._pending_distractions = []
+
+    def _op_save_state(self, conn, message) -> None:
+        state = message["state"]
+        for key in DAEMON_KEYS:
+            if key in self.state:
+                state[key] = self.state[key]
+        self.state = state
+        self.budgets.checkpoint()
+        save_state(self.state)
+        self._apply_state()
+
+    def _op_allow_exe(self, conn, message) -> None:
+        name = message["name"]
+        self.allowed_exes_session.add(name.lower())
+        if self.enforcer.resume(name):
+            self._suspended_changed()
+
+    def _op_allow_domain(self, conn, message) -> None:
+        self.allowed_domains_session.add(message["domain"].lower())
+
+    def _op_allow_budget(self, conn, message) -> None:
+        self.allowed_budgets_session.add(message["key"])
+
+    def _op_dismissed(self, conn, message) -> None:
+        self.overlay_transitions.dismissed()
+        self._overlay = None
+
+    def _op_resume_suspended(self, conn, message) -> None:
+        self.resume_suspended()
+
+    def _op_bye(self, conn, message) -> None:
+        self._drop(conn)
+
+    def _op_shutdown(self, conn, message) -> None:
+        self.stop()
+
+    def stats(self) -> Dict:
+        return {
+            "pid": os.getpid(),
+            "launchBackend": self.launch_monitor.backend,
+            "launchLatency": self.launch_latency.summary(),
+            "foregroundBackend": getattr(self.foreground_backend, "name", None),
+        }
+
+    # -- state ---------------------------------------------------------------
+
+    @property
+    def session_active(self) -> bool:
+        return self._session_id is not None
+
+    def _apply_state(self) -> None:
+        self.budgets.set_rules(self.state)
+        if rules_key(self.state) != self.rules.key:
+            self.rules = compile_rules(self.state)
+            self.launch_monitor.set_rules(self.rules)
+        active = self.state.get("activeSessionData") or {}
+        session_id = active.get("startTime") if active else None
+        if session_id != self._session_id:
+            if self._session_id is not None:
+                self.resume_suspended()
+            self._session_id = session_id
+            self.allowed_exes_session.clear()
+            self.allowed_domains_session.clear()
+            self.allowed_budgets_session.clear()
+            self._overlay_targets.clear()
+            self.overlay_transitions.reset_counters()
+            self._report_flaps()
+            logger.info(f"Session {'started' if session_id else 'ended'}")
+        # Watch launches only while a session with blocked apps runs
+        if self.session_active and self.rules:
+            self.launch_monitor.start()
+        else:
+            self.launch_monitor.stop()
+        self._schedule_idle_exit()
+
+    def _flush_store(self, force: bool = False) -> None:
+        if force or self.budgets.limits:
+            self.budgets.checkpoint()
+            save_state(self.state)
+
+    # -- overlay -------------------------------------------------------------
+
+    def _apply_transition(self, transition) -> None:
+        if transition is not None:
+            if transition.action == "show":
+                self._overlay = {"name": transition.name, "source": transition.source,
+                                 "target": self._overlay_targets.get(transition.name)}
+                if not self.clients:
+                    if transition.new_distraction:
+                        self._pending_distractions.append([transition.name, transition.source])
+                    self._start_ui()
+            else:
+                self._overlay = None
+            self._broadcast({"event": "overlay", "action": transition.action, "name": transition.name,
+                             "source": transition.source, "new_distraction": transition.new_distraction,
+                             "target": self._overlay_targets.get(transition.name)})
+        self._report_flaps()
+
+    def _report_flaps(self) -> None:
+        flaps = self.overlay_transitions.suppressed_flaps
+        if flaps != self._reported_flaps:
+            self._reported_flaps = flaps
+            self._broadcast({"event": "status", "suppressedFlaps": flaps})
+
+    def _report_block(self, channel: str, name: Optional[str], source: Optional[str] = None, **target):
+        """overlay_transitions.update(), remembering what Allow Once on name lifts."""
+        if name:
+            self._overlay_targets[name] = target
+        return self.overlay_transitions.update(channel, name, source)
+
+    def _record_distraction(self, name: str, source: str) -> None:
+        if self.clients:
+            self._broadcast({"event": "distraction", "name": name, "source": source})
+        else:
+            self._pending_distractions.append([name, source])
+
+    # -- config --------------------------------------------------------------
+
+    def _call_soon(self, fn) -> None:
+        # Any thread
+        self._calls.put(fn)
+        self._wake()
+
+    def _drain_calls(self) -> None:
+        while True:
+            try:
+                fn = self._calls.get_nowait()
+            except Empty:
+                return
+            try:
+                fn()
+            except Exception:
+                logger.exception("Deferred call failed")
+
+    def _on_config_reload(self, name, data, changed) -> None:
+        self.config.apply(data)
+
+    def _on_config_changed(self, keys) -> None:
+        timing = {"settings.overlay_show_dwell_ms", "settings.overlay_hide_hysteresis_ms",
+                  "settings.distraction_coalesce_ms"}
+        if keys & timing:
+            self.overlay_transitions.configure(
+                self._config_value("settings.overlay_show_dwell_ms", DEFAULT_SHOW_DWELL_MS),
+                self._config_value("settings.overlay_hide_hysteresis_ms", DEFAULT_HIDE_HYSTERESIS_MS),
+                self._config_value("settings.distraction_coalesce_ms", DEFAULT_COALESCE_MS),
+            )
+            logger.info("Overlay timings updated from config")
+
+    # -- launches and enforcement --------------------------------------------
+
+    def _on_launch(self, launch) -> None:
+        # Launch monitor thread
+        self._launches.put(launch)
+        self._wake()
+
+    def _drain_launches(self) -> None:
+        while True:
+            try:
+                launch = self._launches.get_nowait()
+            except Empty:
+                return
+            self._on_blocked_launch(launch)
+
+    def _on_blocked_launch(self, launch) -> None:
+        if launch.detect_ms is not None:
+            self.launch_latency.add(launch.detect_ms)
+        if (not self.session_active or not self.launch_monitor.running
+                or launch.name in self.allowed_exes_session):
+            return
+        logger.info(f"Blocked app launched: {launch.name} (pid {launch.pid}, rule {launch.rule!r})")
+        if self._enforce(launch.name, launch.rule, launch.pid):
+            return
+        self._apply_transition(self._report_block(
+            "launch", friendly_app_name(launch.name), "launch", exe=launch.name))
+        self.scheduler.add("launch.clear", self._clear_launch_block, delay_ms=LAUNCH_BLOCK_MS)
+
+    def _clear_launch_block(self) -> None:
+        self._apply_transition(self.overlay_transitions.update("launch", None))
+
+    def _enforce(self, name, rule, pid=None) -> bool:
+        """Suspend or close a blocked app whose rule asks for it.
+
+        Returns False when the overlay should deal with it instead: the rule
+        uses the overlay, or its processes could not be controlled. Nothing
+        is suspended or closed outside a session: resume_suspended() ran when
+        it ended and the session rules are only kept for the next one.
+        """
+        policy = self.rules.policy(rule)
+        if policy == OVERLAY or not self.session_active:
+            return False
+        known = self.enforcer.is_suspended(name)
+        pids = self.processes.pids_for_exe(name)
+        if pid is not None:
+            pids.add(pid)
+        if not self.enforcer.enforce(policy, name, rule, pids):
+            return False
+        if not known:
+            self._record_distraction(friendly_app_name(name), policy)
+        self._suspended_changed()
+        return True
+
+    def resume_suspended(self) -> None:
+        """Resume every process hard enforcement suspended (session end, exit)."""
+        if self.enforcer.suspended:
+            logger.info(f"Resumed {self.enforcer.resume_all()} suspended processes")
+        self._suspended_changed()
+
+    def _suspended_apps(self) -> List[List[str]]:
+        return [[name, friendly_app_name(name)] for name in self.enforcer.suspended_apps()]
+
+    def _suspended_changed(self) -> None:
+        # Persisted so a crash does not leave apps frozen (see start())
+        snapshot = self.enforcer.snapshot()
+        if snapshot != self.state.get("suspendedProcesses", []):
+            self.state["suspendedProcesses"] = snapshot
+            save_state(self.state)
+            self._broadcast({"event": "suspended", "apps": self._suspended_apps()})
+
+    # -- watchers ------------------------------------------------------------
+
+    def _set_foreground(self, exe, domain) -> None:
+        if (exe, domain) != self._foreground:
+            self._foreground = (exe, domain)
+            self._broadcast({"event": "foreground", "exe": exe, "domain": domain})
+
+    def _check_active_window(self) -> None:
+        """Check the currently active window and show overlay if it's a blocked app or website."""
+        try:
+            # Get the foreground window
+            if self.foreground_backend is None:
+                self.foreground_backend = load_foreground_backend(self.processes)
+            window = self.foreground_backend.foreground()
+            if window is None:
+                return
+            exe_name = window.exe
+            window_title = window.title
+
+            # Session rules block only while a session runs; budgets are daily
+            session_active = self.session_active
+
+            # Check if exe name contains any blocked app names
+            app_rule = self.rules.match_exe(exe_name) if session_active else None
+            is_blocked_app = app_rule is not None
+
+            # Check if window title contains any blocked website names
+            is_blocked_site = session_active and self.rules.match(window_title) is not None
+
+            # Special handling for browsers - check window title for blocked sites
+            is_browser = exe_name in BROWSER_EXES
+            if is_browser and not is_blocked_app and session_active:
+                # Check window title for blocked sites
+                is_blocked_site = any(site in window_title for site in BROWSER_BLOCKED_SITES)
+
+            web_domain = self.current_web_domain if is_browser else None
+            self._set_foreground(exe_name, web_domain)
+
+            # Daily time budgets: usage counted on transitions, O(1) check per poll
+            budget_key = self.budgets.match(exe_name, web_domain, window_title)
+            self.budgets.observe(budget_key)
+            is_over_budget = (budget_key not in self.allowed_budgets_session
+                              and self.budgets.exhausted(budget_key))
+
+            combined_blocked = is_blocked_app or is_blocked_site or is_over_budget
+
+            friendly_name = None
+            source = None
+            target = {}
+            if combined_blocked and exe_name not in self.allowed_exes_session:
+                self.current_blocked_exe = exe_name
+                # Show the overlay with a user-friendly name
+                if is_blocked_app and self._enforce(exe_name, app_rule, window.pid):
+                    # Suspended or closed; nothing left to cover
+                    self.current_blocked_exe = None
+                elif is_blocked_site:
+                    # Extract the blocked site name from window title
+                    friendly_name = site_from_title(window_title)
+                    source = "title"
+                elif is_blocked_app:
+                    friendly_name = friendly_app_name(exe_name)
+                    source = "desktop"
+                    target = {"exe": exe_name}
+                else:
+                    friendly_name = f"{budget_key.title()} (daily limit reached)"
+                    source = "budget"
+                    target = {"budget": budget_key}
+            else:
+                self.current_blocked_exe = None
+            self._apply_transition(
+                self._report_block("desktop", friendly_name, source, **target)
+            )
+
+        except Exception:
+            # If we can't detect the window, just continue
+            pass
+
+    def _process_web_events(self) -> None:
+        events = []
+        try:
+            while True:
+                events.append(self.web_event_queue.get_nowait())
+        except Empty:
+            pass
+
+        for ev in events:
+            if ev.get("type") == "web_foreground":
+                url = ev.get("url", "")
+                # Simple domain extraction
+                domain = url.split("//")[-1].split("/")[0] if "://" in url else ""
+                self.current_web_domain = domain or None
+
+                # Get blocked domains from session rules
+                rules = self.state.get("sessionRules", {})
+                blocked_domains = set(rules.get("blockedApps", []))
+
+                # Decide if this URL is blocked based on blocked_domains and allowed_domains_session
+                is_blocked_url = self.session_active and any(
+                    d in url and d not in self.allowed_domains_session for d in blocked_domains)
+                budget_key = self.budgets.match("", domain)
+                is_over_budget = (
+                    domain not in self.allowed_domains_session
+                    and budget_key not in self.allowed_budgets_session
+                    and self.budgets.exhausted(budget_key)
+                )
+                if is_blocked_url or is_over_budget:
+                    self.current_blocked_domain = domain
+                    if is_blocked_url:
+                        transition = self._report_block("web", domain, "web", domain=domain)
+                    else:
+                        transition = self._report_block("web", domain, "budget", budget=budget_key)
+                else:
+                    self.current_blocked_domain = None
+                    transition = self.overlay_transitions.update("web", None)
+                self._apply_transition(transition)
+
+        # Let pending dwell/hysteresis windows expire even without new events
+        self._apply_transition(self.overlay_transitions.evaluate())
+
+
+def main(argv=None) -> int:
+    from src.utils.store import DAEMON_LOG_FILE
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.FileHandler(DAEMON_LOG_FILE)],
+    )
+    try:
+        from src.utils.config import AppConfig
+        config = AppConfig()
+    except Exception as e:
+        logger.error(f"Failed to load configuration, using defaults: {e}")
+        config = None
+    daemon = FocusDaemon(config, ui_command=[sys.executable, "-m", "src.main"], watch_config=True)
+    # Terminated (logout, service stop): still resume suspended apps on the way out
+    import signal
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    try:
+        daemon.serve_forever()
+    except DaemonRunning:
+        logger.info("Core daemon already running")
+    return 0
@@ -0,0 +1,87 @@
+"""
+protocol.py
+
+How the UI and the core daemon find and talk to each other.
+
+Transport is multiprocessing.connection: a Unix domain socket on POSIX, a
+named pipe on Windows, both named after the data directory so separate
+installs (or test runs) never meet. Connections are authenticated with the
+HMAC challenge multiprocessing.connection does with a per-install random key
+kept in DAEMON_KEY_FILE (readable only by the user).
+
+Messages are plain dicts, pickled by the connection.
+
+UI -> daemon, fire and forget:
+    {"op": "hello"}                          answered with a "snapshot" event
+    {"op": "save_state", "state": {...}}     the daemon writes the store
+    {"op": "allow_exe", "name": str}         allow once; resumes a suspended app
+    {"op": "allow_domain", "domain": str}
+    {"op": "allow_budget", "key": str}       allow once past a spent daily budget
+    {"op": "dismissed"}                      the user closed the overlay
+    {"op": "resume_suspended"}               session is ending
+    {"op": "bye"}                            the UI is closing; the daemon hangs up
+    {"op": "shutdown"}
+
+daemon -> UI:
+    {"event": "snapshot", "overlay": {"name", "source", "target"} | None,
+     "distractions": [[name, source], ...], "suspended": [[name, label], ...],
+     "foreground": [exe, domain], "suppressedFlaps": int, "stats": {...}}
+    {"event": "overlay", "action": "show" | "hide", "name", "source", "new_distraction", "target"}
+        target is what Allow Once lifts, {"exe" | "domain" | "budget": key}, or
+        None/{} when only the shown name is known (a site in a window title)
+    {"event": "distraction", "name", "source"}   enforced without an overlay
+    {"event": "suspended", "apps": [[name, label], ...]}
+    {"event": "foreground", "exe", "domain"}     on change only
+    {"event": "status", "suppressedFlaps": int}
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+import sys
+import tempfile
+from multiprocessing.connection import Client, Connection
+from typing import Optional
+
+from src.utils import store
+
+AUTHKEY_BYTES = 32
+
+
+def daemon_address() -> str:
+    tag = hashlib.sha1(os.path.abspath(store.DATA_FILE).encode("utf-8")).hexdigest()[:12]
+    if sys.platform.startswith("win"):
+        return rf"\\.\pipe\zenflow-{tag}"
+    # Short, user-private directory: socket paths are limited to ~100 bytes.
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime, f"zenflow-{os.getuid()}-{tag}.sock")
+
+
+def address_family() -> str:
+    return "AF_PIPE" if sys.platform.startswith("win") else "AF_UNIX"
+
+
+def authkey() -> bytes:
+    """The install's shared key, created on first use."""
+    try:
+        with open(store.DAEMON_KEY_FILE, "rb") as f:
+            key = f.read()
+        if len(key) == AUTHKEY_BYTES:
+            return key
+    except OSError:
+        pass
+    key = os.urandom(AUTHKEY_BYTES)
+    tmp = f"{store.DAEMON_KEY_FILE}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    os.replace(tmp, store.DAEMON_KEY_FILE)
+    return key
+
+
+def connect() -> Optional[Connection]:
+    """A connection to the running daemon, or None if there is none."""
+    try:
+        return Client(daemon_address(), family=address_family(), authkey=authkey())
+    except (OSError, EOFError):
+        return None
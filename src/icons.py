@@ -0,0 +1,193 @@
+"""
+icons.py
+
+App icons and the ZenFlow logo as ready-to-paint pixmaps.
+
+pixmap(source, size) renders an icon once per (source, logical size, device
+pixel ratio) and keeps the result in two layers:
+- memory: QPixmapCache, Qt's process-wide LRU, so painting a list row or the
+  overlay only looks up an already converted QPixmap;
+- disk: one PNG per entry in ICON_CACHE_DIR, so SVGs and shell icons are not
+  rendered again on the next start. The directory is kept under
+  ICON_DISK_BUDGET_BYTES by deleting the least recently used files.
+
+A source is an SVG file, an image or executable/shortcut path (the shell's
+icon for it is used), or an icon theme name as found in .desktop files.
+Sources that cannot be rendered are remembered and return None without
+retrying.
+"""
+
+from __future__ import annotations
+import logging
+import os
+from typing import Dict, Optional, Set
+
+from PyQt5.QtCore import Qt, QFileInfo
+from PyQt5.QtGui import QGuiApplication, QIcon, QImage, QPainter, QPixmap, QPixmapCache
+
+from src.utils import store
+
+logger = logging.getLogger(__name__)
+
+LOGO_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "assets", "images", "zenflow_logo.svg")
+
+ICON_MEMORY_KB = 10 * 1024
+ICON_DISK_BUDGET_BYTES = 8 * 1024 * 1024
+
+_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".xpm", ".ico", ".bmp", ".gif")
+
+_missing: Set[str] = set()
+_versions: Dict[str, str] = {}
+_disk_sizes: Optional[Dict[str, int]] = None   # cache file -> bytes, loaded on first write
+_memory_limit_set = False
+
+
+def device_pixel_ratio() -> float:
+    app = QGuiApplication.instance()
+    return app.devicePixelRatio() if app is not None else 1.0
+
+
+def _source_version(source: str) -> str:
+    # Files are re-rendered when they change (checked once per process);
+    # theme names only by name.
+    version = _versions.get(source)
+    if version is None:
+        try:
+            version = str(os.stat(source).st_mtime_ns) if os.path.isabs(source) else ""
+        except OSError:
+            version = ""
+        _versions[source] = version
+    return version
+
+
+def cache_key(source: str, size: int, dpr: float) -> str:
+    return f"zenflow-icon:{source}:{_source_version(source)}:{size}@{dpr:g}"
+
+
+def _cache_file(key: str) -> str:
+    import hashlib   # only on a memory miss; keeps startup imports light
+    return os.path.join(store.ICON_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+
+def _render(source: str, pixels: int) -> Optional[QImage]:
+    if source.lower().endswith(".svg"):
+        from PyQt5.QtSvg import QSvgRenderer   # only needed on a disk-cache miss
+        renderer = QSvgRenderer(source)
+        if not renderer.isValid():
+            return None
+        image = QImage(pixels, pixels, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        renderer.render(painter)
+        painter.end()
+        return image
+    if os.path.isabs(source):
+        if not os.path.exists(source):
+            return None
+        if source.lower().endswith(_IMAGE_EXTENSIONS):
+            icon = QIcon(source)
+        else:
+            from PyQt5.QtWidgets import QFileIconProvider
+            icon = QFileIconProvider().icon(QFileInfo(source))
+    else:
+        icon = QIcon.fromTheme(source)
+    if icon.isNull():
+        return None
+    image = icon.pixmap(pixels, pixels).toImage()
+    if image.isNull():
+        return None
+    if image.width() != pixels and image.height() != pixels:
+        image = image.scaled(pixels, pixels, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+def _load_disk(path: str) -> Optional[QImage]:
+    if not os.path.exists(path):
+        return None
+    image = QImage(path)
+    if image.isNull():
+        return None
+    try:
+        os.utime(path)   # mark as recently used
+    except OSError:
+        pass
+    return image
+
+
+def _save_disk(path: str, image: QImage) -> None:
+    global _disk_sizes
+    try:
+        os.makedirs(store.ICON_CACHE_DIR, exist_ok=True)
+        if _disk_sizes is None:
+            _disk_sizes = {e.path: e.stat().st_size for e in os.scandir(store.ICON_CACHE_DIR)
+                           if e.name.endswith(".png")}
+        if not image.save(path, "PNG"):
+            return
+        _disk_sizes[path] = os.path.getsize(path)
+    except OSError as e:
+        logger.debug(f"Icon cache write failed: {e}")
+        return
+    _trim_disk()
+
+
+def _trim_disk() -> None:
+    total = sum(_disk_sizes.values())
+    if total <= ICON_DISK_BUDGET_BYTES:
+        return
+    def last_used(path):
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return 0
+    for path in sorted(_disk_sizes, key=last_used):
+        if total <= ICON_DISK_BUDGET_BYTES:
+            break
+        total -= _disk_sizes.pop(path)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def pixmap(source: str, size: int, dpr: Optional[float] = None) -> Optional[QPixmap]:
+    """The icon for source at size x size logical pixels, or None."""
+    global _memory_limit_set
+    if not source or source in _missing:
+        return None
+    dpr = dpr or device_pixel_ratio()
+    key = cache_key(source, size, dpr)
+    cached = QPixmapCache.find(key)
+    if cached is not None:
+        return cached
+
+    if not _memory_limit_set:
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), ICON_MEMORY_KB))
+        _memory_limit_set = True
+    path = _cache_file(key)
+    image = _load_disk(path)
+    if image is None:
+        image = _render(source, max(1, round(size * dpr)))
+        if image is None:
+            _missing.add(source)
+            return None
+        _save_disk(path, image)
+    result = QPixmap.fromImage(image)
+    result.setDevicePixelRatio(dpr)
+    QPixmapCache.insert(key, result)
+    return result
+
+
+def logo_pixmap(size: int, dpr: Optional[float] = None) -> Optional[QPixmap]:
+    return pixmap(LOGO_FILE, size, dpr)
+
+
+def logo_icon() -> QIcon:
+    """Window icon built from cached logo renderings."""
+    icon = QIcon()
+    for size in (32, 64):
+        rendered = logo_pixmap(size)
+        if rendered is not None:
+            icon.addPixmap(rendered)
+    return icon
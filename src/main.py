@@ -1,3 +1,6 @@
+import time
+_STARTED = time.perf_counter()
+
 import sys
 import os
 import logging
@@ -6,6 +9,7 @@ from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QIcon
 
 from src.theme import apply_global_theme
+import src.icons as icons
 
 # Set up logging
 logging.basicConfig(
@@ -20,13 +24,18 @@ logger = logging.getLogger(__name__)
 
 try:
     # Import local modules from the installed src package
+    # (the main window and its screens are imported in main(), once the
+    # splash is on screen)
     from src.splash_screen import ZenFlowSplashScreen as SplashScreen
-    from src.main_window import MainWindow
     from src.utils.config import AppConfig
+    from src.utils.startup import StartupTimer
 except ImportError as e:
     logger.error(f"Failed to import required modules: {e}")
     raise
 
+startup = StartupTimer(_STARTED)
+startup.record("imports", startup.elapsed_ms())
+
 def main():
     # Initialize the application
     app = QApplication(sys.argv)
@@ -41,13 +50,15 @@ def main():
         if os.path.exists(icon_path):
             app.setWindowIcon(QIcon(icon_path))
         else:
-            logger.warning(f"Icon not found at: {icon_path}")
+            # No .ico bundled: use the logo, rendered once into the icon cache
+            app.setWindowIcon(icons.logo_icon())
     except Exception as e:
         logger.error(f"Error setting application icon: {e}")
     
     # Load configuration
     try:
-        config = AppConfig()
+        with startup.phase("config"):
+            config = AppConfig()
         logger.info("Configuration loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load configuration: {e}")
@@ -62,21 +73,33 @@ def main():
         # Process events to make sure the splash screen is displayed
         app.processEvents()
         
+        try:
+            with startup.phase("window imports"):
+                from src.main_window import MainWindow
+        except ImportError as e:
+            logger.error(f"Failed to import required modules: {e}")
+            raise
+        
         # Create main window but don't show it yet
-        main_window = MainWindow(config)
+        main_window = MainWindow(config, startup)
         
-        # Close splash screen and show main window after delay
+        # Close splash screen and show main window
         def show_main_window():
             try:
-                splash.finish(main_window)
+                # Show first: finish() blocks until the window is exposed
+                # (up to a second) when the window is still hidden.
                 main_window.show()
+                splash.finish(main_window)
                 logger.info("Main window displayed successfully")
+                startup.log()
             except Exception as e:
                 logger.error(f"Error showing main window: {e}")
                 QMessageBox.critical(None, "Error", f"Failed to show main window: {e}")
         
-        # Use a single-shot timer to show the main window after the splash screen
-        QTimer.singleShot(2000, show_main_window)
+        # The window is ready once constructed: swap it in as soon as pending
+        # events are processed instead of after a fixed delay. Any minimum
+        # splash time is handled by the in-window splash screen.
+        QTimer.singleShot(0, show_main_window)
         
         # Start the application event loop
         return app.exec_()
@@ -15,11 +15,12 @@ from PyQt5.QtWidgets import (
     QSpinBox,
     QLineEdit,
 )
-from PyQt5.QtCore import Qt, QTimer, QTime
-from PyQt5.QtGui import QPixmap, QIcon
+from PyQt5.QtCore import Qt, QTimer, QTime, QEvent, QObject, QFileSystemWatcher, pyqtSignal
+from PyQt5.QtGui import QPixmap, QPixmapCache, QIcon
 import os
 import sys
-import json
+import logging
+import math
 from datetime import datetime
 
 # Desktop app detection imports
@@ -27,66 +28,82 @@ from queue import Queue, Empty
 import threading
 import time
 
-import psutil
-import win32gui
-import win32process
-
-from src.web_watcher import WebWatcher
+from src.core.client import CoreClient
+from src.utils.store import load_state, save_state
+from src.utils.rollups import FocusRollups
+from src.utils.app_discovery import AppDiscovery
+from src.utils.scheduler import Scheduler
+from src.utils.startup import StartupTimer
+from src.utils.config_watch import ConfigWatcher
+from src.utils.reminders import health_settings
+from src.tray import TRAY_SETTINGS_FILE, TrayIcon, load_tray_settings, tray_settings
 import src.theme as theme
 
-# Import separated screens from the src package
-from src.screens.splash_screen import SplashScreen
-from src.screens.intent_screen import IntentScreen
-from src.screens.app_setup_screen import AppSetupScreen
-from src.screens.focus_dashboard_screen import FocusDashboardScreen
-from src.screens.settings_screen import SettingsScreen
-from src.screens.session_summary_screen import SessionSummaryScreen
-
-DATA_FILE = os.path.join(os.path.dirname(__file__), "zenflow_data.json")
-
-
-def load_state():
-    if not os.path.exists(DATA_FILE):
-        return {
-            "selectedCategories": [],
-            "sessionRules": {},
-            "activeSessionData": {},
-            "sessionHistory": [],
-            "userPreferences": {
-                "defaultSessionMinutes": 50,
-                "postureTips": True,
-                "eyeStrainReminders": True,
-                "presets": {},
-            },
-        }
-    try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {
-            "selectedCategories": [],
-            "sessionRules": {},
-            "activeSessionData": {},
-            "sessionHistory": [],
-            "userPreferences": {
-                "defaultSessionMinutes": 50,
-                "postureTips": True,
-                "eyeStrainReminders": True,
-                "presets": {},
-            },
-        }
-
-
-def save_state(state):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2)
+# Screens are imported lazily through the registry on first use
+from src.screens.registry import (
+    SCREENS,
+    NEXT_SCREEN,
+    ScreenCache,
+    build_screen,
+    screen_class,
+    process_rss_kb,
+    trim_process_memory,
+    DEFAULT_IDLE_EVICT_SECONDS,
+    DEFAULT_BUDGET_KB,
+)
+
+logger = logging.getLogger(__name__)
+
+# How often idle screens are checked for eviction.
+SCREEN_SWEEP_MS = 60 * 1000
+
+# Retry interval after the core daemon went away.
+CORE_RECONNECT_MS = 2000
+
+# Installed-app discovery starts once startup has settled; results are
+# picked up from its queue at this rate until they arrive.
+APP_DISCOVERY_DELAY_MS = 2000
+APP_EVENTS_MS = 250
+
+# Shortest time the in-window splash stays up once the window is visible.
+DEFAULT_SPLASH_MIN_DISPLAY_MS = 500
+
+# Freed heap is handed back once the screens deleted for tray mode are gone.
+TRAY_TRIM_DELAY_MS = 1000
+
+# Config files are watched for live reloads once startup has settled.
+CONFIG_WATCH_DELAY_MS = 2000
+
+class CoreSignals(QObject):
+    """Carries core daemon events from the client's reader thread to the UI thread."""
+
+    event = pyqtSignal(object)
+
+
+class ThreadCalls(QObject):
+    """Runs callables handed over from worker threads on the UI thread."""
+
+    call = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.call.connect(self._run, Qt.QueuedConnection)
+
+    def _run(self, fn):
+        fn()
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, config=None):
+    def __init__(self, config=None, startup=None):
         super().__init__()
         self.config = config
-        self.state = load_state()
+        self.startup = startup or StartupTimer()
+        with self.startup.phase("state load"):
+            self.state = load_state()
+            self.rollups = self._load_rollups()
+        self.splash_min_display_ms = self._config_value(
+            "settings.splash_min_display_ms", DEFAULT_SPLASH_MIN_DISPLAY_MS
+        )
         self.setWindowTitle("ZenFlow")
         self.setMinimumSize(500, 600)
         self.setMaximumSize(600, 700)
@@ -98,21 +115,40 @@ class MainWindow(QMainWindow):
         self.dashboard_screen = None
         self.settings_screen = None
         self.session_summary_screen = None
+        self.history_screen = None
         self.blocked_overlay = None
+        self.installed_apps = []
+        self.app_icon_sources = {}
+        self._prewarm_target = None
+        self.screen_cache = ScreenCache(
+            self._config_value("settings.screen_idle_evict_seconds", DEFAULT_IDLE_EVICT_SECONDS),
+            self._config_value("settings.screen_cache_budget_kb", DEFAULT_BUDGET_KB),
+        )
         
-        # Desktop app blocking session state
-        self.allowed_exes_session = set()
-        self.blocked_exes_session = set()
-        self.current_blocked_exe = None
-        
-        # Website blocking session state (per run, not persisted)
-        self.allowed_domains_session = set()
-        self.blocked_domains_session = set()
-        self.current_blocked_domain = None
-        
-        self._setup_ui()
-        self._setup_monitoring()
-        self.show_splash()
+        # Blocking runs in the core daemon (src/core); the window mirrors what
+        # it reports.
+        self.suppressed_flaps = 0
+        self.suspended_apps = []
+        self.core_stats = {}
+
+        # Tray mode: the window is hidden with all screens deleted (see
+        # enter_tray_mode); what a running session needs meanwhile is kept here.
+        self.tray = None
+        self.in_tray = False
+        self._tray_screen = None
+        self._tray_session = None
+        self._tray_distractions = []
+        self._quitting = False
+
+        with self.startup.phase("window build"):
+            self._setup_ui()
+            self._setup_tray()
+            self.show_splash()
+        with self.startup.phase("core connect"):
+            self._setup_monitoring()
+        # Build the block overlay once the event loop is idle so the first
+        # block only has to raise an existing window.
+        QTimer.singleShot(0, self._prewarm_blocked_overlay)
 
     def _setup_ui(self):
         central_widget = QWidget()
@@ -122,53 +158,354 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(central_widget)
         layout.addWidget(self.stacked_widget)
 
+        # Every periodic job runs on one scheduler; this timer is its only
+        # wakeup source, re-armed for the next due job after each change.
+        self.scheduler = Scheduler()
+        self.wakeup_timer = QTimer(self)
+        self.wakeup_timer.setSingleShot(True)
+        self.wakeup_timer.setTimerType(Qt.PreciseTimer)
+        self.wakeup_timer.timeout.connect(self.scheduler.run_due)
+        self.scheduler.on_change = self._arm_wakeup
+
+        # Zero-timeout timer: fires once pending events are processed, so the
+        # next screen is built while the user is still reading this one.
+        self.prewarm_timer = QTimer(self)
+        self.prewarm_timer.setSingleShot(True)
+        self.prewarm_timer.setInterval(0)
+        self.prewarm_timer.timeout.connect(self._prewarm_next_screen)
+
+        self.scheduler.add("screens.sweep", self._evict_screens, SCREEN_SWEEP_MS,
+                           tolerance_ms=SCREEN_SWEEP_MS // 2)
+
+    def _setup_tray(self):
+        self._apply_tray_settings(load_tray_settings())
+
+    def _apply_tray_settings(self, settings):
+        self.tray_settings = settings
+        wanted = settings["close_to_tray"] or settings["minimize_to_tray"]
+        if wanted and self.tray is None:
+            if not TrayIcon.isSystemTrayAvailable():
+                logger.info("No system tray; closing the window quits")
+                return
+            self.tray = TrayIcon(self)
+            self.tray.open_requested.connect(self.show_from_tray)
+            self.tray.quit_requested.connect(self.quit_app)
+            self.tray.show()
+            # Hidden in the tray is not closed
+            QApplication.instance().setQuitOnLastWindowClosed(False)
+        elif not wanted and self.tray is not None:
+            if self.in_tray:
+                self.show_from_tray()
+            self.tray.hide()
+            self.tray.deleteLater()
+            self.tray = None
+            QApplication.instance().setQuitOnLastWindowClosed(True)
+
     def _setup_monitoring(self):
-        # Queue and watcher for browser tab URLs (WebSocket from extension)
-        self.web_event_queue = Queue()
-        self.web_watcher = WebWatcher(self.web_event_queue)
-        self.web_watcher.start()
-
-        self.web_event_timer = QTimer(self)
-        self.web_event_timer.timeout.connect(self._process_web_events)
-        self.web_event_timer.start(1000)
-        
-        # Desktop app monitoring
-        self.desktop_timer = QTimer(self)
-        self.desktop_timer.timeout.connect(self._check_active_window)
-        self.desktop_timer.start(500)  # Check every 500ms
+        # Watchers, rules and enforcement live in the core daemon, which keeps
+        # running when this window closes. Its events arrive on the client's
+        # reader thread and are handled here on the UI thread.
+        self.core_signals = CoreSignals(self)
+        self.core_signals.event.connect(self._on_core_event, Qt.QueuedConnection)
+        self.core = CoreClient(self.core_signals.event.emit, self.config,
+                               spawn=self._config_value("settings.core_daemon", "process") == "process")
+        # Saves made before the daemon answers go straight to the file and
+        # are handed over once connected.
+        self._core_unsynced = False
+        self.core.connect_async()
+
+        # Installed apps for the setup screen, scanned on a worker thread
+        self.app_event_queue = Queue()
+        self.app_discovery = AppDiscovery(self.app_event_queue)
+        self.scheduler.add("apps.discover", self._start_app_discovery,
+                           delay_ms=APP_DISCOVERY_DELAY_MS, tolerance_ms=APP_DISCOVERY_DELAY_MS)
+
+        # Edits to the config files apply live (see src/utils/config_watch.py)
+        if self.config is not None:
+            self.config.subscribe(self._on_config_changed, "settings")
+        self.scheduler.add("config.watch", self._start_config_watch,
+                           delay_ms=CONFIG_WATCH_DELAY_MS, tolerance_ms=CONFIG_WATCH_DELAY_MS)
+
+    def _start_config_watch(self):
+        paths = {"settings": TRAY_SETTINGS_FILE}
+        if self.config is not None:
+            paths["config"] = self.config.config_file
+        self.thread_calls = ThreadCalls(self)
+        self.config_watcher = ConfigWatcher(paths, self._on_config_reload, self.scheduler,
+                                            self.thread_calls.call.emit)
+        # Directories too: saving by rename replaces the watched file
+        self._watched_files = list(paths.values())
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.addPaths([path for path in self._watched_files if os.path.exists(path)]
+                                   + sorted({os.path.dirname(path) for path in self._watched_files}))
+        self.file_watcher.fileChanged.connect(self._on_config_file_changed)
+        self.file_watcher.directoryChanged.connect(self._on_config_file_changed)
+        self.config_watcher.start()
+
+    def _on_config_file_changed(self, path):
+        watched = set(self.file_watcher.files())
+        missing = [p for p in self._watched_files if p not in watched and os.path.exists(p)]
+        if missing:
+            self.file_watcher.addPaths(missing)
+        self.config_watcher.notify(path)
+
+    def _on_config_reload(self, name, data, changed):
+        if name == "config":
+            # Subscribers (_on_config_changed, an embedded daemon) get the keys
+            # that differ from the live config
+            self.config.apply(data)
+            return
+        if any(key.startswith("health.") for key in changed) and self.dashboard_screen is not None:
+            self.dashboard_screen.set_health_settings(health_settings(data))
+        if any(key.startswith("appearance.") for key in changed):
+            self._apply_tray_settings(tray_settings(data))
+
+    def _on_config_changed(self, keys):
+        if keys & {"settings.screen_idle_evict_seconds", "settings.screen_cache_budget_kb"}:
+            self.screen_cache.idle_evict_seconds = self._config_value(
+                "settings.screen_idle_evict_seconds", DEFAULT_IDLE_EVICT_SECONDS)
+            self.screen_cache.budget_kb = self._config_value(
+                "settings.screen_cache_budget_kb", DEFAULT_BUDGET_KB)
+            self._evict_screens()
+        if "settings.splash_min_display_ms" in keys:
+            self.splash_min_display_ms = self._config_value(
+                "settings.splash_min_display_ms", DEFAULT_SPLASH_MIN_DISPLAY_MS)
+        if "settings.core_daemon" in keys:
+            logger.info("settings.core_daemon takes effect when ZenFlow next starts")
+
+    def icon_source(self, app_name):
+        """Icon source (see src/icons.py) for an app name, exe or rule entry."""
+        return self.app_icon_sources.get((app_name or "").lower())
+
+    def _start_app_discovery(self):
+        self.app_discovery.start()
+        self.scheduler.add("apps.results", self._process_app_events, APP_EVENTS_MS,
+                           tolerance_ms=APP_EVENTS_MS)
+
+    def _process_app_events(self):
+        try:
+            event = self.app_event_queue.get_nowait()
+        except Empty:
+            return
+        self.scheduler.cancel("apps.results")
+        self.installed_apps = event.get("apps", [])
+        self.app_icon_sources = {}
+        for app in self.installed_apps:
+            if app.icon:
+                for name in (app.rule, app.name, os.path.splitext(app.exe)[0]):
+                    if name:
+                        self.app_icon_sources.setdefault(name.lower(), app.icon)
+        if self.app_setup_screen is not None:
+            self.app_setup_screen.set_installed_apps(self.installed_apps)
+
+    def _arm_wakeup(self):
+        delay = self.scheduler.next_wakeup_ms()
+        if delay is None:
+            self.wakeup_timer.stop()
+        else:
+            self.wakeup_timer.start(math.ceil(delay))
+
+    def job_schedule(self):
+        """Upcoming scheduler runs, soonest first."""
+        return self.scheduler.schedule()
+
+    def _config_value(self, key, default):
+        if self.config is None:
+            return default
+        # Typed like the default: a hand-edited "500" still reads as 500
+        return self.config.setting(key, default, type(default)).value
+
+    def _load_rollups(self):
+        # States written before rollups existed get a one-off rebuild; after
+        # that they are only maintained incrementally.
+        needs_bootstrap = "focusRollups" not in self.state
+        rollups = FocusRollups.from_state(self.state)
+        if needs_bootstrap and self.state.get("sessionHistory"):
+            rollups.rebuild(self.state["sessionHistory"])
+        return rollups
 
     def save_state(self, state):
-        save_state(state)
+        """Hand the state to the core daemon, which owns the store."""
         self.state = state
+        if not self.core.send("save_state", state=state):
+            # No daemon to write it (yet); keep the file current ourselves.
+            save_state(state)
+            self._core_unsynced = True
+
+    def _on_core_event(self, event):
+        kind = event.get("event")
+        if kind == "overlay":
+            if event["action"] == "show":
+                self.show_blocked_overlay(event["name"], event["source"],
+                                          record=event["new_distraction"], target=event.get("target"))
+            else:
+                self._hide_overlay_window()
+        elif kind == "distraction":
+            self._record_distraction(event["name"], event["source"])
+        elif kind == "suspended":
+            self._set_suspended_apps(event["apps"])
+        elif kind == "foreground":
+            self._observe_foreground(event["exe"], event["domain"])
+        elif kind == "status":
+            self.suppressed_flaps = event["suppressedFlaps"]
+        elif kind == "snapshot":
+            self._apply_snapshot(event)
+        elif kind == "connected":
+            if event["mode"] is None:
+                self.scheduler.add("core.reconnect", self.core.connect_async, delay_ms=CORE_RECONNECT_MS)
+            elif self._core_unsynced:
+                # A daemon started meanwhile loaded an older file.
+                self._core_unsynced = False
+                self.save_state(self.state)
+        elif kind == "disconnected":
+            logger.warning("Core daemon connection lost; reconnecting")
+            self.core.reset()
+            self._core_unsynced = True
+            self.scheduler.add("core.reconnect", self.core.connect_async, delay_ms=CORE_RECONNECT_MS)
+
+    def _apply_snapshot(self, snapshot):
+        """State of the daemon when this window (re)connects."""
+        self.suppressed_flaps = snapshot["suppressedFlaps"]
+        self.core_stats = snapshot["stats"]
+        for name, source in snapshot["distractions"]:
+            self._record_distraction(name, source)
+        self._set_suspended_apps(snapshot["suspended"])
+        exe, domain = snapshot["foreground"]
+        if exe:
+            self._observe_foreground(exe, domain)
+        overlay = snapshot["overlay"]
+        if overlay is not None:
+            self.show_blocked_overlay(overlay["name"], overlay["source"], record=False,
+                                      target=overlay.get("target"))
+
+    def _observe_foreground(self, exe, domain):
+        if self.dashboard_screen is not None:
+            self.dashboard_screen.observe_foreground(exe, domain)
+        elif self._tray_session is not None:
+            self._tray_session.timeline.observe(exe, domain)
+
+    def _record_distraction(self, name, source):
+        if self.in_tray:
+            # Counted on the dashboard rebuilt when the window is opened
+            if self.state.get("activeSessionData"):
+                self._tray_distractions.append((name, source, time.monotonic()))
+            return
+        dashboard = self.dashboard_screen
+        if dashboard is None and self.state.get("activeSessionData"):
+            dashboard = self._screen("dashboard")
+        if dashboard is not None:
+            if not dashboard.session_active and self.state.get("activeSessionData"):
+                dashboard.start_session()
+            dashboard.record_distraction(name, source)
+
+    def _set_suspended_apps(self, apps):
+        self.suspended_apps = [tuple(app) for app in apps]
+        if self.dashboard_screen is not None:
+            self.dashboard_screen.set_suspended_apps(self.suspended_apps)
+
+    def resume_suspended(self):
+        """Resume apps hard enforcement suspended (the session is ending)."""
+        self.core.send("resume_suspended")
 
     def show_splash(self):
-        self.splash_screen = SplashScreen(self)
-        self._add_and_show(self.splash_screen)
+        self._show_screen("splash")
 
     def show_intent_screen(self):
-        if not self.intent_screen:
-            self.intent_screen = IntentScreen(self, self.state)
-        self._add_and_show(self.intent_screen)
+        self._show_screen("intent")
 
     def show_app_setup_screen(self):
-        if not self.app_setup_screen:
-            self.app_setup_screen = AppSetupScreen(self, self.state)
-        self._add_and_show(self.app_setup_screen)
+        self._show_screen("app_setup")
 
     def show_dashboard(self):
-        if not self.dashboard_screen:
-            self.dashboard_screen = FocusDashboardScreen(self, self.state)
-        self._add_and_show(self.dashboard_screen)
+        dashboard = self._screen("dashboard")
+        if not dashboard.session_active and self.state.get("activeSessionData"):
+            dashboard.start_session(resume=self._tray_session)
+        self._tray_session = None
+        self._show_screen("dashboard")
+        dashboard.set_suspended_apps(self.suspended_apps)
 
     def show_settings(self):
-        if not self.settings_screen:
-            self.settings_screen = SettingsScreen(self, self.state)
-        self._add_and_show(self.settings_screen)
+        self._show_screen("settings")
 
     def show_session_summary(self):
-        if not self.session_summary_screen:
-            self.session_summary_screen = SessionSummaryScreen(self, self.state)
-        self._add_and_show(self.session_summary_screen)
+        self._show_screen("session_summary")
+
+    def show_history_screen(self):
+        self._show_screen("history")
+
+    def _screen(self, name):
+        """Registered screen instance, built (and its module imported) on first use."""
+        spec = SCREENS[name]
+        screen = getattr(self, spec.attribute)
+        if screen is None:
+            # Import first, and only charge RSS growth to the screen if nothing
+            # was imported meanwhile (by it or another thread): one-off module
+            # imports (numpy for the summary) would dwarf the widgets themselves.
+            screen_class(name)
+            modules = len(sys.modules)
+            rss_before = process_rss_kb()
+            screen = build_screen(name, self, self.state)
+            setattr(self, spec.attribute, screen)
+            self.stacked_widget.addWidget(screen)
+            screen.ensurePolished()
+            rss_after = process_rss_kb()
+            measured = rss_before is not None and len(sys.modules) == modules
+            grown = rss_after - rss_before if measured else None
+            self.screen_cache.built(name, len(screen.findChildren(QWidget)) + 1, grown)
+            logger.debug(f"Built {name} screen: {self.screen_cache.entries[name].footprint_kb} KB")
+        return screen
+
+    def _show_screen(self, name):
+        screen = self._screen(name)
+        self._add_and_show(screen)
+        self.screen_cache.touched(name)
+        self._evict_screens()
+        self._schedule_prewarm(NEXT_SCREEN.get(name))
+        return screen
+
+    def _current_screen_name(self):
+        current = self.stacked_widget.currentWidget()
+        return next((name for name, spec in SCREENS.items()
+                     if current is not None and getattr(self, spec.attribute) is current), None)
+
+    def _evict_screens(self):
+        for name in self.screen_cache.victims(self._current_screen_name()):
+            self._drop_screen(name)
+
+    def _drop_screen(self, name):
+        """Delete a screen's widget tree; it is rebuilt from state on the next visit."""
+        spec = SCREENS[name]
+        screen = getattr(self, spec.attribute)
+        if screen is None:
+            return
+        entry = self.screen_cache.entries.get(name)
+        # Jobs on the window's scheduler must not outlive the widgets they use
+        if hasattr(screen, "cancel_jobs"):
+            screen.cancel_jobs()
+        self.stacked_widget.removeWidget(screen)
+        setattr(self, spec.attribute, None)
+        screen.deleteLater()
+        self.screen_cache.evicted(name)
+        if entry is not None:
+            logger.debug(f"Evicted {name} screen ({entry.footprint_kb} KB, {entry.widgets} widgets)")
+
+    def screen_memory_report(self):
+        """Estimated memory per resident screen, largest first."""
+        return self.screen_cache.report()
+
+    def _schedule_prewarm(self, name):
+        if name is None or getattr(self, SCREENS[name].attribute) is not None:
+            return
+        self._prewarm_target = name
+        self.prewarm_timer.start()
+
+    def _prewarm_next_screen(self):
+        name, self._prewarm_target = self._prewarm_target, None
+        if name is None or getattr(self, SCREENS[name].attribute) is not None:
+            return
+        started = time.perf_counter()
+        self._screen(name)
+        logger.debug(f"Prewarmed {name} screen in {(time.perf_counter() - started) * 1000:.1f} ms")
 
     def _add_and_show(self, screen):
         # Remove existing screen if it exists
@@ -177,175 +514,138 @@ class MainWindow(QMainWindow):
             self.stacked_widget.addWidget(screen)
         self.stacked_widget.setCurrentWidget(screen)
 
-    def show_blocked_overlay(self, app_name="Blocked app"):
-        from src.screens.blocked_overlay_screen import BlockedOverlayScreen
-        self.blocked_overlay = BlockedOverlayScreen(self, app_name)
-        self.blocked_overlay.showFullScreen()
-        if self.dashboard_screen is not None:
-            self.dashboard_screen.record_distraction(app_name)
+    def _prewarm_blocked_overlay(self):
+        if self.blocked_overlay is None:
+            from src.screens.blocked_overlay_screen import BlockedOverlayScreen
+            self.blocked_overlay = BlockedOverlayScreen(self)
+            self.blocked_overlay.hide()
+
+    def show_blocked_overlay(self, app_name="Blocked app", source="desktop", record=True, target=None):
+        decided_at = time.perf_counter()
+        self._prewarm_blocked_overlay()
+        self.blocked_overlay.present(app_name, decided_at, target)
+        if record:
+            self._record_distraction(app_name, source)
 
     def hide_blocked_overlay(self):
+        """Hide the overlay on user request (Return to Focus / Allow Once)."""
+        self.core.send("dismissed")
+        self._hide_overlay_window()
+
+    def _hide_overlay_window(self):
         if self.blocked_overlay is not None:
             self.blocked_overlay.hide()
-            self.blocked_overlay.deleteLater()
-            self.blocked_overlay = None
         if self.dashboard_screen is not None:
             self._add_and_show(self.dashboard_screen)
 
+    def allow_once(self, app_name: str, target=None):
+        """Allow Once on the overlay shown for app_name.
+
+        target is what the daemon blocked ({"exe" | "domain" | "budget": key});
+        without one only the shown name is known, so both exe and domain are
+        allowed by that name.
+        """
+        target = target or {"exe": app_name, "domain": app_name}
+        if target.get("exe"):
+            self.core.send("allow_exe", name=target["exe"])
+        if target.get("domain"):
+            self.core.send("allow_domain", domain=target["domain"])
+        if target.get("budget"):
+            self.core.send("allow_budget", key=target["budget"])
+        if self.dashboard_screen is not None:
+            self.dashboard_screen.mark_allowed_once(app_name)
+
     def allow_exe_for_session(self, exe_name: str):
-        self.allowed_exes_session.add(exe_name.lower())
+        self.allow_once(exe_name, {"exe": exe_name})
 
     def allow_domain_for_session(self, domain: str):
-        self.allowed_domains_session.add(domain.lower())
-
-    def _check_active_window(self):
-        """Check the currently active window and show overlay if it's a blocked app or website."""
-        try:
-            # Get the foreground window
-            hwnd = win32gui.GetForegroundWindow()
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            
-            # Get the process name
-            process = psutil.Process(pid)
-            exe_name = os.path.basename(process.exe()).lower()
-            
-            # Get the window title
-            window_title = win32gui.GetWindowText(hwnd).lower()
-            
-            # Check if this is a blocked app
-            rules = self.state.get("sessionRules", {})
-            blocked_apps = [app.lower() for app in rules.get("blockedApps", [])]
-            
-            # Check if exe name contains any blocked app names
-            is_blocked_app = any(blocked_app in exe_name for blocked_app in blocked_apps)
-            
-            # Check if window title contains any blocked website names
-            is_blocked_site = any(blocked_site.lower() in window_title for blocked_site in blocked_apps)
-            
-            # Special handling for browsers - check window title for blocked sites
-            is_browser = exe_name in ['chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'brave.exe']
-            if is_browser and not is_blocked_app:
-                # Check window title for blocked sites
-                blocked_sites = ['instagram', 'youtube', 'facebook', 'twitter', 'tiktok', 'reddit', 'netflix', 'linkedin']
-                is_blocked_site = any(site in window_title for site in blocked_sites)
-            
-            combined_blocked = is_blocked_app or is_blocked_site
-            
-            if combined_blocked and exe_name not in self.allowed_exes_session:
-                if exe_name != self.current_blocked_exe:
-                    self.current_blocked_exe = exe_name
-                    # Show the overlay with a user-friendly name
-                    if is_blocked_site:
-                        # Extract the blocked site name from window title
-                        friendly_name = self._extract_site_from_title(window_title)
-                    else:
-                        friendly_name = self._get_friendly_app_name(exe_name)
-                    self.show_blocked_overlay(friendly_name)
-            else:
-                if self.current_blocked_exe is not None:
-                    self.current_blocked_exe = None
-                    self.hide_blocked_overlay()
-                    
-        except Exception:
-            # If we can't detect the window, just continue
-            pass
-    
-    def _extract_site_from_title(self, window_title):
-        """Extract the website name from the browser window title."""
-        blocked_sites = {
-            'instagram': 'Instagram',
-            'youtube': 'YouTube', 
-            'facebook': 'Facebook',
-            'twitter': 'Twitter',
-            'tiktok': 'TikTok',
-            'reddit': 'Reddit',
-            'netflix': 'Netflix',
-            'linkedin': 'LinkedIn',
-            'twitch': 'Twitch',
-            'discord': 'Discord',
-            'spotify': 'Spotify',
-        }
-        
-        for site_key, site_name in blocked_sites.items():
-            if site_key in window_title.lower():
-                return site_name
-        
-        # Fallback to generic browser detection
-        return "Blocked Website"
-    
-    def _get_friendly_app_name(self, exe_name):
-        """Convert exe name to a more user-friendly name."""
-        app_names = {
-            'chrome.exe': 'Google Chrome',
-            'firefox.exe': 'Mozilla Firefox',
-            'msedge.exe': 'Microsoft Edge',
-            'iexplore.exe': 'Internet Explorer',
-            'opera.exe': 'Opera',
-            'brave.exe': 'Brave Browser',
-            'code.exe': 'Visual Studio Code',
-            'pycharm.exe': 'PyCharm',
-            'idea64.exe': 'IntelliJ IDEA',
-            'sublime_text.exe': 'Sublime Text',
-            'notepad++.exe': 'Notepad++',
-            'notepad.exe': 'Notepad',
-            'winword.exe': 'Microsoft Word',
-            'excel.exe': 'Microsoft Excel',
-            'powerpnt.exe': 'Microsoft PowerPoint',
-            'discord.exe': 'Discord',
-            'slack.exe': 'Slack',
-            'teams.exe': 'Microsoft Teams',
-            'zoom.exe': 'Zoom',
-            'spotify.exe': 'Spotify',
-            'itunes.exe': 'iTunes',
-            'vlc.exe': 'VLC Media Player',
-            'youtube.exe': 'YouTube',
-            'instagram.exe': 'Instagram',
-            'tiktok.exe': 'TikTok',
-            'twitter.exe': 'Twitter',
-            'facebook.exe': 'Facebook',
-            'reddit.exe': 'Reddit',
-            'netflix.exe': 'Netflix',
-        }
-        
-        # Remove .exe extension and convert to title case
-        base_name = exe_name.replace('.exe', '').title()
-        return app_names.get(exe_name, base_name)
-
-    def _process_web_events(self):
-        events = []
-        try:
-            while True:
-                events.append(self.web_event_queue.get_nowait())
-        except Empty:
-            pass
-
-        for ev in events:
-            if ev.get("type") == "web_foreground":
-                url = ev.get("url", "")
-                title = ev.get("title", "")
-                # Simple domain extraction
-                domain = url.split("//")[-1].split("/")[0] if "://" in url else ""
-                
-                # Get blocked domains from session rules
-                rules = self.state.get("sessionRules", {})
-                blocked_domains = set(rules.get("blockedApps", []))
-                
-                # Decide if this URL is blocked based on blocked_domains and allowed_domains_session
-                if any(d in url and d not in self.allowed_domains_session for d in blocked_domains):
-                    if domain != self.current_blocked_domain:
-                        self.current_blocked_domain = domain
-                        self.show_blocked_overlay(domain)
-                else:
-                    if self.current_blocked_domain is not None:
-                        self.current_blocked_domain = None
-                        self.hide_blocked_overlay()
+        self.core.send("allow_domain", domain=domain)
+
+    def enter_tray_mode(self):
+        """Hide to the tray and delete every screen.
+
+        Only the tray icon, the block overlay and the core connection stay;
+        a running session's clock, log and timeline are kept for the
+        dashboard that show_from_tray() builds again from state.
+        """
+        if self.in_tray or self.tray is None:
+            return
+        self.in_tray = True
+        self._tray_screen = self._current_screen_name()
+        if self.dashboard_screen is not None and self.dashboard_screen.session_active:
+            self._tray_session = self.dashboard_screen.detach_session()
+        self.prewarm_timer.stop()
+        self._prewarm_target = None
+        self.hide()
+        for name in SCREENS:
+            self._drop_screen(name)
+        # Native window and backing store; show() creates them again. The
+        # overlay is a window of its own and keeps its own.
+        self.destroy(True, False)
+        QPixmapCache.clear()
+        self.save_state(self.state)
+        self.scheduler.add("tray.trim", trim_process_memory, delay_ms=TRAY_TRIM_DELAY_MS)
+        logger.info("Window closed to the tray")
+
+    def show_from_tray(self):
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def _leave_tray_mode(self):
+        self.in_tray = False
+        self.scheduler.cancel("tray.trim")
+        if self.state.get("activeSessionData"):
+            self.show_dashboard()
+            distractions, self._tray_distractions = self._tray_distractions, []
+            for name, source, ts in distractions:
+                self.dashboard_screen.record_distraction(name, source, ts=ts)
+        elif self._tray_screen in (None, "splash", "dashboard", "session_summary"):
+            self.show_intent_screen()
+        else:
+            self._show_screen(self._tray_screen)
+        self._tray_session = None
+        self._tray_distractions = []
+
+    def quit_app(self):
+        """Quit for real (tray menu); the daemon keeps enforcing a running session."""
+        self._quitting = True
+        self.close()
+
+    def showEvent(self, event):
+        # Any path that opens the window (tray, overlay) rebuilds the screens
+        if self.in_tray:
+            self._leave_tray_mode()
+        super().showEvent(event)
+
+    def changeEvent(self, event):
+        # Minimizing keeps child widgets "visible"; let the session timer
+        # stop repainting until the window is restored.
+        if event.type() == QEvent.WindowStateChange:
+            if (self.isMinimized() and self.tray is not None
+                    and self.tray_settings["minimize_to_tray"]):
+                QTimer.singleShot(0, self.enter_tray_mode)
+            elif self.dashboard_screen is not None:
+                self.dashboard_screen.refresh_ticking()
+        super().changeEvent(event)
 
     def closeEvent(self, event):
+        if not self._quitting and self.tray is not None and self.tray_settings["close_to_tray"]:
+            event.ignore()
+            self.enter_tray_mode()
+            return
         try:
-            if hasattr(self, "web_watcher") and self.web_watcher:
-                self.web_watcher.stop()
-            if hasattr(self, "desktop_timer") and self.desktop_timer:
-                self.desktop_timer.stop()
+            if self.dashboard_screen is not None:
+                self.dashboard_screen.flush_distractions()
+                self.dashboard_screen.checkpoint_session()
+            self.save_state(self.state)
+            # The daemon keeps enforcing an active session without us
+            self.core.close()
+            self.scheduler.on_change = None
+            self.wakeup_timer.stop()
+            if self.tray is not None:
+                self.tray.hide()
+                QApplication.instance().quit()
         except Exception:
             pass
         event.accept()
@@ -363,29 +663,21 @@ class HomeScreen(QWidget):
         layout.setSpacing(16)
 
         title = QLabel("ZenFlow")
-        title.setStyleSheet(
-            f"font-size: 32px; font-weight: 700; color: {theme.COLOR_PRIMARY};"
-        )
+        title.setObjectName("homeTitle")
         title.setAlignment(Qt.AlignCenter)
 
         subtitle = QLabel("Focus without distraction")
-        subtitle.setStyleSheet("color: #64748b; font-size: 16px;")
+        subtitle.setObjectName("homeSubtitle")
         subtitle.setAlignment(Qt.AlignCenter)
 
         start_btn = QPushButton("Start New Session")
         start_btn.setFixedHeight(44)
-        start_btn.setStyleSheet(
-            f"QPushButton {{background:{theme.COLOR_PRIMARY};color:white;border:none;border-radius:10px;"
-            "font-size:15px;font-weight:500;}"
-        )
+        theme.styled(start_btn, variant="primary", size="large")
         start_btn.clicked.connect(self._start_session)
 
         history_btn = QPushButton("Session History")
         history_btn.setFixedHeight(44)
-        history_btn.setStyleSheet(
-            "QPushButton {background:#000000;color:white;border:none;border-radius:10px;"
-            "font-size:15px;font-weight:500;}"
-        )
+        theme.styled(history_btn, variant="dark", size="large")
         history_btn.clicked.connect(self._show_history)
 
         layout.addStretch()
@@ -401,5 +693,5 @@ class HomeScreen(QWidget):
             self.parent.show_intent_screen()
 
     def _show_history(self):
-        if hasattr(self.parent, "show_settings"):
-            self.parent.show_settings()
+        if hasattr(self.parent, "show_history_screen"):
+            self.parent.show_history_screen()
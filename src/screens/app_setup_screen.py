@@ -1,9 +1,157 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QScrollArea, QListWidget, QListWidgetItem, QCheckBox, QLineEdit
+    QScrollArea, QListView, QLineEdit, QCompleter, QMenu, QActionGroup
 )
-from PyQt5.QtCore import Qt, QDateTime
+from PyQt5.QtCore import (
+    Qt, QDateTime, QSize, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QStringListModel,
+    pyqtSignal
+)
+import time
 import src.theme as theme
+import src.icons as icons
+from src.utils.rules import OVERLAY, SUSPEND, TERMINATE
+
+LIST_ICON_SIZE = 20
+
+# The app's own name, for sorting and filtering (the display text may carry
+# its enforcement policy).
+NAME_ROLE = Qt.UserRole
+
+POLICY_LABELS = {
+    OVERLAY: "Show the block overlay",
+    SUSPEND: "Suspend until the session ends",
+    TERMINATE: "Quit the app",
+}
+POLICY_SUFFIXES = {SUSPEND: "suspend", TERMINATE: "quit"}
+
+
+class AppListModel(QAbstractListModel):
+    """Apps listed in one section of the setup screen, each with a check box.
+
+    Rows stay in the order they were added; AppListProxy sorts and filters
+    them for the view. sync() applies only the difference to a new set of
+    names, and toggling a check box changes that one row.
+    """
+
+    toggled = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._apps = []
+        self._rows = {}
+        self._checked = set()
+        self._icon_sources = {}
+        self._policies = {}
+
+    def apps(self):
+        return list(self._apps)
+
+    def set_icon_sources(self, sources):
+        """Map of app -> icon source (see src/icons.py) for the row decorations."""
+        self._icon_sources = sources
+        if self._apps:
+            self.dataChanged.emit(self.index(0), self.index(len(self._apps) - 1), [Qt.DecorationRole])
+
+    def set_policy(self, app, policy):
+        """Show app's enforcement policy next to its name."""
+        if self._policies.get(app, OVERLAY) == policy:
+            return
+        if policy == OVERLAY:
+            self._policies.pop(app, None)
+        else:
+            self._policies[app] = policy
+        if app in self._rows:
+            index = self.index(self._rows[app])
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.ToolTipRole])
+
+    def is_checked(self, app):
+        return app in self._checked
+
+    def sync(self, names):
+        """Make the rows match names (all checked), touching only what differs."""
+        names = set(names)
+        gone = sorted((self._rows[app] for app in self._rows if app not in names), reverse=True)
+        for row in gone:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._checked.discard(self._apps.pop(row))
+            self.endRemoveRows()
+        if gone:
+            self._rows = {app: row for row, app in enumerate(self._apps)}
+
+        for app in self._apps:
+            if app not in self._checked:
+                self._set_checked(app, True)
+
+        new = sorted(names.difference(self._rows))
+        if new:
+            start = len(self._apps)
+            self.beginInsertRows(QModelIndex(), start, start + len(new) - 1)
+            for app in new:
+                self._rows[app] = len(self._apps)
+                self._apps.append(app)
+                self._checked.add(app)
+            self.endInsertRows()
+
+    def _set_checked(self, app, checked):
+        if checked == (app in self._checked):
+            return False
+        if checked:
+            self._checked.add(app)
+        else:
+            self._checked.discard(app)
+        index = self.index(self._rows[app])
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._apps)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._apps):
+            return None
+        app = self._apps[index.row()]
+        if role == Qt.DisplayRole:
+            policy = self._policies.get(app)
+            return f"{app} \u00b7 {POLICY_SUFFIXES[policy]}" if policy else app
+        if role == NAME_ROLE:
+            return app
+        if role == Qt.ToolTipRole:
+            policy = self._policies.get(app)
+            return POLICY_LABELS[policy] if policy else None
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if app in self._checked else Qt.Unchecked
+        if role == Qt.DecorationRole:
+            return icons.pixmap(self._icon_sources.get(app), LIST_ICON_SIZE)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        app = self._apps[index.row()]
+        checked = value == Qt.Checked
+        if self._set_checked(app, checked):
+            self.toggled.emit(app, checked)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+
+class AppListProxy(QSortFilterProxyModel):
+    """Case-insensitive sorted, searchable view of an AppListModel."""
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.setSortRole(NAME_ROLE)
+        self.setFilterRole(NAME_ROLE)
+        self.setSortCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        # Re-sort and re-filter only the rows that were inserted or changed.
+        self.setDynamicSortFilter(True)
+        self.sort(0)
 
 
 class AppSetupScreen(QWidget):
@@ -13,17 +161,60 @@ class AppSetupScreen(QWidget):
         self.state = state or {}
         self.allowed = set()
         self.blocked = set()
-        self.allowed_checkboxes = {}
-        self.blocked_checkboxes = {}
+        # Blocked app -> enforcement policy, for apps not using the overlay
+        self.enforcement = {}
+        self.allowed_model = AppListModel(self)
+        self.allowed_model.toggled.connect(self._on_allowed_toggled)
+        self.blocked_model = AppListModel(self)
+        self.blocked_model.toggled.connect(self._on_blocked_toggled)
+        self._loaded_rules = None
+        # Installed apps offered as completions in the custom-app inputs;
+        # filled in when background discovery finishes.
+        self.installed_model = QStringListModel(self)
         self._init_from_state_or_categories()
         self._setup_ui()
+        self.set_installed_apps(getattr(parent, "installed_apps", []))
+
+    def set_installed_apps(self, apps):
+        self.installed_model.setStringList(sorted({app.rule for app in apps}, key=str.lower))
+        sources = {}
+        for app in apps:
+            if app.icon:
+                sources.setdefault(app.rule, app.icon)
+                sources.setdefault(app.name, app.icon)
+        self.allowed_model.set_icon_sources(sources)
+        self.blocked_model.set_icon_sources(sources)
+
+    def _make_completer(self):
+        completer = QCompleter(self.installed_model, self)
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        completer.setFilterMode(Qt.MatchContains)
+        return completer
+
+    def _rules_key(self):
+        rules = self.state.get("sessionRules", {})
+        return (tuple(rules.get("allowedApps", [])), tuple(rules.get("blockedApps", [])),
+                tuple(self.state.get("selectedCategories", [])))
+
+    def showEvent(self, event):
+        # The screen may have been built ahead of time or kept from an earlier
+        # session; reload if the intent screen has changed the rules since.
+        if self._rules_key() != self._loaded_rules:
+            self._init_from_state_or_categories()
+            self._refresh_ui()
+        super().showEvent(event)
 
     def _init_from_state_or_categories(self):
         """Load allowed/blocked from sessionRules or compute from categories."""
+        self._loaded_rules = self._rules_key()
+        self.allowed = set()
+        self.blocked = set()
         rules = self.state.get("sessionRules", {})
         if rules.get("allowedApps") and rules.get("blockedApps"):
             self.allowed = set(rules.get("allowedApps", []))
             self.blocked = set(rules.get("blockedApps", []))
+            self.enforcement = {app: policy for app, policy in rules.get("enforcement", {}).items()
+                                if app in self.blocked and policy in POLICY_SUFFIXES}
         else:
             # Fallback to category-based defaults
             selected = self.state.get("selectedCategories", [])
@@ -39,65 +230,33 @@ class AppSetupScreen(QWidget):
         layout.setSpacing(16)
 
         title = QLabel("Review and customize your app rules")
-        title.setStyleSheet(
-            f"font-size: 22px; font-weight: 600; color: {theme.COLOR_TEXT_MAIN};"
-        )
+        theme.styled(title, role="title")
         subtitle = QLabel(
             "Allowed apps will stay accessible during your focus session. "
             "Distracting apps will be blocked."
         )
         subtitle.setWordWrap(True)
-        subtitle.setStyleSheet("color: #64748b; font-size: 13px;")
+        theme.styled(subtitle, role="subtitle")
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search apps")
+        self.search_input.setClearButtonEnabled(True)
+        theme.styled(self.search_input, role="appInput")
+        self.search_input.textChanged.connect(self._on_search)
 
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
-        scroll.setStyleSheet(
-            "QScrollArea {"
-            "border: none;"
-            "background-color: transparent;"
-            "}"
-            "QScrollArea > QWidget > QWidget {"
-            "background-color: transparent;"
-            "}"
-            "QScrollBar:vertical {"
-            "border: none;"
-            "background: #f3f4f6;"
-            "width: 8px;"
-            "border-radius: 4px;"
-            "}"
-            "QScrollBar::handle:vertical {"
-            "background: #9ca3af;"
-            "min-height: 20px;"
-            "border-radius: 4px;"
-            "}"
-            "QScrollBar::handle:vertical:hover {"
-            "background: #6b7280;"
-            "}"
-            "QScrollBar::handle:vertical:pressed {"
-            "background: #4b5563;"
-            "}"
-            "QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {"
-            "height: 0px;"
-            "}"
-        )
+        theme.styled(scroll, role="appScroll")
         container = QWidget()
         v_layout = QVBoxLayout(container)
         v_layout.setSpacing(16)
 
         # Allowed apps section
         allowed_label = QLabel("Allowed apps")
-        allowed_label.setStyleSheet(f"font-weight:600;color:{theme.COLOR_ALLOWED};")
+        theme.styled(allowed_label, role="heading", tone="allowed")
         v_layout.addWidget(allowed_label)
 
-        allowed_list = QListWidget()
-        allowed_list.setMaximumHeight(200)
-        allowed_list.setStyleSheet(
-            "QListWidget { border: 1px solid #e2e8f0; border-radius: 8px; background-color: #f8fafc; padding: 8px; }"
-            "QListWidget::item { padding: 8px; border-radius: 6px; margin: 2px 0; }"
-            "QListWidget::item:hover { background-color: #f1f5f9; }"
-            "QListWidget::item:selected { background-color: transparent; }"
-            "QCheckBox { spacing: 12px; font-size: 13px; }"
-        )
+        allowed_list = self._make_list(self.allowed_model)
         # Store reference
         self.allowed_list = allowed_list
         self._populate_allowed_list()
@@ -109,26 +268,11 @@ class AppSetupScreen(QWidget):
         
         allowed_input = QLineEdit()
         allowed_input.setPlaceholderText("Add allowed app or site (e.g. Notion)")
-        allowed_input.setStyleSheet(
-            "QLineEdit {"
-            "border: 1px solid #e5e7eb;"
-            "border-radius: 8px;"
-            "padding: 10px 12px;"
-            "font-size: 13px;"
-            "background-color: #ffffff;"
-            "color: #374151;"
-            "}"
-            "QLineEdit:focus {"
-            "border: 2px solid #6E260E;"
-            "outline: none;"
-            "}"
-        )
+        theme.styled(allowed_input, role="appInput")
+        allowed_input.setCompleter(self._make_completer())
         
         add_allowed_btn = QPushButton("Add to allowed")
-        add_allowed_btn.setStyleSheet(
-            "QPushButton {background:#6E260E;color:white;border:none;border-radius:8px;"
-            "font-size:12px;font-weight:500;padding:10px 16px;}"
-        )
+        theme.styled(add_allowed_btn, variant="primary", size="small")
         add_allowed_btn.clicked.connect(
             lambda: self._add_custom_allowed(allowed_input.text())
         )
@@ -142,18 +286,17 @@ class AppSetupScreen(QWidget):
 
         # Blocked apps section
         blocked_label = QLabel("Distracting apps")
-        blocked_label.setStyleSheet(f"font-weight:600;color:{theme.COLOR_BLOCKED};margin-top:12px;")
+        theme.styled(blocked_label, role="heading", tone="blocked")
         v_layout.addWidget(blocked_label)
 
-        blocked_list = QListWidget()
-        blocked_list.setMaximumHeight(200)
-        blocked_list.setStyleSheet(
-            "QListWidget { border: 1px solid #e2e8f0; border-radius: 8px; background-color: #f8fafc; padding: 8px; }"
-            "QListWidget::item { padding: 8px; border-radius: 6px; margin: 2px 0; }"
-            "QListWidget::item:hover { background-color: #f1f5f9; }"
-            "QListWidget::item:selected { background-color: transparent; }"
-            "QCheckBox { spacing: 12px; font-size: 13px; }"
-        )
+        blocked_hint = QLabel("Right-click an app to suspend or quit it instead of showing the overlay.")
+        blocked_hint.setWordWrap(True)
+        theme.styled(blocked_hint, role="caption")
+        v_layout.addWidget(blocked_hint)
+
+        blocked_list = self._make_list(self.blocked_model)
+        blocked_list.setContextMenuPolicy(Qt.CustomContextMenu)
+        blocked_list.customContextMenuRequested.connect(self._show_policy_menu)
         # Store reference
         self.blocked_list = blocked_list
         self._populate_blocked_list()
@@ -165,26 +308,11 @@ class AppSetupScreen(QWidget):
         
         blocked_input = QLineEdit()
         blocked_input.setPlaceholderText("Add blocked app or site (e.g. Instagram)")
-        blocked_input.setStyleSheet(
-            "QLineEdit {"
-            "border: 1px solid #e5e7eb;"
-            "border-radius: 8px;"
-            "padding: 10px 12px;"
-            "font-size: 13px;"
-            "background-color: #ffffff;"
-            "color: #374151;"
-            "}"
-            "QLineEdit:focus {"
-            "border: 2px solid #6E260E;"
-            "outline: none;"
-            "}"
-        )
+        theme.styled(blocked_input, role="appInput")
+        blocked_input.setCompleter(self._make_completer())
         
         add_blocked_btn = QPushButton("Add to blocked")
-        add_blocked_btn.setStyleSheet(
-            "QPushButton {background:#000000;color:white;border:none;border-radius:8px;"
-            "font-size:12px;font-weight:500;padding:10px 16px;}"
-        )
+        theme.styled(add_blocked_btn, variant="dark", size="small")
         add_blocked_btn.clicked.connect(
             lambda: self._add_custom_blocked(blocked_input.text())
         )
@@ -201,27 +329,64 @@ class AppSetupScreen(QWidget):
         # Start Session button
         start_btn = QPushButton("Start Session")
         start_btn.setFixedHeight(44)
-        start_btn.setStyleSheet(
-            "QPushButton {background:#6E260E;color:white;border:none;border-radius:8px;"
-            "font-size:13px;font-weight:500;padding:10px 20px;}"
-        )
+        theme.styled(start_btn, variant="primary")
         start_btn.clicked.connect(self._on_start_session)
 
         layout.addWidget(title)
         layout.addWidget(subtitle)
+        layout.addWidget(self.search_input)
         layout.addWidget(scroll, 1)
         layout.addWidget(start_btn)
 
-    def _on_allowed_toggled(self, app, state):
-        if state == Qt.Unchecked:
+    def _make_list(self, model):
+        view = QListView()
+        view.setModel(AppListProxy(model, view))
+        view.setMaximumHeight(200)
+        view.setUniformItemSizes(True)
+        view.setIconSize(QSize(LIST_ICON_SIZE, LIST_ICON_SIZE))
+        view.setSelectionMode(QListView.NoSelection)
+        view.setEditTriggers(QListView.NoEditTriggers)
+        theme.styled(view, role="appList")
+        return view
+
+    def _on_search(self, text):
+        for view in (self.allowed_list, self.blocked_list):
+            view.model().setFilterFixedString(text.strip())
+
+    def _show_policy_menu(self, pos):
+        index = self.blocked_list.indexAt(pos)
+        if not index.isValid():
+            return
+        app = index.data(NAME_ROLE)
+        menu = QMenu(self)
+        group = QActionGroup(menu)
+        current = self.enforcement.get(app, OVERLAY)
+        for policy, label in POLICY_LABELS.items():
+            action = menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(policy == current)
+            action.triggered.connect(lambda _, policy=policy: self.set_policy(app, policy))
+            group.addAction(action)
+        menu.exec_(self.blocked_list.viewport().mapToGlobal(pos))
+
+    def set_policy(self, app, policy):
+        """What happens when blocked app runs: overlay, suspend or terminate."""
+        if policy == OVERLAY:
+            self.enforcement.pop(app, None)
+        else:
+            self.enforcement[app] = policy
+        self.blocked_model.set_policy(app, policy)
+
+    def _on_allowed_toggled(self, app, checked):
+        if not checked:
             self.allowed.discard(app)
             self.blocked.add(app)
         else:
             self.allowed.add(app)
             self.blocked.discard(app)
 
-    def _on_blocked_toggled(self, app, state):
-        if state == Qt.Unchecked:
+    def _on_blocked_toggled(self, app, checked):
+        if not checked:
             self.blocked.discard(app)
         else:
             self.blocked.add(app)
@@ -250,40 +415,14 @@ class AppSetupScreen(QWidget):
             self._refresh_ui()
 
     def _populate_allowed_list(self):
-        """Populate the allowed apps list."""
-        if not hasattr(self, 'allowed_list'):
-            return
-            
-        self.allowed_list.clear()
-        for app in sorted(self.allowed):
-            item = QListWidgetItem()
-            checkbox = QCheckBox()
-            checkbox.setChecked(True)
-            checkbox.setText(app)
-            checkbox.stateChanged.connect(
-                lambda state, a=app: self._on_allowed_toggled(a, state)
-            )
-            self.allowed_checkboxes[app] = checkbox
-            self.allowed_list.addItem(item)
-            self.allowed_list.setItemWidget(item, checkbox)
+        """Bring the allowed list in line with the allowed set."""
+        self.allowed_model.sync(self.allowed)
     
     def _populate_blocked_list(self):
-        """Populate the blocked apps list."""
-        if not hasattr(self, 'blocked_list'):
-            return
-            
-        self.blocked_list.clear()
-        for app in sorted(self.blocked):
-            item = QListWidgetItem()
-            checkbox = QCheckBox()
-            checkbox.setChecked(True)
-            checkbox.setText(app)
-            checkbox.stateChanged.connect(
-                lambda state, b=app: self._on_blocked_toggled(b, state)
-            )
-            self.blocked_checkboxes[app] = checkbox
-            self.blocked_list.addItem(item)
-            self.blocked_list.setItemWidget(item, checkbox)
+        """Bring the blocked list in line with the blocked set."""
+        self.blocked_model.sync(self.blocked)
+        for app in self.blocked:
+            self.blocked_model.set_policy(app, self.enforcement.get(app, OVERLAY))
     
     def _populate_lists(self):
         """Populate both allowed and blocked lists."""
@@ -291,27 +430,24 @@ class AppSetupScreen(QWidget):
         self._populate_blocked_list()
         
     def _refresh_ui(self):
-        """Refresh the UI to show updated allowed/blocked lists."""
-        # Clear current checkboxes
-        self.allowed_checkboxes.clear()
-        self.blocked_checkboxes.clear()
-        
-        # Clear the lists
-        if hasattr(self, 'allowed_list'):
-            self.allowed_list.clear()
-        if hasattr(self, 'blocked_list'):
-            self.blocked_list.clear()
-        
-        # Repopulate the lists
+        """Refresh the UI to show updated allowed/blocked lists.
+
+        Only apps that moved between the sets change rows; the rest stay put.
+        """
         self._populate_lists()
         
     def _on_start_session(self):
+        budgets = self.state.get("sessionRules", {}).get("budgets", {})
         self.state["sessionRules"] = {
             "allowedApps": sorted(self.allowed),
             "blockedApps": sorted(self.blocked),
+            "budgets": budgets,
+            "enforcement": {app: policy for app, policy in sorted(self.enforcement.items())
+                            if app in self.blocked},
         }
         self.state["activeSessionData"] = {
             "startTime": str(QDateTime.currentDateTime().toString()),
+            "startEpoch": time.time(),
             "distractionAttempts": 0,
         }
         if hasattr(self.parent, "save_state"):
@@ -1,14 +1,31 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QApplication, QStyle
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QFontDatabase
+import time
 import src.theme as theme
+import src.icons as icons
+from src.utils.metrics import LatencyStats
+
+
+OVERLAY_ICON_SIZE = 48
 
 
 class BlockedOverlayScreen(QWidget):
+    """Full-screen block overlay.
+
+    MainWindow builds one instance during idle time after startup and keeps it
+    hidden; present() only swaps the app label and raises the window.
+    """
+
     def __init__(self, parent=None, app_name="Blocked app"):
         super().__init__(parent)
         self.parent = parent
         self.app_name = app_name
+        # What Allow Once lifts (see MainWindow.allow_once); None = by app_name
+        self.target = None
+        # Block decision -> first paint of the overlay
+        self.latency = LatencyStats("overlay.block_to_paint_ms")
+        self._requested_at = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -20,7 +37,6 @@ class BlockedOverlayScreen(QWidget):
             | Qt.WindowDoesNotAcceptFocus
         )
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.showFullScreen()
 
         # Main layout
         main_layout = QVBoxLayout(self)
@@ -28,9 +44,7 @@ class BlockedOverlayScreen(QWidget):
         
         # Overlay background - clean blur effect
         overlay = QWidget()
-        overlay.setStyleSheet(
-            "background: rgba(0, 0, 0, 0.88);"
-        )
+        overlay.setObjectName("overlayBackdrop")
         overlay_layout = QVBoxLayout(overlay)
         overlay_layout.setContentsMargins(0, 0, 0, 0)
         overlay_layout.setAlignment(Qt.AlignCenter)
@@ -38,10 +52,7 @@ class BlockedOverlayScreen(QWidget):
         # Content card - minimal and clean
         card = QWidget()
         card.setFixedWidth(420)
-        card.setStyleSheet(
-            "background-color: #ffffff;"
-            "border-radius: 16px;"
-        )
+        card.setObjectName("overlayCard")
         card_layout = QVBoxLayout(card)
         card_layout.setSpacing(12)
         card_layout.setContentsMargins(32, 28, 32, 28)
@@ -50,33 +61,25 @@ class BlockedOverlayScreen(QWidget):
         # Icon - simple and minimal
         icon_label = QLabel()
         icon = QApplication.style().standardIcon(QStyle.SP_MessageBoxCritical)
-        pixmap = icon.pixmap(48, 48)
-        icon_label.setPixmap(pixmap)
+        self._default_icon = icon.pixmap(OVERLAY_ICON_SIZE, OVERLAY_ICON_SIZE)
+        icon_label.setPixmap(self._app_icon(self.app_name))
         icon_label.setAlignment(Qt.AlignCenter)
-        icon_label.setStyleSheet("background: transparent;")
+        self.icon_label = icon_label
 
         # Title - clean typography
         title = QLabel("App Blocked")
-        title.setStyleSheet(
-            "font-size: 24px; font-weight: 600; color: #111827; "
-            "background: transparent;"
-        )
+        title.setObjectName("overlayTitle")
         title.setAlignment(Qt.AlignCenter)
 
         # App name - subtle accent
         app_label = QLabel(self.app_name)
-        app_label.setStyleSheet(
-            "font-size: 15px; font-weight: 500; color: #6b7280; "
-            "background: transparent;"
-        )
+        self.app_label = app_label
+        app_label.setObjectName("overlayAppName")
         app_label.setAlignment(Qt.AlignCenter)
 
         # Description - minimal
         desc = QLabel("Choose an option to continue")
-        desc.setStyleSheet(
-            "font-size: 13px; color: #9ca3af; "
-            "background: transparent;"
-        )
+        desc.setObjectName("overlayHint")
         desc.setAlignment(Qt.AlignCenter)
 
         # Buttons - clean and simple
@@ -84,29 +87,12 @@ class BlockedOverlayScreen(QWidget):
         button_layout.setSpacing(10)
 
         back_btn = QPushButton("Return to Focus")
-        back_btn.setStyleSheet(
-            "QPushButton {"
-            "background: #6E260E;"
-            "color: white; border: none; border-radius: 8px;"
-            "padding: 12px 24px; font-size: 13px; font-weight: 500;"
-            "}"
-            "QPushButton:hover {"
-            "background: #8B3214;"
-            "}"
-        )
+        back_btn.setObjectName("overlayReturnButton")
         back_btn.setCursor(Qt.PointingHandCursor)
         back_btn.clicked.connect(self._return_focus)
 
         allow_btn = QPushButton("Allow Once")
-        allow_btn.setStyleSheet(
-            "QPushButton {"
-            "background: #f9fafb; color: #374151; border: 1px solid #e5e7eb;"
-            "border-radius: 8px; padding: 12px 24px; font-size: 13px; font-weight: 500;"
-            "}"
-            "QPushButton:hover {"
-            "background: #f3f4f6;"
-            "}"
-        )
+        allow_btn.setObjectName("overlayAllowButton")
         allow_btn.setCursor(Qt.PointingHandCursor)
         allow_btn.clicked.connect(self._allow_once)
 
@@ -130,6 +116,32 @@ class BlockedOverlayScreen(QWidget):
         # Add overlay to main layout
         main_layout.addWidget(overlay)
 
+    def present(self, app_name, requested_at=None, target=None):
+        """Show the overlay for app_name; requested_at is the perf_counter() of the block decision."""
+        self.target = target
+        if app_name != self.app_name:
+            self.app_name = app_name
+            self.app_label.setText(app_name)
+            self.icon_label.setPixmap(self._app_icon(app_name))
+        self._requested_at = requested_at if requested_at is not None else time.perf_counter()
+        if self.isVisible():
+            self.raise_()
+            self.update()
+        else:
+            self.showFullScreen()
+            self.raise_()
+
+    def _app_icon(self, app_name):
+        """The blocked app's own icon if discovery found one (pre-rendered and cached)."""
+        source = self.parent.icon_source(app_name) if hasattr(self.parent, "icon_source") else None
+        return icons.pixmap(source, OVERLAY_ICON_SIZE) or self._default_icon
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._requested_at is not None:
+            self.latency.add((time.perf_counter() - self._requested_at) * 1000)
+            self._requested_at = None
+
     def _return_focus(self):
         # Hide the overlay first
         if hasattr(self.parent, "hide_blocked_overlay"):
@@ -148,31 +160,17 @@ class BlockedOverlayScreen(QWidget):
             self.parent.show_dashboard()
 
     def _allow_once(self):
-        # Add this app to allowed list for current session
-        state = self.parent.state if hasattr(self.parent, 'state') else {}
-        rules = state.get("sessionRules", {})
-        
-        # Remove from blocked apps and add to allowed apps
-        if "blockedApps" in rules and self.app_name in rules["blockedApps"]:
-            rules["blockedApps"].remove(self.app_name)
-        if "allowedApps" in rules and self.app_name not in rules["allowedApps"]:
-            rules["allowedApps"].append(self.app_name)
-        
-        state["sessionRules"] = rules
-        
-        # Mark this exe as allowed for the current session
-        if hasattr(self.parent, "allow_exe_for_session"):
-            self.parent.allow_exe_for_session(self.app_name)
-        
-        # Allow as a domain for this session if applicable
-        if hasattr(self.parent, "allow_domain_for_session"):
-            self.parent.allow_domain_for_session(self.app_name)
+        # Allowed for the rest of this session only; the session rules stay as
+        # they are (app_name is a display name, e.g. "YouTube (daily limit reached)")
+        if hasattr(self.parent, "allow_once"):
+            self.parent.allow_once(self.app_name, self.target)
 
         # Hide overlay and minimize to let user access the app
         if hasattr(self.parent, "hide_blocked_overlay"):
             self.parent.hide_blocked_overlay()
         
-        if hasattr(self.parent, "showMinimized"):
+        # A window in the tray stays there
+        if hasattr(self.parent, "showMinimized") and not getattr(self.parent, "in_tray", False):
             self.parent.showMinimized()
 
     def keyPressEvent(self, event):
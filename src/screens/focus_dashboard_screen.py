@@ -2,8 +2,32 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QScrollArea, QFrame, QSpinBox
 )
-from PyQt5.QtCore import Qt, QTimer, QTime, QDateTime
+from PyQt5.QtCore import Qt, QTime, QDateTime
+import time
+from typing import NamedTuple
 import src.theme as theme
+from src.utils.rollups import FocusRollups
+from src.utils.store import bump_history_version
+from src.utils.distraction_log import DistractionLog
+from src.utils.timeline import FocusTimeline
+from src.utils.session_clock import SessionClock
+from src.utils.scheduler import Scheduler
+from src.utils.reminders import load_health_settings, sync_reminders
+
+# Pending distraction events and state changes are written at most this often.
+DISTRACTION_FLUSH_MS = 30 * 1000
+TIP_INTERVAL_MS = 20 * 60 * 1000
+# Ticks land this long after a whole elapsed second, so the label never
+# shows the previous second because a timer fired a little early.
+TICK_SLACK_MS = 5
+
+
+class DashboardSession(NamedTuple):
+    """A running session's data, kept while the screen itself is deleted."""
+    clock: SessionClock
+    distraction_log: DistractionLog
+    timeline: FocusTimeline
+    start_time: QTime
 
 
 class FocusDashboardScreen(QWidget):
@@ -11,16 +35,70 @@ class FocusDashboardScreen(QWidget):
         super().__init__(parent)
         self.parent = parent
         self.state = state or {}
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update_timer)
-        self.tip_timer = QTimer(self)
-        self.tip_timer.timeout.connect(self._show_health_tip)
+        # Jobs run on the window's scheduler. Standalone (benchmarks) they are
+        # recorded on a private one that nothing drives.
+        self.scheduler = getattr(parent, "scheduler", None) or Scheduler()
+        self.clock = SessionClock()
+        self.health_settings = load_health_settings()
         self.session_start_time = QTime.currentTime()
-        self.elapsed_seconds = 0
         self.distraction_count = 0
+        self.rollups = FocusRollups.from_state(self.state)
+        self.distraction_log = DistractionLog()
+        self.timeline = FocusTimeline()
+        self.session_active = False
         self._setup_ui()
+
+    def start_session(self, resume=None):
+        """Reset per-session counters and start the timers.
+
+        The screen may be built ahead of time and is reused across sessions, so
+        the main window calls this whenever a new session is shown. A session
+        that kept running in the core daemon while the window was closed
+        continues where it is; resume is the DashboardSession detach_session()
+        returned when the window went to the tray.
+        """
+        active = self.state.get("activeSessionData", {})
+        if resume is not None:
+            self.clock = resume.clock
+            self.distraction_log = resume.distraction_log
+            self.timeline = resume.timeline
+            self.session_start_time = resume.start_time
+        else:
+            started = active.get("startEpoch")
+            self.session_start_time = QTime.currentTime()
+            self.clock.start(max(0.0, time.time() - started) if started else 0.0)
+            # A window closed mid-session saved these (see checkpoint_session)
+            self.distraction_log = DistractionLog()
+            self.distraction_log.counts.update(active.get("distractionsByApp", {}))
+            timeline = active.get("timeline")
+            self.timeline = FocusTimeline.from_dict(timeline) if timeline else FocusTimeline()
+        self.distraction_count = active.get("distractionAttempts", 0)
+        self.session_active = True
+        self.timer_label.setText("00:00:00")
+        self.distraction_label.setText(
+            f"{self.distraction_count} distraction{'s' if self.distraction_count != 1 else ''}")
+        self._update_today_label()
         self._start_timers()
 
+    def detach_session(self):
+        """Stop this screen's jobs and hand over the running session's data.
+
+        Used before the screen is deleted with the session still running; pass
+        the result to start_session() on the screen that replaces it.
+        """
+        self.cancel_jobs()
+        self.session_active = False
+        return DashboardSession(self.clock, self.distraction_log, self.timeline, self.session_start_time)
+
+    def cancel_jobs(self):
+        """Write pending distractions and cancel every job bound to this screen.
+
+        The scheduler is the window's and outlives the screen, so this runs
+        whenever the screen is deleted, with or without a session running.
+        """
+        self.flush_distractions()
+        self.scheduler.cancel_group("session")
+
     def _setup_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(24, 24, 24, 24)
@@ -31,17 +109,12 @@ class FocusDashboardScreen(QWidget):
         header.setSpacing(8)
         
         title = QLabel("Focus Session")
-        title.setStyleSheet(
-            f"font-size:18px;font-weight:500;color:{theme.COLOR_TEXT_MAIN};letter-spacing:0.5px;"
-        )
+        theme.styled(title, role="screenTitle")
         title.setAlignment(Qt.AlignCenter)
         
         self.timer_label = QLabel("00:00:00")
         self.timer_label.setAlignment(Qt.AlignCenter)
-        self.timer_label.setStyleSheet(
-            f"font-size:32px;font-weight:300;color:{theme.COLOR_TEXT_MAIN};margin:4px 0 16px 0;"
-            "font-family: 'SF Mono', 'Monaco', 'Inconsolata', monospace;"
-        )
+        self.timer_label.setObjectName("sessionTimer")
         
         header.addWidget(title)
         header.addWidget(self.timer_label)
@@ -50,22 +123,16 @@ class FocusDashboardScreen(QWidget):
         # Minimalist status indicator
         status_frame = QFrame()
         status_frame.setFixedHeight(80)
-        status_frame.setStyleSheet(
-            "background:#6E260E;border-radius:12px;"
-        )
+        status_frame.setObjectName("statusFrame")
         status_layout = QVBoxLayout(status_frame)
         status_layout.setContentsMargins(16, 16, 16, 16)
         
         status_text = QLabel("In Focus")
-        status_text.setStyleSheet(
-            "color:white;font-size:14px;font-weight:500;letter-spacing:1px;"
-        )
+        status_text.setObjectName("statusText")
         status_text.setAlignment(Qt.AlignCenter)
         
         self.distraction_label = QLabel("0 distractions")
-        self.distraction_label.setStyleSheet(
-            "color:rgba(255,255,255,0.8);font-size:11px;font-weight:400;"
-        )
+        self.distraction_label.setObjectName("distractionLabel")
         self.distraction_label.setAlignment(Qt.AlignCenter)
         
         status_layout.addWidget(status_text)
@@ -73,24 +140,34 @@ class FocusDashboardScreen(QWidget):
         
         layout.addWidget(status_frame)
 
+        self.today_label = QLabel()
+        theme.styled(self.today_label, role="caption")
+        self.today_label.setAlignment(Qt.AlignCenter)
+        self._update_today_label()
+        layout.addWidget(self.today_label)
+
+        # Blocked apps held suspended by hard enforcement, one row each
+        self.suspended_panel = QFrame()
+        theme.styled(self.suspended_panel, role="panel")
+        self.suspended_layout = QVBoxLayout(self.suspended_panel)
+        self.suspended_layout.setContentsMargins(16, 12, 16, 12)
+        self.suspended_layout.setSpacing(8)
+        self.suspended_panel.hide()
+        self._suspended_apps = []
+        layout.addWidget(self.suspended_panel)
+
         # Minimalist tips section
         tips_container = QFrame()
-        tips_container.setStyleSheet(
-            "background:#fafafa;border-radius:12px;"
-        )
+        theme.styled(tips_container, role="panel")
         tips_layout = QVBoxLayout(tips_container)
         tips_layout.setContentsMargins(20, 20, 20, 20)
         tips_layout.setSpacing(12)
         
         tips_title = QLabel("Wellness Tips")
-        tips_title.setStyleSheet(
-            f"font-size:12px;font-weight:600;color:{theme.COLOR_TEXT_MAIN};text-transform:uppercase;letter-spacing:1px;"
-        )
+        theme.styled(tips_title, role="sectionTitle")
         
         self.tip_label = QLabel("Take a deep breath and stay focused")
-        self.tip_label.setStyleSheet(
-            "color:#6b7280;font-size:13px;line-height:1.4;"
-        )
+        self.tip_label.setObjectName("tipLabel")
         self.tip_label.setWordWrap(True)
         
         tips_layout.addWidget(tips_title)
@@ -104,17 +181,11 @@ class FocusDashboardScreen(QWidget):
         button_layout.setSpacing(12)
         
         end_btn = QPushButton("End Session")
-        end_btn.setStyleSheet(
-            "QPushButton {background:#6E260E;color:white;border:none;border-radius:8px;"
-            "padding:10px 20px;font-size:13px;font-weight:500;}"
-        )
+        theme.styled(end_btn, variant="primary")
         end_btn.clicked.connect(self._end_session)
         
         settings_btn = QPushButton("Settings")
-        settings_btn.setStyleSheet(
-            "QPushButton {background:#000000;color:white;border:none;border-radius:8px;"
-            "padding:10px 20px;font-size:13px;font-weight:500;}"
-        )
+        theme.styled(settings_btn, variant="dark")
         settings_btn.clicked.connect(self._open_settings)
         
         button_layout.addStretch()
@@ -123,16 +194,60 @@ class FocusDashboardScreen(QWidget):
         
         layout.addLayout(button_layout)
 
+    @property
+    def elapsed_seconds(self):
+        return self.clock.seconds()
+
     def _start_timers(self):
-        self.timer.start(1000)
-        self.tip_timer.start(20 * 60 * 1000)
+        self.refresh_ticking()
+        # Tips and reminders start over with each session. add() replaces a
+        # job of the same name, so nothing bound to an older screen survives.
+        self.scheduler.add("session.tip", self._show_health_tip, TIP_INTERVAL_MS,
+                           tolerance_ms=60 * 1000, group="session")
+        self.sync_reminders()
+
+    def sync_reminders(self):
+        """Match the reminder jobs to config/settings.json and the user's toggles."""
+        sync_reminders(self.scheduler, self.health_settings,
+                       self.state.get("userPreferences", {}), self.show_reminder)
+
+    def set_health_settings(self, settings):
+        """Apply reloaded health settings; only changed reminder intervals are retimed."""
+        self.health_settings = settings
+        if self.session_active:
+            self.sync_reminders()
+
+    def show_reminder(self, message):
+        self.tip_label.setText(message)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_ticking()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.scheduler.cancel("session.tick")
+
+    def refresh_ticking(self):
+        """Tick only while a session runs and the timer label can be seen."""
+        visible = self.timer_label.isVisible() and not self.window().isMinimized()
+        if self.session_active and visible:
+            self._update_timer()
+        else:
+            self.scheduler.cancel("session.tick")
 
     def _update_timer(self):
-        self.elapsed_seconds += 1
-        hours = self.elapsed_seconds // 3600
-        minutes = (self.elapsed_seconds % 3600) // 60
-        seconds = self.elapsed_seconds % 60
+        elapsed = self.elapsed_seconds
+        hours = elapsed // 3600
+        minutes = (elapsed % 3600) // 60
+        seconds = elapsed % 60
         self.timer_label.setText(f"{hours:02d}:{minutes:02d}:{seconds:02d}")
+        if self.session_active:
+            # One-shot, re-armed from the clock each second; no tolerance so
+            # the label turns over on time.
+            self.scheduler.add("session.tick", self._update_timer,
+                               delay_ms=self.clock.ms_to_next_second() + TICK_SLACK_MS,
+                               group="session")
 
     def _show_health_tip(self):
         tips = [
@@ -164,20 +279,103 @@ class FocusDashboardScreen(QWidget):
         if hasattr(self, 'tip_label'):
             self.tip_label.setText(tip)
 
-    def record_distraction(self, app_name):
+    def _update_today_label(self):
+        today = self.rollups.day()
+        minutes = today["focusSeconds"] // 60
+        streak = self.rollups.current_streak()
+        text = f"Today: {minutes // 60}h {minutes % 60:02d}m focused \u00b7 {today['distractions']} distractions"
+        if streak:
+            text += f" \u00b7 {streak}-day streak"
+        self.today_label.setText(text)
+
+    def record_distraction(self, app_name, source="desktop", ts=None):
+        """Count a blocked attempt; ts is its monotonic time if it happened earlier."""
         self.distraction_count += 1
         self.distraction_label.setText(f"{self.distraction_count} distraction{'s' if self.distraction_count != 1 else ''}")
+        self.rollups.add_distraction()
+        self._update_today_label()
         
-        # Update session data
+        # Update session data in memory; disk writes are batched
         active = self.state.get("activeSessionData", {})
         active["distractionAttempts"] = self.distraction_count
         self.state["activeSessionData"] = active
+        should_flush = self.distraction_log.record(app_name, source, ts=ts)
+        # Kept next to the count so whichever state write comes next has both
+        active["distractionsByApp"] = self.distraction_log.breakdown()
+        if should_flush:
+            self.flush_distractions()
+        elif "session.flush" not in self.scheduler.jobs:
+            self.scheduler.add("session.flush", self.flush_distractions,
+                               delay_ms=DISTRACTION_FLUSH_MS, tolerance_ms=5000)
+
+    def set_suspended_apps(self, apps):
+        """Show (app, label) pairs hard enforcement keeps suspended, each with Allow Once."""
+        apps = list(apps)
+        if apps == self._suspended_apps:
+            return
+        self._suspended_apps = apps
+        while self.suspended_layout.count():
+            item = self.suspended_layout.takeAt(0)
+            if item.layout() is not None:
+                while item.layout().count():
+                    item.layout().takeAt(0).widget().deleteLater()
+                item.layout().deleteLater()
+        for app, name in apps:
+            row = QHBoxLayout()
+            label = QLabel(f"{name} is suspended until the session ends")
+            theme.styled(label, role="caption")
+            allow_btn = QPushButton("Allow Once")
+            theme.styled(allow_btn, variant="dark", size="small")
+            allow_btn.clicked.connect(lambda _, app=app: self._allow_suspended(app))
+            row.addWidget(label, 1)
+            row.addWidget(allow_btn)
+            self.suspended_layout.addLayout(row)
+        self.suspended_panel.setVisible(bool(apps))
+
+    def _allow_suspended(self, app):
+        if hasattr(self.parent, "allow_exe_for_session"):
+            self.parent.allow_exe_for_session(app)
+
+    def mark_allowed_once(self, app_name):
+        self.distraction_log.mark_allow_once(app_name)
+
+    def checkpoint_session(self):
+        """Copy the running session's timeline into activeSessionData.
+
+        The core daemon keeps a session running while the window is closed;
+        start_session() on the next window restores the timeline and the
+        per-app breakdown from there, so the history entry covers the whole
+        session and not just the time since reopening.
+        """
+        active = self.state.get("activeSessionData")
+        if self.session_active and active:
+            active["distractionsByApp"] = self.distraction_log.breakdown()
+            active["timeline"] = self.timeline.to_dict(now=time.monotonic())
+
+    def flush_distractions(self):
+        """Write pending distraction events and the session state in one batch."""
+        self.scheduler.cancel("session.flush")
+        if not self.distraction_log.pending:
+            return
+        self.distraction_log.flush()
+        self.checkpoint_session()
         if hasattr(self.parent, "save_state"):
             self.parent.save_state(self.state)
 
+    def observe_foreground(self, app, domain=None):
+        """Feed the current foreground app/domain into the session timeline."""
+        if self.session_active:
+            self.timeline.observe(app, domain)
+
     def _end_session(self):
-        self.timer.stop()
-        self.tip_timer.stop()
+        self.session_active = False
+        if hasattr(self.parent, "resume_suspended"):
+            self.parent.resume_suspended()
+        self.clock.stop()
+        self.scheduler.cancel("session.flush")
+        self.scheduler.cancel_group("session")
+        self.distraction_log.flush()
+        self.timeline.close()
         
         # Update session data
         active = self.state.get("activeSessionData", {})
@@ -193,12 +391,20 @@ class FocusDashboardScreen(QWidget):
             "selectedCategories": self.state.get("selectedCategories", []),
             "sessionRules": self.state.get("sessionRules", {}),
             "distractionAttempts": self.distraction_count,
+            "distractionsByApp": self.distraction_log.breakdown(),
+            "timeline": self.timeline.to_dict(),
+            "suspendedSeconds": int(self.clock.suspended_seconds),
+            "suppressedFlaps": getattr(self.parent, "suppressed_flaps", 0),
+            "endedAtEpoch": int(time.time()),
         }
         
         history = self.state.get("sessionHistory", [])
         history.insert(0, session_entry)
         self.state["sessionHistory"] = history
         self.state["activeSessionData"] = {}
+        bump_history_version(self.state)
+        self.rollups.add_session(self.elapsed_seconds)
+        self._update_today_label()
         
         if hasattr(self.parent, "save_state"):
             self.parent.save_state(self.state)
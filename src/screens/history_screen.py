@@ -0,0 +1,183 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QListView, QStyledItemDelegate, QStyle
+)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPen
+import src.theme as theme
+from src.utils.rollups import session_end_time
+from src.utils.store import history_page, history_version
+
+# Sessions pulled from the store per fetchMore() call.
+PAGE_SIZE = 200
+ROW_HEIGHT = 64
+
+
+class SessionHistoryModel(QAbstractListModel):
+    """List model over sessionHistory that loads rows page by page.
+
+    Rows are formatted once when their page is fetched; painting only reads
+    the cached tuples.
+    """
+
+    SessionRole = Qt.UserRole + 1
+
+    def __init__(self, state, parent=None):
+        super().__init__(parent)
+        self.state = state
+        self._rows = []
+        self._version = None
+
+    def refresh(self):
+        """Drop loaded pages if the history changed since the last load."""
+        version = (history_version(self.state), len(self.state.get("sessionHistory", [])))
+        if version == self._version:
+            return
+        self.beginResetModel()
+        self._rows = []
+        self._version = version
+        self.endResetModel()
+
+    def total(self):
+        return len(self.state.get("sessionHistory", []))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self.total()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        page = history_page(self.state, len(self._rows), PAGE_SIZE)
+        if not page:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._rows.extend(self._format(session) for session in page)
+        self.endInsertRows()
+
+    @staticmethod
+    def _format(session):
+        ended = session_end_time(session)
+        when = ended.strftime("%Y-%m-%d %H:%M") if ended else (session.get("endedAt") or "")
+        minutes = int(session.get("elapsedSeconds", 0) or 0) // 60
+        dist = int(session.get("distractionAttempts", 0) or 0)
+        headline = f"{when}  •  {minutes} min  •  {dist} distraction{'s' if dist != 1 else ''}"
+        cats = ", ".join(session.get("selectedCategories", []) or []) or "No categories"
+        rules = session.get("sessionRules", {}) or {}
+        detail = (f"{cats}  •  {len(rules.get('allowedApps', []))} allowed, "
+                  f"{len(rules.get('blockedApps', []))} blocked")
+        return headline, detail, session
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        headline, detail, session = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return headline
+        if role == Qt.ToolTipRole:
+            return detail
+        if role == self.SessionRole:
+            return (headline, detail)
+        return None
+
+
+class SessionHistoryDelegate(QStyledItemDelegate):
+    """Paints a history row directly; no per-row widgets or stylesheets."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headline_font = QFont()
+        self._headline_font.setPixelSize(13)
+        self._headline_font.setWeight(QFont.Medium)
+        self._detail_font = QFont()
+        self._detail_font.setPixelSize(12)
+        self._detail_metrics = QFontMetrics(self._detail_font)
+        self._card = QColor("#ffffff")
+        self._card_hover = QColor("#f9fafb")
+        self._border = QPen(QColor("#e5e7eb"))
+        self._headline_color = QColor(theme.COLOR_TEXT_MAIN)
+        self._detail_color = QColor(theme.COLOR_TEXT_SUBTLE)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        texts = index.data(SessionHistoryModel.SessionRole)
+        if not texts:
+            return
+        headline, detail = texts
+        painter.save()
+        painter.setRenderHint(painter.Antialiasing)
+        card = option.rect.adjusted(2, 4, -2, -4)
+        painter.setPen(self._border)
+        painter.setBrush(self._card_hover if option.state & QStyle.State_MouseOver else self._card)
+        painter.drawRoundedRect(card, 10, 10)
+
+        text_rect = card.adjusted(14, 8, -14, -8)
+        half = text_rect.height() // 2
+        painter.setFont(self._headline_font)
+        painter.setPen(self._headline_color)
+        painter.drawText(QRect(text_rect.left(), text_rect.top(), text_rect.width(), half),
+                         Qt.AlignLeft | Qt.AlignVCenter, headline)
+        painter.setFont(self._detail_font)
+        painter.setPen(self._detail_color)
+        elided = self._detail_metrics.elidedText(detail, Qt.ElideRight, text_rect.width())
+        painter.drawText(QRect(text_rect.left(), text_rect.top() + half, text_rect.width(), half),
+                         Qt.AlignLeft | Qt.AlignVCenter, elided)
+        painter.restore()
+
+
+class HistoryScreen(QWidget):
+    def __init__(self, parent=None, state=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.state = state or {}
+        self.model = SessionHistoryModel(self.state, self)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("Session History")
+        theme.styled(title, role="title")
+        self.count_label = QLabel()
+        theme.styled(self.count_label, role="subtitle")
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(SessionHistoryDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setMouseTracking(True)
+        self.list_view.setSelectionMode(QListView.NoSelection)
+        self.list_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.list_view.setObjectName("historyList")
+
+        button_layout = QHBoxLayout()
+        back_btn = QPushButton("Back")
+        theme.styled(back_btn, variant="primary")
+        back_btn.clicked.connect(self._go_back)
+        button_layout.addStretch()
+        button_layout.addWidget(back_btn)
+
+        layout.addWidget(title)
+        layout.addWidget(self.count_label)
+        layout.addWidget(self.list_view, 1)
+        layout.addLayout(button_layout)
+
+    def showEvent(self, event):
+        self.model.refresh()
+        total = self.model.total()
+        self.count_label.setText(f"{total} session{'s' if total != 1 else ''}")
+        super().showEvent(event)
+
+    def _go_back(self):
+        dashboard = getattr(self.parent, "dashboard_screen", None)
+        if dashboard is not None and dashboard.session_active:
+            self.parent.show_dashboard()
+        elif hasattr(self.parent, "show_intent_screen"):
+            self.parent.show_intent_screen()
@@ -46,16 +46,12 @@ class IntentScreen(QWidget):
         layout.setSpacing(24)
 
         title = QLabel("What are you working on today")
-        title.setStyleSheet(
-            f"font-size: 22px; font-weight: 600; color: {theme.COLOR_TEXT_MAIN};"
-        )
+        theme.styled(title, role="title")
         subtitle = QLabel(
             "Your choice decides which apps stay allowed and which apps get blocked"
         )
         subtitle.setWordWrap(True)
-        subtitle.setStyleSheet(
-            "color: #64748b; font-size: 13px;"
-        )
+        theme.styled(subtitle, role="subtitle")
 
         grid_container = QWidget()
         grid_layout = QVBoxLayout(grid_container)
@@ -86,14 +82,7 @@ class IntentScreen(QWidget):
             btn.setChecked(name in self.selected)
             btn.setFixedHeight(72)
             btn.setToolTip(tooltips.get(name, ""))
-            btn.setStyleSheet(
-                (
-                    "QPushButton {background:#f5f5f5;border:1px solid #d4d4d4;"
-                    f"border-radius:12px;font-size:15px;font-weight:500;color:{theme.COLOR_TEXT_MAIN};"
-                    "}"
-                    f"QPushButton:checked {{background:#f5f5f5;color:#6E260E;border:2px solid #6E260E;}}"
-                )
-            )
+            theme.styled(btn, variant="category")
 
             btn.clicked.connect(lambda _=False, n=name: self._toggle_category(n))
             self.buttons[name] = btn
@@ -106,11 +95,7 @@ class IntentScreen(QWidget):
 
         self.continue_btn = QPushButton("Continue")
         self.continue_btn.setFixedHeight(44)
-        self.continue_btn.setStyleSheet(
-            f"QPushButton {{background:{theme.COLOR_PRIMARY};color:white;border:none;border-radius:10px;"
-            "font-size:15px;font-weight:500;}"
-            "QPushButton:disabled {background:#FFFFFF;color:white;border:1px solid #D1D5DB;}"
-        )
+        theme.styled(self.continue_btn, variant="primary", size="large")
 
         self.continue_btn.clicked.connect(self._on_continue)
 
@@ -149,6 +134,8 @@ class IntentScreen(QWidget):
         return {
             "allowedApps": sorted(allowed),
             "blockedApps": sorted(blocked),
+            # Daily time budgets (name -> minutes) carry over between sessions
+            "budgets": self.state.get("sessionRules", {}).get("budgets", {}),
         }
 
     def _on_continue(self):
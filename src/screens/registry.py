@@ -0,0 +1,184 @@
+"""
+registry.py
+
+Lazy screen registry and screen cache policy for the main window.
+
+Screen modules are imported when a screen is first built rather than when
+main_window is imported. NEXT_SCREEN records the usual forward path through a
+session so the window can build the next screen while the event loop is idle.
+
+Each screen has a cache policy:
+
+- pinned: stays resident while the window is open (the dashboard); tray
+  mode deletes every screen
+- cached: kept until unused for the idle limit, or evicted least recently
+  used first while resident screens exceed the memory budget
+- transient: dropped as soon as another screen is shown (screens that only
+  read state when built, like the summary)
+
+Evicted screens are rebuilt from state on the next visit.
+"""
+
+import importlib
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+PINNED = "pinned"
+CACHED = "cached"
+TRANSIENT = "transient"
+
+DEFAULT_IDLE_EVICT_SECONDS = 300
+DEFAULT_BUDGET_KB = 16 * 1024
+
+# Per-widget footprint estimate (the stock screens measure 6-50 KB per widget).
+# Used as a lower bound, and instead of RSS growth when that could not be
+# measured cleanly: RSS under-reports once the allocator reuses memory freed
+# by evicted screens.
+WIDGET_KB_ESTIMATE = 32
+
+
+class ScreenSpec(NamedTuple):
+    module: str
+    class_name: str
+    attribute: str            # MainWindow attribute holding the instance
+    takes_state: bool = True
+    policy: str = CACHED
+
+
+SCREENS: Dict[str, ScreenSpec] = {
+    "splash": ScreenSpec("src.screens.splash_screen", "SplashScreen", "splash_screen", False, TRANSIENT),
+    "intent": ScreenSpec("src.screens.intent_screen", "IntentScreen", "intent_screen"),
+    "app_setup": ScreenSpec("src.screens.app_setup_screen", "AppSetupScreen", "app_setup_screen"),
+    "dashboard": ScreenSpec("src.screens.focus_dashboard_screen", "FocusDashboardScreen",
+                            "dashboard_screen", policy=PINNED),
+    "settings": ScreenSpec("src.screens.settings_screen", "SettingsScreen", "settings_screen"),
+    "session_summary": ScreenSpec("src.screens.session_summary_screen", "SessionSummaryScreen",
+                                  "session_summary_screen", policy=TRANSIENT),
+    "history": ScreenSpec("src.screens.history_screen", "HistoryScreen", "history_screen"),
+}
+
+# Most likely next screen after each one: splash -> intent -> app setup -> dashboard.
+NEXT_SCREEN: Dict[str, str] = {
+    "splash": "intent",
+    "intent": "app_setup",
+    "app_setup": "dashboard",
+}
+
+
+def screen_class(name: str):
+    spec = SCREENS[name]
+    return getattr(importlib.import_module(spec.module), spec.class_name)
+
+
+def build_screen(name: str, window, state):
+    """Import the screen's module if needed and construct it."""
+    cls = screen_class(name)
+    return cls(window, state) if SCREENS[name].takes_state else cls(window)
+
+
+def process_rss_kb() -> Optional[int]:
+    """Resident set size of this process in KB, or None without psutil."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss // 1024
+
+
+def trim_process_memory() -> bool:
+    """Hand freed heap pages back to the OS after screens were deleted.
+
+    glibc: malloc_trim(0). Windows: EmptyWorkingSet, which pages the process
+    out until it touches the memory again (the hidden window will not).
+    Returns False where neither exists.
+    """
+    import ctypes
+    import sys
+    try:
+        if sys.platform.startswith("win"):
+            kernel32 = ctypes.WinDLL("kernel32")
+            kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+            kernel32.K32EmptyWorkingSet.argtypes = [ctypes.c_void_p]
+            return bool(kernel32.K32EmptyWorkingSet(kernel32.GetCurrentProcess()))
+        # The process's own symbols include libc's
+        ctypes.CDLL(None).malloc_trim(0)
+        return True
+    except (OSError, AttributeError):
+        # musl / macOS libc have no malloc_trim
+        return False
+
+
+class ScreenEntry:
+    __slots__ = ("name", "built_at", "last_used", "widgets", "rss_kb")
+
+    def __init__(self, name: str, widgets: int, rss_kb: Optional[int], now: float):
+        self.name = name
+        self.built_at = now
+        self.last_used = now
+        self.widgets = widgets
+        self.rss_kb = rss_kb
+
+    @property
+    def footprint_kb(self) -> int:
+        return max(self.rss_kb or 0, self.widgets * WIDGET_KB_ESTIMATE)
+
+
+class ScreenCache:
+    """Bookkeeping for resident screens; the window does the actual deletes."""
+
+    def __init__(self, idle_evict_seconds: float = DEFAULT_IDLE_EVICT_SECONDS,
+                 budget_kb: int = DEFAULT_BUDGET_KB):
+        self.idle_evict_seconds = idle_evict_seconds
+        self.budget_kb = budget_kb
+        self.entries: Dict[str, ScreenEntry] = {}
+        self.evictions = 0
+
+    def built(self, name: str, widgets: int, rss_kb: Optional[int], now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.entries[name] = ScreenEntry(name, widgets, rss_kb, now)
+
+    def touched(self, name: str, now: Optional[float] = None) -> None:
+        entry = self.entries.get(name)
+        if entry is not None:
+            entry.last_used = time.monotonic() if now is None else now
+
+    def evicted(self, name: str) -> None:
+        if self.entries.pop(name, None) is not None:
+            self.evictions += 1
+
+    def resident_kb(self) -> int:
+        return sum(entry.footprint_kb for entry in self.entries.values())
+
+    def victims(self, current: Optional[str], now: Optional[float] = None) -> List[str]:
+        """Screens to evict now: transient and idle ones, then LRU over budget."""
+        now = time.monotonic() if now is None else now
+        victims = []
+        candidates = []
+        for name, entry in self.entries.items():
+            policy = SCREENS[name].policy
+            if name == current or policy == PINNED:
+                continue
+            if policy == TRANSIENT or now - entry.last_used >= self.idle_evict_seconds:
+                victims.append(name)
+            else:
+                candidates.append(entry)
+        total = sum(self.entries[name].footprint_kb for name in self.entries if name not in victims)
+        for entry in sorted(candidates, key=lambda e: e.last_used):
+            if total <= self.budget_kb:
+                break
+            victims.append(entry.name)
+            total -= entry.footprint_kb
+        return victims
+
+    def report(self, now: Optional[float] = None) -> List[Dict]:
+        """Per-screen memory report, largest first."""
+        now = time.monotonic() if now is None else now
+        rows = [{
+            "screen": entry.name,
+            "policy": SCREENS[entry.name].policy,
+            "widgets": entry.widgets,
+            "rssKb": entry.rss_kb,
+            "footprintKb": entry.footprint_kb,
+            "idleSeconds": round(now - entry.last_used, 1),
+        } for entry in self.entries.values()]
+        return sorted(rows, key=lambda row: row["footprintKb"], reverse=True)
@@ -4,6 +4,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 import src.theme as theme
+from src.utils.rollups import FocusRollups
 
 
 class SessionSummaryScreen(QWidget):
@@ -20,13 +21,11 @@ class SessionSummaryScreen(QWidget):
 
         # Header
         title = QLabel("Session Complete")
-        title.setStyleSheet(
-            f"font-size:20px;font-weight:500;color:{theme.COLOR_TEXT_MAIN};letter-spacing:0.5px;"
-        )
+        title.setObjectName("summaryTitle")
         title.setAlignment(Qt.AlignCenter)
         
         subtitle = QLabel("Great job staying focused!")
-        subtitle.setStyleSheet("color:#6b7280;font-size:14px;margin-bottom:8px;")
+        subtitle.setObjectName("summarySubtitle")
         subtitle.setAlignment(Qt.AlignCenter)
         
         layout.addWidget(title)
@@ -39,24 +38,18 @@ class SessionSummaryScreen(QWidget):
             
             # Main stats container
             stats_container = QFrame()
-            stats_container.setStyleSheet(
-                f"background:{theme.COLOR_PRIMARY};border-radius:16px;"
-            )
+            stats_container.setObjectName("statsContainer")
             stats_layout = QVBoxLayout(stats_container)
             stats_layout.setContentsMargins(24, 24, 24, 24)
             stats_layout.setSpacing(16)
             
             # Duration
             duration_label = QLabel("Session Duration")
-            duration_label.setStyleSheet(
-                "color:rgba(255,255,255,0.8);font-size:12px;font-weight:500;letter-spacing:1px;text-transform:uppercase;"
-            )
+            duration_label.setObjectName("statCaption")
             duration_label.setAlignment(Qt.AlignCenter)
             
             duration_value = QLabel(self._format_duration(session.get('elapsedSeconds', 0)))
-            duration_value.setStyleSheet(
-                "color:white;font-size:28px;font-weight:300;font-family: 'SF Mono', 'Monaco', 'Inconsolata', monospace;"
-            )
+            duration_value.setObjectName("statValue")
             duration_value.setAlignment(Qt.AlignCenter)
             
             stats_layout.addWidget(duration_label)
@@ -73,7 +66,7 @@ class SessionSummaryScreen(QWidget):
             distractions_card = self._create_mini_card(
                 "Distractions", 
                 str(dist),
-                "#fef3c7"
+                "amber"
             )
             secondary_layout.addWidget(distractions_card)
             
@@ -82,7 +75,7 @@ class SessionSummaryScreen(QWidget):
             categories_card = self._create_mini_card(
                 "Categories", 
                 str(cats),
-                "#dbeafe"
+                "blue"
             )
             secondary_layout.addWidget(categories_card)
             
@@ -92,7 +85,7 @@ class SessionSummaryScreen(QWidget):
             apps_card = self._create_mini_card(
                 "Apps", 
                 str(apps_count),
-                "#e0e7ff"
+                "indigo"
             )
             secondary_layout.addWidget(apps_card)
             
@@ -100,23 +93,19 @@ class SessionSummaryScreen(QWidget):
             
             # Details section
             details_container = QFrame()
-            details_container.setStyleSheet(
-                "background:#fafafa;border-radius:12px;"
-            )
+            theme.styled(details_container, role="panel")
             details_layout = QVBoxLayout(details_container)
             details_layout.setContentsMargins(20, 20, 20, 20)
             details_layout.setSpacing(12)
             
             details_title = QLabel("Session Details")
-            details_title.setStyleSheet(
-                f"font-size:12px;font-weight:600;color:{theme.COLOR_TEXT_MAIN};text-transform:uppercase;letter-spacing:1px;"
-            )
+            theme.styled(details_title, role="sectionTitle")
             
             # Categories detail
             cats_list = ", ".join(session.get("selectedCategories", []))
             if cats_list:
                 categories_detail = QLabel(f"Categories: {cats_list}")
-                categories_detail.setStyleSheet("color:#6b7280;font-size:13px;")
+                theme.styled(categories_detail, role="body")
                 categories_detail.setWordWrap(True)
                 details_layout.addWidget(categories_detail)
             
@@ -124,12 +113,36 @@ class SessionSummaryScreen(QWidget):
             allowed_count = len(rules.get('allowedApps', []))
             blocked_count = len(rules.get('blockedApps', []))
             apps_detail = QLabel(f"App Rules: {allowed_count} allowed, {blocked_count} blocked")
-            apps_detail.setStyleSheet("color:#6b7280;font-size:13px;")
+            theme.styled(apps_detail, role="body")
             details_layout.addWidget(apps_detail)
             
+            # Precomputed daily/weekly aggregates
+            rollups = FocusRollups.from_state(self.state)
+            today = rollups.day()
+            week = rollups.week()
+            today_detail = QLabel(
+                f"Today: {self._format_duration(today['focusSeconds'])} across "
+                f"{today['sessions']} session{'s' if today['sessions'] != 1 else ''}"
+            )
+            theme.styled(today_detail, role="body")
+            week_detail = QLabel(
+                f"This week: {self._format_duration(week['focusSeconds'])}, "
+                f"{week['distractions']} distractions, "
+                f"{rollups.current_streak()}-day streak"
+            )
+            theme.styled(week_detail, role="body")
+
             details_layout.addWidget(details_title)
             details_layout.addWidget(categories_detail if cats_list else QLabel())
             details_layout.addWidget(apps_detail)
+            details_layout.addWidget(today_detail)
+            details_layout.addWidget(week_detail)
+
+            score_text = self._focus_score_text()
+            if score_text:
+                score_detail = QLabel(score_text)
+                theme.styled(score_detail, role="body")
+                details_layout.addWidget(score_detail)
             
             layout.addWidget(details_container)
 
@@ -140,17 +153,11 @@ class SessionSummaryScreen(QWidget):
         button_layout.setSpacing(12)
         
         new_session_btn = QPushButton("Start New Session")
-        new_session_btn.setStyleSheet(
-            "QPushButton {background:#6E260E;color:white;border:none;border-radius:8px;"
-            "padding:10px 20px;font-size:13px;font-weight:500;}"
-        )
+        theme.styled(new_session_btn, variant="primary")
         new_session_btn.clicked.connect(self._start_new_session)
         
         home_btn = QPushButton("Back to Home")
-        home_btn.setStyleSheet(
-            "QPushButton {background:#000000;color:white;border:none;border-radius:8px;"
-            "padding:10px 20px;font-size:13px;font-weight:500;}"
-        )
+        theme.styled(home_btn, variant="dark")
         home_btn.clicked.connect(self._go_home)
         
         button_layout.addStretch()
@@ -159,12 +166,10 @@ class SessionSummaryScreen(QWidget):
         
         layout.addLayout(button_layout)
 
-    def _create_mini_card(self, title_text, value_text, bg_color):
-        """Create a small stat card with background color."""
+    def _create_mini_card(self, title_text, value_text, tone):
+        """Create a small stat card; tone picks the background (amber, blue, indigo)."""
         card = QFrame()
-        card.setStyleSheet(
-            f"background:{bg_color};border-radius:12px;"
-        )
+        theme.styled(card, role="miniCard", tone=tone)
         
         layout = QVBoxLayout(card)
         layout.setContentsMargins(16, 16, 16, 16)
@@ -172,15 +177,11 @@ class SessionSummaryScreen(QWidget):
         layout.setAlignment(Qt.AlignCenter)
         
         title = QLabel(title_text)
-        title.setStyleSheet(
-            "color:#6b7280;font-size:11px;font-weight:500;text-transform:uppercase;letter-spacing:0.5px;"
-        )
+        theme.styled(title, role="miniCardTitle")
         title.setAlignment(Qt.AlignCenter)
         
         value = QLabel(value_text)
-        value.setStyleSheet(
-            f"font-size:20px;font-weight:600;color:{theme.COLOR_TEXT_MAIN};"
-        )
+        theme.styled(value, role="miniCardValue")
         value.setAlignment(Qt.AlignCenter)
         
         layout.addWidget(title)
@@ -192,17 +193,15 @@ class SessionSummaryScreen(QWidget):
         """Legacy card method - kept for compatibility."""
         card = QFrame()
         card.setFrameStyle(QFrame.StyledPanel)
-        card.setStyleSheet(
-            "background:white;border-radius:12px;border:1px solid #e5e7eb;padding:16px;"
-        )
+        theme.styled(card, role="legacyCard")
         
         layout = QVBoxLayout(card)
         
         title = QLabel(title_text)
-        title.setStyleSheet(f"font-weight:600;color:{theme.COLOR_TEXT_MAIN};font-size:16px;")
+        theme.styled(title, role="cardTitle")
         
         content = QLabel(content_text)
-        content.setStyleSheet("color:#6b7280;font-size:14px;")
+        theme.styled(content, role="body")
         content.setWordWrap(True)
         
         layout.addWidget(title)
@@ -210,6 +209,21 @@ class SessionSummaryScreen(QWidget):
         
         return card
 
+    def _focus_score_text(self):
+        """Focus score trend from the vectorized analytics (needs numpy)."""
+        try:
+            from src.utils.analytics import analytics_for_state
+        except ImportError:
+            return ""
+        trend = analytics_for_state(self.state).focus_score_trend()
+        if trend["slope"] > 0.5:
+            direction = "improving"
+        elif trend["slope"] < -0.5:
+            direction = "declining"
+        else:
+            direction = "steady"
+        return f"Focus score: {trend['latest']:.0f}/100 ({direction})"
+
     def _format_duration(self, seconds):
         hours = seconds // 3600
         minutes = (seconds % 3600) // 60
@@ -4,6 +4,8 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 import src.theme as theme
+from src.utils.rollups import FocusRollups
+from src.utils.store import bump_history_version
 
 
 class SettingsScreen(QWidget):
@@ -20,9 +22,7 @@ class SettingsScreen(QWidget):
         layout.setSpacing(16)
 
         title = QLabel("Settings")
-        title.setStyleSheet(
-            f"font-size: 22px; font-weight: 600; color: {theme.COLOR_TEXT_MAIN};"
-        )
+        theme.styled(title, role="title")
 
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -63,12 +63,14 @@ class SettingsScreen(QWidget):
         # Session history
         history_group = QGroupBox("Data Management")
         history_layout = QVBoxLayout(history_group)
+
+        view_history_btn = QPushButton("View session history")
+        theme.styled(view_history_btn, variant="primary", size="medium")
+        view_history_btn.clicked.connect(self._view_history)
+        history_layout.addWidget(view_history_btn)
         
         clear_btn = QPushButton("Clear all session history")
-        clear_btn.setStyleSheet(
-            "QPushButton {background:#000000;color:white;border:none;border-radius:8px;"
-            "font-size:14px;font-weight:500;padding:10px 16px;}"
-        )
+        theme.styled(clear_btn, variant="dark", size="medium")
         clear_btn.clicked.connect(self._clear_history)
         history_layout.addWidget(clear_btn)
 
@@ -77,11 +79,11 @@ class SettingsScreen(QWidget):
         web_layout = QVBoxLayout(web_group)
         
         allowed_label = QLabel("Allowed domains for this session")
-        allowed_label.setStyleSheet("color:#6b7280;font-size:12px;")
+        theme.styled(allowed_label, role="caption")
         web_layout.addWidget(allowed_label)
         
         blocked_label = QLabel("Blocked domains for this session")
-        blocked_label.setStyleSheet("color:#6b7280;font-size:12px;")
+        theme.styled(blocked_label, role="caption")
         web_layout.addWidget(blocked_label)
 
         v_layout.addWidget(session_group)
@@ -95,10 +97,7 @@ class SettingsScreen(QWidget):
         # Back button
         back_btn = QPushButton("Back to Dashboard")
         back_btn.setFixedSize(180, 44)
-        back_btn.setStyleSheet(
-            "QPushButton {background:#6E260E;color:white;border:none;border-radius:8px;"
-            "font-size:14px;font-weight:500;padding:8px 16px;}"
-        )
+        theme.styled(back_btn, variant="primary", size="medium")
         back_btn.clicked.connect(self._go_back)
 
         layout.addWidget(title)
@@ -132,9 +131,15 @@ class SettingsScreen(QWidget):
         )
         if reply == QMessageBox.Yes:
             self.state["sessionHistory"] = []
+            FocusRollups.from_state(self.state).clear()
+            bump_history_version(self.state)
             if hasattr(self.parent, "save_state"):
                 self.parent.save_state(self.state)
 
+    def _view_history(self):
+        if hasattr(self.parent, "show_history_screen"):
+            self.parent.show_history_screen()
+
     def _go_back(self):
         if hasattr(self.parent, "show_dashboard"):
             self.parent.show_dashboard()
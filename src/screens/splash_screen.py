@@ -1,14 +1,35 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
-from PyQt5.QtCore import Qt, QTimer
-import src.theme as theme
+from PyQt5.QtCore import Qt
+import src.icons as icons
+
+SPLASH_LOGO_SIZE = 96
 
 
 class SplashScreen(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        self._scheduled = False
         self._setup_ui()
-        QTimer.singleShot(1500, self._go_next)
+
+    def showEvent(self, event):
+        # Count the minimum display time from when the splash is actually
+        # visible; with a minimum of 0 it moves on at the next idle moment.
+        super().showEvent(event)
+        if not self._scheduled:
+            self._scheduled = True
+            delay = getattr(self.parent, "splash_min_display_ms", 0)
+            scheduler = getattr(self.parent, "scheduler", None)
+            if scheduler is not None:
+                scheduler.add("splash.next", self._go_next, delay_ms=delay)
+
+    def hideEvent(self, event):
+        # Left early (e.g. navigated away): don't jump to the next screen later.
+        super().hideEvent(event)
+        scheduler = getattr(self.parent, "scheduler", None)
+        if scheduler is not None:
+            scheduler.cancel("splash.next")
+        self._scheduled = False
 
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -17,26 +38,31 @@ class SplashScreen(QWidget):
 
         logo = QLabel("ZenFlow")
         logo.setAlignment(Qt.AlignCenter)
-        logo.setStyleSheet(
-            f"font-size: 48px; font-weight: 700; color: {theme.COLOR_PRIMARY};"
-        )
+        logo.setObjectName("splashLogo")
 
         glow = QWidget()
         glow.setFixedSize(260, 260)
-        glow.setStyleSheet(
-            "background-color: rgba(79,70,229,0.08);"
-            "border-radius: 130px;"
-        )
+        glow.setObjectName("splashGlow")
 
         inner = QVBoxLayout(glow)
+        inner.addStretch()
+        logo_pixmap = icons.logo_pixmap(SPLASH_LOGO_SIZE)
+        if logo_pixmap is not None:
+            mark = QLabel()
+            mark.setPixmap(logo_pixmap)
+            mark.setAlignment(Qt.AlignCenter)
+            inner.addWidget(mark, 0, Qt.AlignCenter)
         inner.addWidget(logo, 0, Qt.AlignCenter)
+        inner.addStretch()
 
         layout.addWidget(glow)
 
-        self.setStyleSheet(
-            "background-color: #020617;"
-        )
+        self.setObjectName("splashScreen")
+        self.setAttribute(Qt.WA_StyledBackground, True)
 
     def _go_next(self):
-        if hasattr(self.parent, "show_intent_screen"):
+        # Reopened while a session runs on in the core daemon: back to it
+        if getattr(self.parent, "state", {}).get("activeSessionData") and hasattr(self.parent, "show_dashboard"):
+            self.parent.show_dashboard()
+        elif hasattr(self.parent, "show_intent_screen"):
             self.parent.show_intent_screen()
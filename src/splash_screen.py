@@ -4,6 +4,9 @@ from PyQt5.QtGui import QPixmap, QPainter, QColor, QFont, QFontMetrics, QLinearG
 import sys
 import os
 import logging
+import src.icons as icons
+
+SPLASH_LOGO_SIZE = 40
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -16,6 +19,8 @@ class ZenFlowSplashScreen(QSplashScreen):
         pixmap.fill(Qt.white)
         
         super().__init__(pixmap)
+        # Rendered once (or read from the icon cache), then only blitted
+        self.logo = icons.logo_pixmap(SPLASH_LOGO_SIZE)
         
         # Set window flags for frameless and always on top
         self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint | Qt.SplashScreen)
@@ -25,10 +30,7 @@ class ZenFlowSplashScreen(QSplashScreen):
         screen = QApplication.primaryScreen().geometry()
         self.move(screen.center() - self.rect().center())
         
-        # Set up the timer
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.close)
-        self.timer.start(2000)  # Close after 2 seconds
+        # No close timer: main() calls finish() as soon as the main window is ready
         
         # Show the splash screen
         self.show()
@@ -55,12 +57,13 @@ class ZenFlowSplashScreen(QSplashScreen):
         app_name = "ZenFlow"
         fm = QFontMetrics(font)
         text_width = fm.width(app_name)
+        logo_width = SPLASH_LOGO_SIZE + 12 if self.logo is not None else 0
+        left = (self.width() - text_width - logo_width) // 2
+        baseline = self.height() // 2 - 20
         
-        painter.drawText(
-            (self.width() - text_width) // 2, 
-            self.height() // 2 - 20, 
-            app_name
-        )
+        if self.logo is not None:
+            painter.drawPixmap(left, baseline - (fm.ascent() + SPLASH_LOGO_SIZE) // 2, self.logo)
+        painter.drawText(left + logo_width, baseline, app_name)
         
         # Draw tagline
         tagline_font = QFont("Arial", 10)
@@ -106,4 +109,5 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     splash = ZenFlowSplashScreen()
     splash.show()
+    QTimer.singleShot(2000, splash.close)
     sys.exit(app.exec_())
\ No newline at end of file
@@ -3,11 +3,14 @@ theme.py
 
 Global ZenFlow theme (font, colors, and common styles).
 
-Call theme.apply_global_theme(app) once after creating QApplication.
-Then use the exported styles on windows, buttons, checkboxes, inputs, and overlays.
+Call theme.apply_global_theme(app) once after creating QApplication. It
+installs a single application stylesheet (built once and cached); screens
+only set object names or the "role"/"variant"/"tone" dynamic properties that
+the stylesheet selects on, instead of calling setStyleSheet per widget.
 """
 
 from __future__ import annotations
+from functools import lru_cache
 from PyQt5.QtGui import QFontDatabase
 from PyQt5.QtWidgets import QApplication
 
@@ -34,15 +37,199 @@ def load_inter_font() -> None:
 
 
 def apply_global_theme(app: QApplication) -> None:
-    """Apply global Inter font to the whole application."""
+    """Apply the Inter font and the ZenFlow stylesheet to the whole application."""
     load_inter_font()
-    app.setStyleSheet(
-        """
-        * {
-            font-family: Inter, "Segoe UI", sans-serif;
-        }
-        """
-    )
+    app.setStyleSheet(application_stylesheet())
+
+
+def set_style_property(widget, name: str, value) -> None:
+    """Change a styling property after the widget is shown and re-polish only that widget."""
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
+
+def styled(widget, role: str = None, variant: str = None, tone: str = None, size: str = None):
+    """Tag a widget with the properties the application stylesheet selects on."""
+    if role is not None:
+        widget.setProperty("role", role)
+    if variant is not None:
+        widget.setProperty("variant", variant)
+    if tone is not None:
+        widget.setProperty("tone", tone)
+    if size is not None:
+        widget.setProperty("size", size)
+    return widget
+
+
+MONO_FONT = "'SF Mono', 'Monaco', 'Inconsolata', monospace"
+
+
+@lru_cache(maxsize=None)
+def application_stylesheet() -> str:
+    """Stylesheet for every ZenFlow widget, generated once per process."""
+    return f"""
+* {{
+    font-family: Inter, "Segoe UI", sans-serif;
+}}
+
+/* Text roles */
+QLabel[role="title"] {{
+    font-size: 22px; font-weight: 600; color: {COLOR_TEXT_MAIN};
+}}
+QLabel[role="screenTitle"] {{
+    font-size: 18px; font-weight: 500; color: {COLOR_TEXT_MAIN}; letter-spacing: 0.5px;
+}}
+QLabel[role="subtitle"] {{
+    color: #64748b; font-size: 13px;
+}}
+QLabel[role="sectionTitle"] {{
+    font-size: 12px; font-weight: 600; color: {COLOR_TEXT_MAIN};
+    text-transform: uppercase; letter-spacing: 1px;
+}}
+QLabel[role="body"] {{
+    color: #6b7280; font-size: 13px;
+}}
+QLabel[role="caption"] {{
+    color: #6b7280; font-size: 12px;
+}}
+QLabel[role="heading"][tone="allowed"] {{
+    font-weight: 600; color: {COLOR_ALLOWED};
+}}
+QLabel[role="heading"][tone="blocked"] {{
+    font-weight: 600; color: {COLOR_BLOCKED}; margin-top: 12px;
+}}
+
+/* Buttons */
+QPushButton[variant="primary"], QPushButton[variant="dark"] {{
+    color: white; border: none; border-radius: 8px;
+    padding: 10px 20px; font-size: 13px; font-weight: 500;
+}}
+QPushButton[variant="primary"] {{ background: {COLOR_PRIMARY}; }}
+QPushButton[variant="dark"] {{ background: #000000; }}
+QPushButton[variant="primary"]:disabled {{
+    background: #FFFFFF; color: white; border: 1px solid #D1D5DB;
+}}
+QPushButton[size="large"] {{ border-radius: 10px; font-size: 15px; }}
+QPushButton[size="medium"] {{ font-size: 14px; padding: 10px 16px; }}
+QPushButton[size="small"] {{ font-size: 12px; padding: 10px 16px; }}
+QPushButton[variant="category"] {{
+    background: #f5f5f5; border: 1px solid #d4d4d4; border-radius: 12px;
+    font-size: 15px; font-weight: 500; color: {COLOR_TEXT_MAIN};
+}}
+QPushButton[variant="category"]:checked {{
+    background: #f5f5f5; color: {COLOR_PRIMARY}; border: 2px solid {COLOR_PRIMARY};
+}}
+
+/* Panels and cards */
+QFrame[role="panel"] {{
+    background: #fafafa; border-radius: 12px;
+}}
+QFrame[role="miniCard"] {{ border-radius: 12px; }}
+QFrame[role="miniCard"][tone="amber"] {{ background: #fef3c7; }}
+QFrame[role="miniCard"][tone="blue"] {{ background: #dbeafe; }}
+QFrame[role="miniCard"][tone="indigo"] {{ background: #e0e7ff; }}
+QLabel[role="miniCardTitle"] {{
+    color: #6b7280; font-size: 11px; font-weight: 500;
+    text-transform: uppercase; letter-spacing: 0.5px;
+}}
+QLabel[role="miniCardValue"] {{
+    font-size: 20px; font-weight: 600; color: {COLOR_TEXT_MAIN};
+}}
+
+/* Home */
+QLabel#homeTitle {{ font-size: 32px; font-weight: 700; color: {COLOR_PRIMARY}; }}
+QLabel#homeSubtitle {{ color: #64748b; font-size: 16px; }}
+
+/* In-window splash */
+QWidget#splashScreen {{ background-color: #020617; }}
+QWidget#splashGlow {{ background-color: rgba(79,70,229,0.08); border-radius: 130px; }}
+QLabel#splashLogo {{ font-size: 48px; font-weight: 700; color: {COLOR_PRIMARY}; }}
+
+/* Focus dashboard */
+QLabel#sessionTimer {{
+    font-size: 32px; font-weight: 300; color: {COLOR_TEXT_MAIN}; margin: 4px 0 16px 0;
+    font-family: {MONO_FONT};
+}}
+QFrame#statusFrame {{ background: {COLOR_PRIMARY}; border-radius: 12px; }}
+QLabel#statusText {{ color: white; font-size: 14px; font-weight: 500; letter-spacing: 1px; }}
+QLabel#distractionLabel {{ color: rgba(255,255,255,0.8); font-size: 11px; font-weight: 400; }}
+QLabel#tipLabel {{ color: #6b7280; font-size: 13px; }}
+
+/* Session summary */
+QLabel#summaryTitle {{
+    font-size: 20px; font-weight: 500; color: {COLOR_TEXT_MAIN}; letter-spacing: 0.5px;
+}}
+QLabel#summarySubtitle {{ color: #6b7280; font-size: 14px; margin-bottom: 8px; }}
+QFrame#statsContainer {{ background: {COLOR_PRIMARY}; border-radius: 16px; }}
+QLabel#statCaption {{
+    color: rgba(255,255,255,0.8); font-size: 12px; font-weight: 500;
+    letter-spacing: 1px; text-transform: uppercase;
+}}
+QLabel#statValue {{
+    color: white; font-size: 28px; font-weight: 300; font-family: {MONO_FONT};
+}}
+QLabel[role="cardTitle"] {{ font-weight: 600; color: {COLOR_TEXT_MAIN}; font-size: 16px; }}
+QFrame[role="legacyCard"] {{
+    background: white; border-radius: 12px; border: 1px solid #e5e7eb; padding: 16px;
+}}
+
+/* App setup */
+QScrollArea[role="appScroll"] {{ border: none; background-color: transparent; }}
+QScrollArea[role="appScroll"] > QWidget > QWidget {{ background-color: transparent; }}
+QScrollArea[role="appScroll"] QScrollBar:vertical {{
+    border: none; background: #f3f4f6; width: 8px; border-radius: 4px;
+}}
+QScrollArea[role="appScroll"] QScrollBar::handle:vertical {{
+    background: #9ca3af; min-height: 20px; border-radius: 4px;
+}}
+QScrollArea[role="appScroll"] QScrollBar::handle:vertical:hover {{ background: #6b7280; }}
+QScrollArea[role="appScroll"] QScrollBar::handle:vertical:pressed {{ background: #4b5563; }}
+QScrollArea[role="appScroll"] QScrollBar::add-line:vertical,
+QScrollArea[role="appScroll"] QScrollBar::sub-line:vertical {{ height: 0px; }}
+QListView[role="appList"] {{
+    border: 1px solid #e2e8f0; border-radius: 8px; background-color: #f8fafc; padding: 8px;
+    font-size: 13px; color: #374151;
+}}
+QListView[role="appList"]::item {{ padding: 8px; border-radius: 6px; margin: 2px 0; }}
+QListView[role="appList"]::item:hover {{ background-color: #f1f5f9; }}
+QListView[role="appList"]::item:selected {{ background-color: transparent; }}
+QListView[role="appList"]::indicator {{ width: 16px; height: 16px; margin-right: 8px; }}
+QListView[role="appList"]::indicator:unchecked {{
+    border: 1px solid #9CA3AF; border-radius: 4px; background: #FFFFFF;
+}}
+QListView[role="appList"]::indicator:checked {{
+    border: 1px solid #4B5563; border-radius: 4px; background: #4B5563;
+}}
+QLineEdit[role="appInput"] {{
+    border: 1px solid #e5e7eb; border-radius: 8px; padding: 10px 12px;
+    font-size: 13px; background-color: #ffffff; color: #374151;
+}}
+QLineEdit[role="appInput"]:focus {{ border: 2px solid {COLOR_PRIMARY}; }}
+
+/* History */
+QListView#historyList {{ border: none; background: transparent; }}
+
+/* Blocked overlay */
+QWidget#overlayBackdrop {{ background: rgba(0, 0, 0, 0.88); }}
+QWidget#overlayCard {{ background-color: #ffffff; border-radius: 16px; }}
+QWidget#overlayCard QLabel {{ background: transparent; }}
+QLabel#overlayTitle {{ font-size: 24px; font-weight: 600; color: #111827; }}
+QLabel#overlayAppName {{ font-size: 15px; font-weight: 500; color: #6b7280; }}
+QLabel#overlayHint {{ font-size: 13px; color: #9ca3af; }}
+QPushButton#overlayReturnButton {{
+    background: {COLOR_PRIMARY}; color: white; border: none; border-radius: 8px;
+    padding: 12px 24px; font-size: 13px; font-weight: 500;
+}}
+QPushButton#overlayReturnButton:hover {{ background: #8B3214; }}
+QPushButton#overlayAllowButton {{
+    background: #f9fafb; color: #374151; border: 1px solid #e5e7eb;
+    border-radius: 8px; padding: 12px 24px; font-size: 13px; font-weight: 500;
+}}
+QPushButton#overlayAllowButton:hover {{ background: #f3f4f6; }}
+"""
 
 
 # Base window stylesheet for all normal screens
@@ -0,0 +1,74 @@
+"""
+tray.py
+
+System tray icon for the main window's tray mode.
+
+Whether closing or minimizing the window sends it to the tray comes from the
+"appearance" section of config/settings.json (minimize_to_tray,
+close_to_tray). In tray mode the window deletes all of its screens; only the
+tray icon, the block overlay and the connection to the core daemon stay (see
+MainWindow.enter_tray_mode).
+"""
+
+import json
+import logging
+import os
+
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import QAction, QMenu, QSystemTrayIcon
+
+import src.icons as icons
+
+logger = logging.getLogger(__name__)
+
+TRAY_SETTINGS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "config", "settings.json",
+)
+
+DEFAULT_TRAY_SETTINGS = {
+    "minimize_to_tray": True,
+    "close_to_tray": True,
+}
+
+
+def load_tray_settings(path=TRAY_SETTINGS_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return tray_settings(json.load(f))
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Using default tray settings: {e}")
+    return dict(DEFAULT_TRAY_SETTINGS)
+
+
+def tray_settings(data):
+    """Tray settings from an already parsed settings.json."""
+    settings = dict(DEFAULT_TRAY_SETTINGS)
+    appearance = data.get("appearance", {})
+    settings.update({key: bool(appearance[key]) for key in DEFAULT_TRAY_SETTINGS if key in appearance})
+    return settings
+
+
+class TrayIcon(QSystemTrayIcon):
+    """Tray icon with Open / Quit; a click on the icon also opens the window."""
+
+    open_requested = pyqtSignal()
+    quit_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(icons.logo_icon(), parent)
+        self.setToolTip("ZenFlow")
+        self.menu = QMenu()
+        open_action = QAction("Open ZenFlow", self.menu)
+        open_action.triggered.connect(self.open_requested)
+        quit_action = QAction("Quit ZenFlow", self.menu)
+        quit_action.triggered.connect(self.quit_requested)
+        self.menu.addAction(open_action)
+        self.menu.addSeparator()
+        self.menu.addAction(quit_action)
+        self.setContextMenu(self.menu)
+        self.activated.connect(self._on_activated)
+
+    def _on_activated(self, reason):
+        if reason in (QSystemTrayIcon.Trigger, QSystemTrayIcon.DoubleClick):
+            self.open_requested.emit()
@@ -0,0 +1,206 @@
+"""
+analytics.py
+
+Vectorized analytics over sessionHistory using NumPy.
+
+History is loaded once per history version into columnar arrays (durations,
+distraction counts, epoch starts and category bitmasks); every statistic is
+then computed with array operations instead of Python loops over dicts.
+Bitmasks are a uint64 column up to 64 categories and Python ints beyond,
+unpacked into the same boolean matrix either way. Statistics that depend on
+today (streaks) are cached per local day.
+
+    stats = analytics_for_state(state)
+    stats.focus_score_trend(), stats.category_share(), stats.streaks()
+"""
+
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.utils.rollups import parse_session_time
+from src.utils.store import history_version
+
+# Bit positions for the intent categories; unknown categories get the next
+# free bit the first time they are seen.
+CATEGORIES = ("Coding", "Designing", "Studying", "Writing", "Editing", "Other")
+
+# Categories a uint64 bitmask column can hold.
+_MASK_BITS = 64
+
+# Every distraction is charged this many seconds when scoring a session.
+DISTRACTION_PENALTY_SECONDS = 300
+
+
+def _session_start(session: Dict[str, Any]) -> float:
+    """Epoch seconds at which the session started, or NaN if unknown."""
+    ended = session.get("endedAtEpoch")
+    if isinstance(ended, (int, float)):
+        return float(ended) - float(session.get("elapsedSeconds", 0) or 0)
+    parsed = parse_session_time(session.get("startTime"))
+    return parsed.timestamp() if parsed is not None else np.nan
+
+
+class SessionAnalytics:
+    """Columnar view of sessionHistory with vectorized statistics."""
+
+    def __init__(self, history: Iterable[Dict[str, Any]], version: int = 0):
+        history = list(history)
+        self.version = version
+        self.categories: List[str] = list(CATEGORIES)
+        bits = {name: i for i, name in enumerate(self.categories)}
+
+        def mask(session):
+            value = 0
+            for name in session.get("selectedCategories", []) or []:
+                if name not in bits:
+                    bits[name] = len(self.categories)
+                    self.categories.append(name)
+                value |= 1 << bits[name]
+            return value
+
+        n = len(history)
+        self.durations = np.fromiter(
+            (int(s.get("elapsedSeconds", 0) or 0) for s in history), dtype=np.int64, count=n)
+        self.distractions = np.fromiter(
+            (int(s.get("distractionAttempts", 0) or 0) for s in history), dtype=np.int64, count=n)
+        self.starts = np.fromiter((_session_start(s) for s in history), dtype=np.float64, count=n)
+        masks = [mask(s) for s in history]
+        dtype = np.uint64 if len(self.categories) <= _MASK_BITS else object
+        self.category_masks = np.array(masks, dtype=dtype).reshape(n)
+
+        # History is stored newest-first; keep columns in chronological order
+        # (undated legacy entries sort first).
+        order = np.arange(n)[::-1]
+        order = order[np.argsort(np.nan_to_num(self.starts[order], nan=-np.inf), kind="stable")]
+        self.durations = self.durations[order]
+        self.distractions = self.distractions[order]
+        self.starts = self.starts[order]
+        self.category_masks = self.category_masks[order]
+
+        offset = datetime.now().astimezone().utcoffset()
+        self._utc_offset = offset.total_seconds() if offset else 0.0
+        self._memo: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return int(self.durations.size)
+
+    def _cached(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def _local(self, seconds):
+        return seconds + self._utc_offset
+
+    # Scores and trends
+
+    def focus_scores(self) -> np.ndarray:
+        """Per-session score in [0, 100]: focused time vs. time lost to distractions."""
+        def compute():
+            d = self.durations.astype(np.float64)
+            lost = self.distractions * float(DISTRACTION_PENALTY_SECONDS)
+            denom = d + lost
+            return np.divide(100.0 * d, denom, out=np.zeros_like(d), where=denom > 0)
+        return self._cached("scores", compute)
+
+    def focus_score_trend(self, window: int = 7) -> Dict[str, Any]:
+        """Rolling mean of the focus score and its slope per session."""
+        def compute():
+            scores = self.focus_scores()
+            if scores.size == 0:
+                return {"rolling": np.zeros(0), "slope": 0.0, "latest": 0.0}
+            w = max(1, min(window, scores.size))
+            csum = np.cumsum(np.insert(scores, 0, 0.0))
+            rolling = (csum[w:] - csum[:-w]) / w
+            slope = 0.0
+            if scores.size > 1:
+                x = np.arange(scores.size, dtype=np.float64)
+                slope = float(np.polyfit(x, scores, 1)[0])
+            return {"rolling": rolling, "slope": slope, "latest": float(rolling[-1])}
+        return self._cached(("trend", window), compute)
+
+    # Breakdowns
+
+    def category_matrix(self) -> np.ndarray:
+        """Sessions x categories, True where the session had that category."""
+        def compute():
+            k = len(self.categories)
+            if self.category_masks.dtype == object:
+                # Past 64 categories the masks are Python ints
+                return np.array([[(mask >> i) & 1 for i in range(k)] for mask in self.category_masks],
+                                dtype=bool).reshape(len(self), k)
+            shifts = np.arange(k, dtype=np.uint64)
+            return ((self.category_masks[:, None] >> shifts) & np.uint64(1)).astype(bool)
+        return self._cached("category_matrix", compute)
+
+    def category_share(self) -> Dict[str, float]:
+        """Fraction of focus time per category; multi-category sessions are split evenly."""
+        def compute():
+            if self.durations.size == 0:
+                return {}
+            bits = self.category_matrix().astype(np.float64)
+            counts = bits.sum(axis=1)
+            weights = np.divide(self.durations, counts, out=np.zeros(counts.shape), where=counts > 0)
+            per_category = weights @ bits
+            total = per_category.sum()
+            if total <= 0:
+                return {name: 0.0 for name in self.categories}
+            return {name: float(v / total) for name, v in zip(self.categories, per_category)}
+        return self._cached("category_share", compute)
+
+    def distraction_rate_by_hour(self) -> np.ndarray:
+        """Distractions per focused hour, indexed by local hour of day (0-23)."""
+        def compute():
+            known = ~np.isnan(self.starts)
+            hours = (self._local(self.starts[known]) // 3600 % 24).astype(np.int64)
+            distractions = np.bincount(hours, weights=self.distractions[known], minlength=24)
+            focused_hours = np.bincount(hours, weights=self.durations[known], minlength=24) / 3600.0
+            return np.divide(distractions, focused_hours,
+                             out=np.zeros(24), where=focused_hours > 0)
+        return self._cached("rate_by_hour", compute)
+
+    def streaks(self, today: Optional[float] = None) -> Dict[str, int]:
+        """Longest and current run of consecutive local days with a session.
+
+        Cached per local day of today (default: now), so a long-running
+        process sees the current streak lapse at midnight.
+        """
+        now_day = int(self._local(today if today is not None else datetime.now().timestamp()) // 86400)
+
+        def compute():
+            known = self.starts[~np.isnan(self.starts)]
+            if known.size == 0:
+                return {"current": 0, "best": 0}
+            days = np.unique((self._local(known) // 86400).astype(np.int64))
+            breaks = np.flatnonzero(np.diff(days) != 1)
+            run_starts = np.concatenate(([0], breaks + 1))
+            run_ends = np.concatenate((breaks, [days.size - 1]))
+            lengths = run_ends - run_starts + 1
+            current = int(lengths[-1]) if now_day - days[-1] <= 1 else 0
+            return {"current": current, "best": int(lengths.max())}
+        cached = self._memo.get("streaks")
+        if cached is None or cached[0] != now_day:
+            cached = self._memo["streaks"] = (now_day, compute())
+        return cached[1]
+
+    def duration_percentiles(self, q=(50, 90, 99)) -> Dict[int, float]:
+        if self.durations.size == 0:
+            return {p: 0.0 for p in q}
+        values = np.percentile(self.durations, q)
+        return {p: float(v) for p, v in zip(q, values)}
+
+
+_cache: Dict[str, Any] = {"key": None, "analytics": None}
+
+
+def analytics_for_state(state: Dict[str, Any]) -> SessionAnalytics:
+    """Return analytics for state["sessionHistory"], rebuilt only when its version changes."""
+    history = state.get("sessionHistory", [])
+    key = (history_version(state), len(history))
+    if _cache["key"] != key:
+        _cache["analytics"] = SessionAnalytics(history, key[0])
+        _cache["key"] = key
+    return _cache["analytics"]
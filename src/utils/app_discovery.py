@@ -0,0 +1,340 @@
+"""
+app_discovery.py
+
+Discovery of installed applications for the app setup screen.
+
+Sources:
+- Linux: XDG .desktop files in $XDG_DATA_HOME/applications and each
+  $XDG_DATA_DIRS/applications (user entries override system ones).
+- Windows: Start menu shortcuts (.lnk) for the user and all users, and the
+  Uninstall registry keys (HKCU, HKLM and the 32-bit view).
+
+Every directory (and registry key) is cached in APPS_CACHE_FILE under its
+modification time, so a rescan re-reads only directories whose mtime changed
+since the last scan. A directory's mtime changes when entries are added to or
+removed from it, which is what installing or removing an app does; editing a
+.desktop file or shortcut in place does not, so a directory's time is the
+newest of its own mtime and its entries'.
+
+AppDiscovery runs the scan on a worker thread and pushes one event into a
+Queue for the main thread to handle:
+    {"type": "apps_discovered", "apps": [InstalledApp, ...]}
+"""
+
+from __future__ import annotations
+import json
+import logging
+import os
+import shlex
+import sys
+import threading
+from queue import Queue
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.utils.store import APPS_CACHE_FILE
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+
+# Launchers whose own name says nothing about the app they start.
+_WRAPPERS = {"flatpak", "snap", "sh", "bash", "gtk-launch", "pkexec"}
+
+
+class InstalledApp(NamedTuple):
+    name: str       # display name
+    exe: str        # executable file name, "" if unknown
+    source: str     # "desktop", "startmenu" or "registry"
+    icon: str = ""  # icon theme name or file to take the icon from (see src/icons.py)
+
+    @property
+    def rule(self) -> str:
+        """Entry for allowedApps/blockedApps; rules match the process name."""
+        return self.exe or self.name
+
+
+# -- Linux -------------------------------------------------------------------
+
+def xdg_application_dirs() -> List[str]:
+    home = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    return [os.path.join(d, "applications") for d in [home] + dirs.split(":") if d]
+
+
+def _exec_name(exec_line: str) -> str:
+    """Executable an Exec= line starts, "" if it goes through a launcher."""
+    try:
+        args = shlex.split(exec_line)
+    except ValueError:
+        args = exec_line.split()
+    for arg in args:
+        if arg == "env" or ("=" in arg and not arg.startswith("/")):
+            continue   # env VAR=value ...
+        name = os.path.basename(arg)
+        # flatpak run org.app.Id, snap run app, ...: the rule uses the app name
+        return "" if name in _WRAPPERS else name
+    return ""
+
+
+def parse_desktop_file(path: str) -> Optional[InstalledApp]:
+    """The app a .desktop file launches, or None for hidden or non-app entries."""
+    entry: Dict[str, str] = {}
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            section = None
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    if section == "Desktop Entry":
+                        break
+                    section = line[1:-1]
+                elif section == "Desktop Entry" and "=" in line:
+                    key, value = line.split("=", 1)
+                    entry.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if entry.get("Type", "Application") != "Application":
+        return None
+    if entry.get("NoDisplay") == "true" or entry.get("Hidden") == "true":
+        return None
+    name = entry.get("Name")
+    if not name:
+        return None
+    exe = _exec_name(entry.get("TryExec") or entry.get("Exec", ""))
+    return InstalledApp(name, exe, "desktop", entry.get("Icon", ""))
+
+
+def _scan_desktop_dir(path: str) -> List[InstalledApp]:
+    apps = []
+    for entry in os.scandir(path):
+        if entry.name.endswith(".desktop") and entry.is_file():
+            app = parse_desktop_file(entry.path)
+            if app is not None:
+                apps.append(app)
+    return apps
+
+
+# -- Windows -----------------------------------------------------------------
+
+def start_menu_dirs() -> List[str]:
+    dirs = []
+    for var in ("APPDATA", "PROGRAMDATA"):
+        root = os.environ.get(var)
+        if root:
+            dirs.append(os.path.join(root, "Microsoft", "Windows", "Start Menu", "Programs"))
+    return dirs
+
+
+def _shortcut_resolver():
+    """Resolves .lnk targets through the Windows shell, if pywin32 is there."""
+    try:
+        import pythoncom
+        import win32com.client
+    except ImportError:
+        return None
+    pythoncom.CoInitialize()
+    shell = win32com.client.Dispatch("WScript.Shell")
+    return lambda path: shell.CreateShortcut(path).TargetPath
+
+
+def _scan_start_menu_dir(path: str, resolve) -> List[InstalledApp]:
+    apps = []
+    for entry in os.scandir(path):
+        if not (entry.name.lower().endswith(".lnk") and entry.is_file()):
+            continue
+        name = entry.name[:-4]
+        if "uninstall" in name.lower():
+            continue
+        target = ""
+        if resolve is not None:
+            try:
+                target = resolve(entry.path) or ""
+            except Exception:
+                target = ""
+        exe = os.path.basename(target) if target.lower().endswith(".exe") else ""
+        # The shell resolves a shortcut's own icon, so the .lnk itself will do.
+        apps.append(InstalledApp(name, exe, "startmenu", target if exe else entry.path))
+    return apps
+
+
+_UNINSTALL_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+
+
+def _registry_keys():
+    import winreg
+    return [
+        ("HKCU", winreg.HKEY_CURRENT_USER, _UNINSTALL_KEY, 0),
+        ("HKLM", winreg.HKEY_LOCAL_MACHINE, _UNINSTALL_KEY, winreg.KEY_WOW64_64KEY),
+        ("HKLM32", winreg.HKEY_LOCAL_MACHINE, _UNINSTALL_KEY, winreg.KEY_WOW64_32KEY),
+    ]
+
+
+def _registry_mtime(root, subkey: str, view: int) -> Optional[int]:
+    import winreg
+    try:
+        with winreg.OpenKey(root, subkey, 0, winreg.KEY_READ | view) as key:
+            return winreg.QueryInfoKey(key)[2]   # last write, 100 ns ticks
+    except OSError:
+        return None
+
+
+def _scan_registry_key(root, subkey: str, view: int) -> List[InstalledApp]:
+    import winreg
+
+    def value(key, name):
+        try:
+            return winreg.QueryValueEx(key, name)[0]
+        except OSError:
+            return None
+
+    apps = []
+    with winreg.OpenKey(root, subkey, 0, winreg.KEY_READ | view) as uninstall:
+        for i in range(winreg.QueryInfoKey(uninstall)[0]):
+            try:
+                with winreg.OpenKey(uninstall, winreg.EnumKey(uninstall, i), 0, winreg.KEY_READ | view) as key:
+                    name = value(key, "DisplayName")
+                    if not name or value(key, "SystemComponent") == 1:
+                        continue
+                    icon = (value(key, "DisplayIcon") or "").split(",")[0].strip('"')
+                    exe = os.path.basename(icon) if icon.lower().endswith(".exe") else ""
+                    apps.append(InstalledApp(name, exe, "registry", icon))
+            except OSError:
+                continue
+    return apps
+
+
+# -- Scan with cache ---------------------------------------------------------
+
+def _walk_dirs(root: str) -> Iterator[Tuple[str, int]]:
+    """(directory, mtime_ns) for root and every directory below it.
+
+    The mtime is the newest of the directory's and its files', so a file
+    edited in place invalidates the directory's cache entry.
+    """
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            subdirs = []
+            for entry in os.scandir(path):
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                try:
+                    mtime = max(mtime, entry.stat().st_mtime_ns)
+                except OSError:
+                    pass   # dangling symlink
+        except OSError:
+            continue
+        yield path, mtime
+        stack.extend(sorted(subdirs, reverse=True))
+
+
+def load_cache(path: str = APPS_CACHE_FILE) -> Dict[str, Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("sources", {})
+
+
+def save_cache(sources: Dict[str, Dict], path: str = APPS_CACHE_FILE) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "sources": sources}, f)
+    os.replace(tmp, path)
+
+
+def discover(cache_path: str = APPS_CACHE_FILE, platform: str = sys.platform) -> Tuple[List[InstalledApp], Dict[str, int]]:
+    """Installed apps, re-reading only sources whose mtime changed.
+
+    Returns the apps sorted by name (one per rule, earlier sources winning)
+    and counts of sources scanned and reused from the cache.
+    """
+    cached = load_cache(cache_path)
+    sources: Dict[str, Dict] = {}
+    stats = {"scanned": 0, "cached": 0}
+
+    def use(key, mtime, scan):
+        entry = cached.get(key)
+        if entry is not None and entry.get("mtime") == mtime:
+            stats["cached"] += 1
+        else:
+            try:
+                apps = scan()
+            except OSError as e:
+                logger.debug(f"Skipping {key}: {e}")
+                return
+            entry = {"mtime": mtime, "apps": [list(app) for app in apps]}
+            stats["scanned"] += 1
+        sources[key] = entry
+
+    if platform.startswith("win"):
+        resolve = None
+        resolver_loaded = False
+        for root in start_menu_dirs():
+            for path, mtime in _walk_dirs(root):
+                def scan(path=path):
+                    nonlocal resolve, resolver_loaded
+                    if not resolver_loaded:
+                        resolve, resolver_loaded = _shortcut_resolver(), True
+                    return _scan_start_menu_dir(path, resolve)
+                use(path, mtime, scan)
+        try:
+            keys = _registry_keys()
+        except ImportError:
+            keys = []
+        for label, root, subkey, view in keys:
+            mtime = _registry_mtime(root, subkey, view)
+            if mtime is not None:
+                use(f"{label}\\{subkey}", mtime,
+                    lambda root=root, subkey=subkey, view=view: _scan_registry_key(root, subkey, view))
+    else:
+        for root in xdg_application_dirs():
+            for path, mtime in _walk_dirs(root):
+                use(path, mtime, lambda path=path: _scan_desktop_dir(path))
+
+    if sources != cached:
+        try:
+            save_cache(sources, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write app discovery cache: {e}")
+
+    apps: Dict[str, InstalledApp] = {}
+    for entry in sources.values():
+        for row in entry["apps"]:
+            app = InstalledApp(*row)
+            apps.setdefault(app.rule.lower(), app)
+    return sorted(apps.values(), key=lambda app: app.name.lower()), stats
+
+
+class AppDiscovery:
+    """Scans installed applications on a worker thread."""
+
+    def __init__(self, event_queue: Queue, cache_path: Optional[str] = None):
+        self.event_queue = event_queue
+        self.cache_path = cache_path
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="app-discovery", daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        try:
+            apps, stats = discover(self.cache_path or APPS_CACHE_FILE)
+        except Exception:
+            logger.exception("App discovery failed")
+            apps, stats = [], {}
+        logger.info(f"Discovered {len(apps)} installed apps ({stats})")
+        self.event_queue.put({"type": "apps_discovered", "apps": apps})
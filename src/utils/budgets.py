@@ -0,0 +1,121 @@
+"""
+budgets.py
+
+Daily per-app time budgets ("YouTube 15 minutes a day").
+
+Budgets are read from userPreferences["budgets"] and sessionRules["budgets"]
+(session rules win), both mapping an app/site name to minutes per day.
+Usage is accumulated per budget from foreground transitions only and kept in
+state["budgetUsage"], which is saved with the regular state writes. The day
+rollover and the exhausted check are constant-time, so they can run on every
+foreground poll.
+"""
+
+from __future__ import annotations
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+STATE_KEY = "budgetUsage"
+
+# Bound on the (exe, domain, title) -> budget match cache.
+_MATCH_CACHE_SIZE = 512
+
+
+def _next_midnight(now: float) -> float:
+    tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+
+class UsageBudgets:
+    """Per-identity usage counters checked against daily limits."""
+
+    def __init__(self, state: Dict):
+        self.usage = state.setdefault(STATE_KEY, {})
+        self.usage.setdefault("day", date.today().isoformat())
+        self.usage.setdefault("seconds", {})
+        self.limits: Dict[str, float] = {}
+        self._match_cache: Dict[Tuple, Optional[str]] = {}
+        self._day_end = _next_midnight(time.time())
+        if self.usage["day"] != date.today().isoformat():
+            self._reset_day()
+        # Open foreground: (budget key, monotonic start)
+        self._open: Tuple[Optional[str], float] = (None, time.monotonic())
+        self.set_rules(state)
+
+    def set_rules(self, state: Dict) -> None:
+        """Reload limits from userPreferences and sessionRules."""
+        limits = {}
+        for source in (state.get("userPreferences", {}), state.get("sessionRules", {})):
+            for name, minutes in (source.get("budgets") or {}).items():
+                try:
+                    limits[name.lower()] = float(minutes) * 60
+                except (TypeError, ValueError):
+                    continue
+        self.limits = limits
+        self._match_cache.clear()
+
+    def _reset_day(self) -> None:
+        self.usage["day"] = date.today().isoformat()
+        self.usage["seconds"] = {}
+
+    def _check_day(self, now_wall: float) -> None:
+        if now_wall >= self._day_end:
+            self._reset_day()
+            self._day_end = _next_midnight(now_wall)
+            self._open = (self._open[0], time.monotonic())
+
+    def match(self, exe: str = "", domain: Optional[str] = None, title: str = "") -> Optional[str]:
+        """Budget key for a foreground identity, or None. Cached per identity."""
+        if not self.limits:
+            return None
+        key = (exe, domain, title)
+        if key in self._match_cache:
+            return self._match_cache[key]
+        haystacks = [h.lower() for h in (domain, exe, title) if h]
+        found = next((name for name in self.limits for h in haystacks if name in h), None)
+        if len(self._match_cache) >= _MATCH_CACHE_SIZE:
+            self._match_cache.clear()
+        self._match_cache[key] = found
+        return found
+
+    def observe(self, budget_key: Optional[str], now: Optional[float] = None) -> None:
+        """Account the previous foreground when the budget identity changes."""
+        now = time.monotonic() if now is None else now
+        self._check_day(time.time())
+        open_key, since = self._open
+        if budget_key == open_key:
+            return
+        self._account(open_key, now - since)
+        self._open = (budget_key, now)
+
+    def _account(self, budget_key: Optional[str], seconds: float) -> None:
+        if budget_key is None or seconds <= 0:
+            return
+        counters = self.usage["seconds"]
+        counters[budget_key] = counters.get(budget_key, 0.0) + round(seconds, 1)
+
+    def checkpoint(self) -> None:
+        """Move the open segment into the counters (call before persisting)."""
+        now = time.monotonic()
+        open_key, since = self._open
+        self._account(open_key, now - since)
+        self._open = (open_key, now)
+
+    def used(self, budget_key: str) -> float:
+        seconds = self.usage["seconds"].get(budget_key, 0.0)
+        open_key, since = self._open
+        if open_key == budget_key:
+            seconds += time.monotonic() - since
+        return seconds
+
+    def remaining(self, budget_key: str) -> float:
+        limit = self.limits.get(budget_key)
+        if limit is None:
+            return float("inf")
+        return max(0.0, limit - self.used(budget_key))
+
+    def exhausted(self, budget_key: Optional[str]) -> bool:
+        if budget_key is None or budget_key not in self.limits:
+            return False
+        return self.used(budget_key) >= self.limits[budget_key]
@@ -1,8 +1,99 @@
+"""
+config.py
+
+Application configuration (~/.zenflow/config.json), read with dot keys.
+
+get() caches each resolved key and setting() hands out typed accessors that
+re-read only after a change. Changes made with set() are saved atomically;
+several set() calls inside batch() are saved once, and subscribers hear
+about each changed key once. apply() swaps in a re-read file the same way,
+which is how edits to the file reach a running app (see config_watch.py).
+"""
+
 import os
+import copy
 import json
 import logging
+from contextlib import contextmanager
 from pathlib import Path
 
+# Marks a key that is not in the config (None is a valid value).
+_MISSING = object()
+
+_TRUE_STRINGS = ('1', 'true', 'yes', 'on')
+_FALSE_STRINGS = ('0', 'false', 'no', 'off')
+
+
+def changed_keys(old, new, prefix=''):
+    """Dot paths of the leaf values that differ between two nested dicts."""
+    changed = set()
+    for key in set(old) | set(new):
+        path = f"{prefix}.{key}" if prefix else key
+        before = old.get(key, _MISSING)
+        after = new.get(key, _MISSING)
+        if isinstance(before, dict) and isinstance(after, dict):
+            changed |= changed_keys(before, after, path)
+        elif before is _MISSING or after is _MISSING or before != after:
+            changed.add(path)
+    return changed
+
+
+class Setting:
+    """Typed accessor for one key, compiled once and held by the caller.
+
+    The dot path is split when the accessor is made, and the converted value
+    is cached until the config changes. A value that cannot be converted to
+    kind falls back to the default.
+
+    Example: splash_ms = config.setting('settings.splash_min_display_ms', 500, int)
+             splash_ms.value
+    """
+
+    __slots__ = ('_config', 'key', 'default', 'kind', '_path', '_value', '_version')
+
+    def __init__(self, config, key, default=None, kind=None):
+        self._config = config
+        self.key = key
+        self.default = default
+        self.kind = kind
+        self._path = config._path(key)
+        self._value = default
+        self._version = -1
+
+    @property
+    def value(self):
+        if self._version != self._config.version:
+            self._value = self._convert(self._config._lookup(self._path))
+            self._version = self._config.version
+        return self._value
+
+    def _convert(self, raw):
+        if raw is _MISSING or raw is None:
+            return self.default
+        kind = self.kind
+        if kind is None or (type(raw) is kind):
+            return raw
+        try:
+            if kind is bool:
+                if isinstance(raw, str) and raw.strip().lower() in _TRUE_STRINGS + _FALSE_STRINGS:
+                    return raw.strip().lower() in _TRUE_STRINGS
+                if isinstance(raw, (int, float)):
+                    return bool(raw)
+            elif kind in (int, float):
+                # bool is an int subclass, but True is not a count
+                if not isinstance(raw, bool):
+                    return kind(raw)
+            elif kind is str and isinstance(raw, (int, float)):
+                return str(raw)
+            elif isinstance(raw, kind):
+                return raw
+        except (TypeError, ValueError):
+            pass
+        logging.getLogger(__name__).warning(
+            f"Config value {self.key}={raw!r} is not {kind.__name__}; using {self.default!r}")
+        return self.default
+
+
 class AppConfig:
     def __init__(self, config_file=None):
         """Initialize the application configuration.
@@ -13,6 +104,14 @@ class AppConfig:
         """
         self.logger = logging.getLogger(__name__)
         
+        # Bumped on every change; Setting accessors re-read when it moves.
+        self.version = 0
+        self._paths = {}
+        self._values = {}
+        self._listeners = []
+        self._batch_depth = 0
+        self._batch_snapshot = None
+        
         # Set default configuration values
         self.config = {
             'app_name': 'ZenFlow',
@@ -26,7 +125,19 @@ class AppConfig:
                 'work_session_minutes': 25,
                 'short_break_minutes': 5,
                 'long_break_minutes': 15,
-                'sessions_before_long_break': 4
+                'sessions_before_long_break': 4,
+                # Blocked overlay flap suppression (see src/utils/transitions.py)
+                'overlay_show_dwell_ms': 0,
+                'overlay_hide_hysteresis_ms': 1000,
+                'distraction_coalesce_ms': 10000,
+                # Screen cache (see src/screens/registry.py)
+                'screen_idle_evict_seconds': 300,
+                'screen_cache_budget_kb': 16384,
+                # Minimum splash time once the window is ready; 0 skips straight on
+                'splash_min_display_ms': 500,
+                # "process": blocking runs in a separate core daemon that outlives
+                # the window; "embedded": on a thread of the UI (see src/core)
+                'core_daemon': 'process'
             },
             'user_preferences': {
                 'start_minimized': False,
@@ -35,6 +146,8 @@ class AppConfig:
                 'enable_sounds': True
             }
         }
+        # What apply() starts from: keys removed from the file revert to these
+        self.defaults = copy.deepcopy(self.config)
         
         # Set the default config file path
         if config_file is None:
@@ -54,8 +167,7 @@ class AppConfig:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r') as f:
                     loaded_config = json.load(f)
-                    # Update the default config with loaded values
-                    self._update_nested_dict(self.config, loaded_config)
+                self.apply(loaded_config)
                 self.logger.info(f"Configuration loaded from {self.config_file}")
             else:
                 self.logger.info("No configuration file found, using defaults")
@@ -63,47 +175,168 @@ class AppConfig:
         except Exception as e:
             self.logger.error(f"Error loading configuration: {e}")
     
+    def apply(self, loaded_config):
+        """Replace the config with the defaults updated by loaded_config.
+        
+        Used by load() and by live reloads (see config_watch.py) with an
+        already parsed file. Only the keys that differ from the live config
+        are reported to subscribers. Returns them.
+        """
+        config = copy.deepcopy(self.defaults)
+        # Update the default config with loaded values
+        self._update_nested_dict(config, loaded_config)
+        changed = changed_keys(self.config, config)
+        if changed:
+            self.config = config
+            self._changed(changed)
+        return changed
+    
     def save(self):
-        """Save the current configuration to file."""
+        """Save the current configuration to file.
+        
+        Written to a temporary file first and renamed over the old one, so a
+        crash mid-write never leaves a truncated config behind.
+        """
+        tmp = f"{self.config_file}.tmp"
         try:
-            with open(self.config_file, 'w') as f:
+            with open(tmp, 'w') as f:
                 json.dump(self.config, f, indent=4)
+            os.replace(tmp, self.config_file)
             self.logger.info(f"Configuration saved to {self.config_file}")
             return True
         except Exception as e:
             self.logger.error(f"Error saving configuration: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
             return False
     
     def get(self, key, default=None):
         """Get a configuration value by dot notation key.
         
         Example: config.get('settings.theme')
-        """
-        keys = key.split('.')
-        value = self.config
         
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        Resolved values are cached until the config changes.
+        """
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._values[key] = self._lookup(self._path(key))
+        return default if value is _MISSING else value
+    
+    def setting(self, key, default=None, kind=None):
+        """Compiled, typed accessor for key (see Setting)."""
+        return Setting(self, key, default, kind)
     
     def set(self, key, value):
         """Set a configuration value by dot notation key.
         
         Example: config.set('settings.theme', 'dark')
+        
+        Saves right away unless called inside batch(); setting a key to the
+        value it already has does nothing.
         """
-        keys = key.split('.')
-        current = self.config
+        with self.batch():
+            keys = self._path(key)
+            current = self.config
+            
+            for k in keys[:-1]:
+                if not isinstance(current.get(k), dict):
+                    current[k] = {}
+                current = current[k]
+            
+            current[keys[-1]] = value
+            # Later reads in the same batch see the new value
+            self._invalidate()
+    
+    @contextmanager
+    def batch(self):
+        """Apply several set() calls as one change.
+        
+        Example:
+            with config.batch():
+                config.set('settings.theme', 'dark')
+                config.set('settings.notifications', False)
         
-        for k in keys[:-1]:
-            if k not in current:
-                current[k] = {}
-            current = current[k]
+        The file is saved once at the end and listeners hear about every key
+        that changed, once. If the block raises, the config is rolled back and
+        nothing is saved; if the save fails, it is rolled back too and
+        listeners hear nothing, so the config, the file and what listeners
+        were told always agree. Nested batches join the outermost one.
+        """
+        outer = self._batch_depth == 0
+        if outer:
+            self._batch_snapshot = copy.deepcopy(self.config)
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if outer:
+                self.config = self._batch_snapshot
+                self._invalidate()
+            raise
+        else:
+            if outer:
+                changed = changed_keys(self._batch_snapshot, self.config)
+                if changed and not self.save():
+                    self.config = self._batch_snapshot
+                    self._invalidate()
+                    changed = set()
+                self._changed(changed)
+        finally:
+            self._batch_depth -= 1
+            if outer:
+                self._batch_snapshot = None
+    
+    def subscribe(self, callback, prefix=''):
+        """Call callback(keys) with the changed dot keys under prefix.
         
-        current[keys[-1]] = value
-        self.save()
+        Example: config.subscribe(on_theme, 'settings.theme')
+        
+        Runs after a set(), batch() or load() that changed at least one of
+        them. Returns a function that unsubscribes.
+        """
+        listener = (prefix, callback)
+        self._listeners.append(listener)
+        
+        def unsubscribe():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        return unsubscribe
+    
+    def _changed(self, keys):
+        if not keys:
+            return
+        self._invalidate()
+        for prefix, callback in list(self._listeners):
+            matched = {key for key in keys
+                       if not prefix or key == prefix or key.startswith(prefix + '.')
+                       or prefix.startswith(key + '.')}
+            if not matched:
+                continue
+            try:
+                callback(frozenset(matched))
+            except Exception:
+                self.logger.exception(f"Config listener for {prefix or 'all keys'!r} failed")
+    
+    def _invalidate(self):
+        self.version += 1
+        self._values.clear()
+    
+    def _path(self, key):
+        path = self._paths.get(key)
+        if path is None:
+            path = self._paths[key] = tuple(key.split('.'))
+        return path
+    
+    def _lookup(self, path):
+        value = self.config
+        try:
+            for k in path:
+                value = value[k]
+            return value
+        except (KeyError, TypeError):
+            return _MISSING
     
     def _update_nested_dict(self, original, updates):
         """Recursively update a nested dictionary."""
@@ -0,0 +1,135 @@
+"""
+config_watch.py
+
+Live reload of the JSON config files (~/.zenflow/config.json and
+config/settings.json), so edits and pushed configs apply without a restart
+that would interrupt a running session.
+
+The owner says when a file may have changed: the window connects a
+QFileSystemWatcher to notify(); the core daemon, which has no Qt, polls each
+file's (mtime, size) stamp on its scheduler. Notices are debounced (editors
+and config pushes write in several steps), the files are read and parsed on
+a worker thread, and the parsed dicts are handed back through deliver() so
+on_reload runs on the owner's thread. on_reload gets the dot keys that
+differ from the previous parse (see config.changed_keys), so each owner
+re-initializes only what those keys affect.
+
+A file that is missing or does not parse keeps its last good contents.
+"""
+
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, FrozenSet, NamedTuple, Optional
+
+from src.utils.config import changed_keys
+
+logger = logging.getLogger(__name__)
+
+RELOAD_DEBOUNCE_MS = 300
+POLL_MS = 2000
+
+
+class FileStamp(NamedTuple):
+    mtime_ns: int
+    size: int
+
+
+def file_stamp(path: str) -> Optional[FileStamp]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return FileStamp(st.st_mtime_ns, st.st_size)
+
+
+class ConfigWatcher:
+    def __init__(self, paths: Dict[str, str], on_reload: Callable[[str, Dict, FrozenSet[str]], None],
+                 scheduler, deliver: Callable[[Callable[[], None]], None],
+                 debounce_ms: int = RELOAD_DEBOUNCE_MS):
+        """paths: name -> file. deliver(fn) must run fn on the owner's thread."""
+        self.paths = dict(paths)
+        self.on_reload = on_reload
+        self.scheduler = scheduler
+        self.deliver = deliver
+        self.debounce_ms = debounce_ms
+        self.data: Dict[str, Dict] = {}
+        self._polled: Dict[str, Optional[FileStamp]] = {}
+        self._reading = False
+        self._again = False
+        self._primed = False
+        self.reloads = 0
+
+    def start(self, poll_ms: Optional[int] = None) -> None:
+        """Read the current contents as the baseline; poll_ms also polls stamps."""
+        self._read_async()
+        if poll_ms:
+            self._polled = self._current_stamps()
+            self.scheduler.add("config.poll", self.poll, poll_ms, tolerance_ms=poll_ms // 2)
+
+    def stop(self) -> None:
+        self.scheduler.cancel("config.poll")
+        self.scheduler.cancel("config.reload")
+
+    def notify(self, path: Optional[str] = None) -> None:
+        # Re-adding the job restarts its delay: a burst of writes reloads once
+        self.scheduler.add("config.reload", self._read_async, delay_ms=self.debounce_ms)
+
+    def poll(self) -> None:
+        # Only a stamp that moved since the last poll notifies; notifying on
+        # every poll while a reload is pending would keep restarting the debounce
+        stamps = self._current_stamps()
+        if stamps != self._polled:
+            self._polled = stamps
+            self.notify()
+
+    def _current_stamps(self) -> Dict[str, Optional[FileStamp]]:
+        return {name: file_stamp(path) for name, path in self.paths.items()}
+
+    def _read_async(self) -> None:
+        if self._reading:
+            self._again = True
+            return
+        self._reading = True
+        threading.Thread(target=self._read, name="config-reload", daemon=True).start()
+
+    def _read(self) -> None:
+        # Worker thread
+        results = {}
+        for name, path in self.paths.items():
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable config {path}: {e}")
+                continue
+            if not isinstance(data, dict):
+                logger.warning(f"Ignoring config {path}: not a JSON object")
+                continue
+            results[name] = data
+        self.deliver(lambda: self._apply(results))
+
+    def _apply(self, results) -> None:
+        self._reading = False
+        primed, self._primed = self._primed, True
+        for name, data in results.items():
+            previous = self.data.get(name)
+            self.data[name] = data
+            if not primed:
+                continue
+            changed = changed_keys(previous or {}, data)
+            if not changed:
+                continue
+            self.reloads += 1
+            logger.info(f"Reloaded {self.paths[name]}: {', '.join(sorted(changed))}")
+            try:
+                self.on_reload(name, data, frozenset(changed))
+            except Exception:
+                logger.exception(f"Applying {self.paths[name]} failed")
+        if self._again:
+            self._again = False
+            self.notify()
@@ -0,0 +1,162 @@
+"""
+distraction_log.py
+
+Per-session log of blocked attempts.
+
+Each attempt is stored as a compact record (monotonic timestamp, interned
+app/domain id, verdict source, flags) in fixed-size array-backed columns used
+as a ring buffer. Pending records are appended to EVENTS_FILE in batches, so
+recording a distraction costs no disk I/O by itself.
+
+Each flushed batch is one JSON line:
+    {"t0": <wall epoch of monotonic 0>, "ids": [...], "events": [[ts, id, source, flags], ...]}
+"""
+
+from __future__ import annotations
+import json
+import logging
+import time
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional
+
+from src.utils.store import EVENTS_FILE
+
+logger = logging.getLogger(__name__)
+
+# Verdict sources, stored as their index (append only). "suspend" and
+# "terminate" are blocked apps dealt with by hard enforcement.
+SOURCES = ("desktop", "web", "title", "budget", "launch", "user", "suspend", "terminate")
+
+FLAG_ALLOW_ONCE = 0x01
+
+
+class DistractionLog:
+    """Ring buffer of distraction records with batched flushing."""
+
+    def __init__(self, capacity: int = 512, flush_threshold: int = 64,
+                 path: Optional[str] = None):
+        self.capacity = capacity
+        self.flush_threshold = min(flush_threshold, capacity)
+        self.path = path or EVENTS_FILE
+        self._ts = array("d", bytes(8 * capacity))
+        self._ids = array("I", bytes(4 * capacity))
+        self._sources = array("B", bytes(capacity))
+        self._flags = array("B", bytes(capacity))
+        self._head = 0       # next slot to write
+        self._size = 0       # records held in the ring
+        self._pending = 0    # records not yet flushed (the newest ones)
+        self.dropped = 0     # unflushed records overwritten by wrap-around
+        self.identities: List[str] = []
+        self._identity_ids: Dict[str, int] = {}
+        self.counts: Counter = Counter()
+        # Monotonic -> wall clock anchor for persisted timestamps.
+        self._wall_anchor = time.time() - time.monotonic()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _intern(self, identity: str) -> int:
+        ident = self._identity_ids.get(identity)
+        if ident is None:
+            ident = self._identity_ids[identity] = len(self.identities)
+            self.identities.append(identity)
+        return ident
+
+    def record(self, identity: str, source: str = "desktop", allow_once: bool = False,
+               ts: Optional[float] = None) -> bool:
+        """Append one attempt. Returns True when a flush is due."""
+        i = self._head
+        self._ts[i] = time.monotonic() if ts is None else ts
+        self._ids[i] = self._intern(identity)
+        self._sources[i] = SOURCES.index(source) if source in SOURCES else 0
+        self._flags[i] = FLAG_ALLOW_ONCE if allow_once else 0
+        self._head = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        if self._pending == self.capacity:
+            self.dropped += 1
+        else:
+            self._pending += 1
+        self.counts[identity] += 1
+        return self._pending >= self.flush_threshold
+
+    def mark_allow_once(self, identity: str) -> None:
+        """Flag the latest pending attempt for identity, or log a separate record."""
+        ident = self._identity_ids.get(identity)
+        if ident is not None:
+            for offset in range(1, self._pending + 1):
+                i = (self._head - offset) % self.capacity
+                if self._ids[i] == ident:
+                    self._flags[i] |= FLAG_ALLOW_ONCE
+                    return
+        self.record(identity, source="user", allow_once=True)
+        self.counts[identity] -= 1
+
+    def _indices(self, count: int):
+        start = (self._head - count) % self.capacity
+        return [(start + k) % self.capacity for k in range(count)]
+
+    def pending_records(self) -> List[list]:
+        return [
+            [round(self._ts[i], 3), self._ids[i], self._sources[i], self._flags[i]]
+            for i in self._indices(self._pending)
+        ]
+
+    def flush(self) -> int:
+        """Append all pending records to the event file as one batch."""
+        if not self._pending:
+            return 0
+        batch = {
+            "t0": round(self._wall_anchor, 3),
+            "ids": self.identities,
+            "events": self.pending_records(),
+        }
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(batch, separators=(",", ":")) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to flush distraction events: {e}")
+            return 0
+        flushed, self._pending = self._pending, 0
+        return flushed
+
+    def breakdown(self) -> Dict[str, int]:
+        """Distraction count per app/domain for this session, most frequent first."""
+        return {name: n for name, n in self.counts.most_common() if n > 0}
+
+    def allowed_once(self) -> List[str]:
+        """Identities the user allowed once among the records still in the ring."""
+        seen = []
+        for i in self._indices(self._size):
+            if self._flags[i] & FLAG_ALLOW_ONCE:
+                name = self.identities[self._ids[i]]
+                if name not in seen:
+                    seen.append(name)
+        return seen
+
+
+def read_events(path: Optional[str] = None):
+    """Yield (wall_ts, identity, source, allow_once) from the persisted log."""
+    try:
+        f = open(path or EVENTS_FILE, "r", encoding="utf-8")
+    except OSError:
+        return
+    with f:
+        for line in f:
+            try:
+                batch = json.loads(line)
+            except ValueError:
+                continue
+            ids = batch.get("ids", [])
+            t0 = batch.get("t0", 0.0)
+            for ts, ident, source, flags in batch.get("events", []):
+                yield (
+                    t0 + ts,
+                    ids[ident] if ident < len(ids) else "?",
+                    SOURCES[source] if source < len(SOURCES) else "desktop",
+                    bool(flags & FLAG_ALLOW_ONCE),
+                )
@@ -0,0 +1,225 @@
+"""
+enforcement.py
+
+Hard enforcement for blocked apps: suspend or terminate their processes
+instead of covering them with the block overlay.
+
+A suspended process is not scheduled at all, so a blocked app that stays open
+costs no CPU and needs no overlay re-shown every time it comes back to the
+foreground. Enforcer remembers what it suspended and resumes it when the
+session ends (resume_all) or the app is allowed once (resume).
+
+Pids are reused, and the pids handed in may come from a snapshot, so each
+one is described again right before it is suspended or terminated and
+skipped unless it still runs the blocked app. A suspended entry keeps the
+process start time; resuming compares that, so a pid reused while its
+entry was waiting is left alone.
+
+Backends:
+- posix: SIGSTOP / SIGCONT / SIGTERM.
+- windows: NtSuspendProcess / NtResumeProcess and TerminateProcess through
+  ctypes (no extra packages).
+Acting on another user's process fails with PermissionError; callers fall
+back to the overlay.
+"""
+
+from __future__ import annotations
+import logging
+import os
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from src.utils.rules import SUSPEND, TERMINATE
+
+logger = logging.getLogger(__name__)
+
+
+class PosixBackend:
+    name = "posix"
+
+    def __init__(self):
+        import signal
+        self._signal = signal
+
+    def suspend(self, pid: int) -> None:
+        os.kill(pid, self._signal.SIGSTOP)
+
+    def resume(self, pid: int) -> None:
+        os.kill(pid, self._signal.SIGCONT)
+
+    def terminate(self, pid: int) -> None:
+        os.kill(pid, self._signal.SIGTERM)
+
+
+class WindowsBackend:
+    name = "windows"
+
+    _PROCESS_TERMINATE = 0x0001
+    _PROCESS_SUSPEND_RESUME = 0x0800
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self._kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._kernel32.TerminateProcess.argtypes = [wintypes.HANDLE, wintypes.UINT]
+        self._ntdll = ctypes.WinDLL("ntdll")
+        for fn in (self._ntdll.NtSuspendProcess, self._ntdll.NtResumeProcess):
+            fn.argtypes = [wintypes.HANDLE]
+            fn.restype = ctypes.c_long
+
+    def _with_handle(self, pid: int, access: int, action) -> None:
+        handle = self._kernel32.OpenProcess(access, False, pid)
+        if not handle:
+            error = self._ctypes.get_last_error()
+            # ERROR_ACCESS_DENIED
+            raise (PermissionError if error == 5 else ProcessLookupError)(error, f"OpenProcess({pid}) failed")
+        try:
+            action(handle)
+        finally:
+            self._kernel32.CloseHandle(handle)
+
+    def _nt(self, fn, pid: int) -> None:
+        def call(handle):
+            status = fn(handle)
+            if status != 0:
+                raise OSError(f"NTSTATUS {status & 0xFFFFFFFF:#010x} for pid {pid}")
+        self._with_handle(pid, self._PROCESS_SUSPEND_RESUME, call)
+
+    def suspend(self, pid: int) -> None:
+        self._nt(self._ntdll.NtSuspendProcess, pid)
+
+    def resume(self, pid: int) -> None:
+        self._nt(self._ntdll.NtResumeProcess, pid)
+
+    def terminate(self, pid: int) -> None:
+        def call(handle):
+            if not self._kernel32.TerminateProcess(handle, 1):
+                raise OSError(self._ctypes.get_last_error(), f"TerminateProcess({pid}) failed")
+        self._with_handle(pid, self._PROCESS_TERMINATE, call)
+
+
+def load_enforcement_backend(platform: str = sys.platform):
+    """Backend for this platform, or None if processes cannot be controlled."""
+    try:
+        return WindowsBackend() if platform.startswith("win") else PosixBackend()
+    except (ImportError, OSError, AttributeError) as e:
+        logger.warning(f"Hard enforcement unavailable, using the overlay: {e}")
+        return None
+
+
+class Suspended(NamedTuple):
+    pid: int
+    name: str    # process name, as in ProcessInfo
+    rule: str    # blocked entry it matched
+    started: float = 0.0   # ProcessInfo.started when suspended, 0 if unknown
+
+
+class Enforcer:
+    def __init__(self, processes, backend=None, platform: str = sys.platform):
+        self.processes = processes
+        self._backend = backend
+        self._backend_loaded = backend is not None
+        self.platform = platform
+        self.suspended: Dict[int, Suspended] = {}
+        self._protected = {os.getpid(), os.getppid(), 0, 1}
+
+    @property
+    def backend(self):
+        if not self._backend_loaded:
+            self._backend = load_enforcement_backend(self.platform)
+            self._backend_loaded = True
+        return self._backend
+
+    def enforce(self, policy: str, name: str, rule: str, pids: Optional[Iterable[int]] = None) -> bool:
+        """Apply policy to every process named name (or to pids).
+
+        Returns True if the app is dealt with (all its processes suspended or
+        terminated, including ones suspended earlier), False if the caller
+        should fall back to the overlay.
+        """
+        if policy not in (SUSPEND, TERMINATE) or self.backend is None:
+            return False
+        name = name.lower()
+        targets = [pid for pid in (pids if pids is not None else self.processes.pids_for_exe(name))
+                   if pid not in self._protected]
+        if not targets:
+            return False
+        handled = True
+        enforced = 0
+        describe = self.processes.source.describe
+        for pid in targets:
+            if policy == SUSPEND and pid in self.suspended:
+                enforced += 1
+                continue
+            current = describe(pid)
+            if current is None or name not in (current.name, os.path.basename(current.exe).lower()):
+                continue   # exited, or the pid now belongs to another program
+            try:
+                if policy == SUSPEND:
+                    self.backend.suspend(pid)
+                    self.suspended[pid] = Suspended(pid, name, rule, current.started)
+                else:
+                    self.backend.terminate(pid)
+                enforced += 1
+            except ProcessLookupError:
+                continue   # exited meanwhile
+            except OSError as e:
+                logger.info(f"Could not {policy} {name} (pid {pid}): {e}")
+                handled = False
+        if not enforced:
+            return False
+        if handled:
+            logger.info(f"Enforced {policy} on {name} ({enforced} processes)")
+        return handled
+
+    def is_suspended(self, name: str) -> bool:
+        name = name.lower()
+        return any(entry.name == name for entry in self.suspended.values())
+
+    def suspended_apps(self) -> List[str]:
+        return sorted({entry.name for entry in self.suspended.values()})
+
+    def snapshot(self) -> List[List]:
+        """Suspended processes as JSON-friendly rows, for adopt() after a crash."""
+        return [list(entry) for entry in sorted(self.suspended.values())]
+
+    def adopt(self, rows: Iterable[Iterable]) -> None:
+        # Rows saved before start times were kept have three columns
+        for pid, name, rule, *started in rows:
+            self.suspended[int(pid)] = Suspended(int(pid), name, rule, *started)
+
+    def resume(self, app: str) -> int:
+        """Resume processes suspended for app (a process name, rule or display name)."""
+        key = app.lower()
+        matches = [entry for entry in self.suspended.values()
+                   if key in (entry.name, entry.rule, os.path.splitext(entry.name)[0])]
+        return self._resume(matches)
+
+    def resume_all(self) -> int:
+        return self._resume(list(self.suspended.values()))
+
+    def _resume(self, entries: List[Suspended]) -> int:
+        resumed = 0
+        describe = self.processes.source.describe
+        for entry in entries:
+            del self.suspended[entry.pid]
+            # Skip pids reused by another program since they were suspended
+            current = describe(entry.pid)
+            if current is None or not self._same_process(entry, current):
+                continue
+            try:
+                self.backend.resume(entry.pid)
+                resumed += 1
+            except OSError as e:
+                logger.warning(f"Could not resume {entry.name} (pid {entry.pid}): {e}")
+        return resumed
+
+    @staticmethod
+    def _same_process(entry: Suspended, current) -> bool:
+        if entry.started and current.started:
+            return current.started == entry.started
+        return current.name == entry.name
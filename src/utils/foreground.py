@@ -0,0 +1,64 @@
+"""
+foreground.py
+
+Platform backends answering "which app is in the foreground".
+
+Backends import their platform modules (pywin32, and psutil through the
+process table) the first time they are loaded, not when this module is
+imported, so importing the UI stays cheap. A missing optional dependency
+disables foreground detection with one warning instead of crashing startup.
+"""
+
+from __future__ import annotations
+import logging
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ForegroundWindow(NamedTuple):
+    exe: str     # lowercased executable basename, e.g. "chrome.exe"
+    title: str   # lowercased window title
+    pid: int
+
+
+class NullForegroundBackend:
+    """Used when no platform backend can be loaded; never reports a window."""
+
+    name = "none"
+
+    def foreground(self) -> Optional[ForegroundWindow]:
+        return None
+
+
+class Win32ForegroundBackend:
+    name = "win32"
+
+    def __init__(self, processes=None):
+        import win32gui
+        import win32process
+        from src.utils.processes import ProcessTable
+        self._win32gui = win32gui
+        self._win32process = win32process
+        # Shared process table: the pid -> exe lookup is a dict hit after the
+        # first poll of each process.
+        self._processes = processes if processes is not None else ProcessTable()
+
+    def foreground(self) -> Optional[ForegroundWindow]:
+        hwnd = self._win32gui.GetForegroundWindow()
+        _, pid = self._win32process.GetWindowThreadProcessId(hwnd)
+        process = self._processes.get(pid)
+        if process is None:
+            return None
+        exe = process.name
+        title = self._win32gui.GetWindowText(hwnd).lower()
+        return ForegroundWindow(exe, title, pid)
+
+
+def load_foreground_backend(processes=None):
+    """Best available backend for this machine (imports happen here)."""
+    try:
+        return Win32ForegroundBackend(processes)
+    except ImportError as e:
+        logger.warning(f"Foreground app detection disabled: {e}")
+        return NullForegroundBackend()
@@ -0,0 +1,227 @@
+"""
+launch_monitor.py
+
+Process-creation events, so a blocked app is caught when it starts instead of
+when its window first reaches the foreground.
+
+Backends, best first:
+- netlink: the Linux proc connector delivers every exec() from the kernel as
+  it happens. Binding to it needs CAP_NET_ADMIN (normally root).
+- wmi: Windows Win32_ProcessStartTrace, kernel process-start trace events
+  delivered through WMI (needs admin). Without admin rights it falls back to
+  WMI's own Win32_Process creation events, sampled every WMI_WITHIN_SECONDS.
+  Needs the wmi package (pywin32).
+- poll: subscribe to the shared ProcessTable (see processes.py), which
+  diffs /proc or psutil pids every POLL_REFRESH_MS while the monitor runs.
+
+Event backends run on a daemon thread and match each launch against the
+CompiledRules they were last given right there; only matches are passed to
+on_blocked, on that thread (the UI forwards them through a queued Qt signal).
+The poll backend runs on the scheduler and calls on_blocked directly.
+"""
+
+from __future__ import annotations
+import importlib.util
+import logging
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+from src.utils.rules import CompiledRules
+
+logger = logging.getLogger(__name__)
+
+POLL_REFRESH_MS = 250
+WMI_WITHIN_SECONDS = 0.5
+
+# linux/netlink.h, linux/connector.h, linux/cn_proc.h
+_NETLINK_CONNECTOR = 11
+_CN_IDX_PROC = 1
+_CN_VAL_PROC = 1
+_NLMSG_DONE = 3
+_PROC_CN_MCAST_LISTEN = 1
+_PROC_CN_MCAST_IGNORE = 2
+_PROC_EVENT_EXEC = 0x00000002
+_NLMSG_HEADER = struct.Struct("=IHHII")      # len, type, flags, seq, pid
+_CN_MSG_HEADER = struct.Struct("=IIIIHH")    # idx, val, seq, ack, len, flags
+_PROC_EVENT_HEADER = struct.Struct("=IIQ")   # what, cpu, timestamp_ns
+_EXEC_EVENT = struct.Struct("=II")           # process_pid, process_tgid
+
+
+class Launch(NamedTuple):
+    pid: int
+    name: str                     # lowercased process name
+    exe: str
+    rule: str                     # blocked entry it matched
+    detect_ms: Optional[float]    # exec() -> match, when the backend knows
+
+
+class LaunchMonitor:
+    def __init__(self, processes, on_blocked: Callable[[Launch], None],
+                 rules: Optional[CompiledRules] = None, platform: str = sys.platform):
+        self.processes = processes
+        self.on_blocked = on_blocked
+        self.rules = rules or CompiledRules()
+        self.platform = platform
+        self.backend: Optional[str] = None
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._socket: Optional[socket.socket] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self.launches_seen = 0
+
+    def set_rules(self, rules: CompiledRules) -> None:
+        # One attribute assignment: the worker thread sees the old or the new set.
+        self.rules = rules
+
+    @property
+    def running(self) -> bool:
+        return self.backend is not None
+
+    def start(self) -> str:
+        """Start the best available backend; returns its name."""
+        if self.backend is not None:
+            return self.backend
+        if self.platform.startswith("linux") and self._open_netlink():
+            self._start_thread(self._netlink_loop, self._socket)
+            self.backend = "netlink"
+        elif self.platform.startswith("win") and importlib.util.find_spec("wmi") is not None:
+            self._start_thread(self._wmi_loop)
+            self.backend = "wmi"
+        else:
+            self._unsubscribe = self.processes.subscribe(self._on_delta, refresh_ms=POLL_REFRESH_MS)
+            self.backend = "poll"
+        logger.info(f"Launch monitor started ({self.backend})")
+        return self.backend
+
+    def stop(self) -> None:
+        if self.backend is None:
+            return
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._socket is not None:
+            try:
+                self._send_netlink(_PROC_CN_MCAST_IGNORE)
+            except OSError:
+                pass
+            # The worker closes it once its current recv() returns.
+            self._socket = None
+        self._thread = None
+        self.backend = None
+
+    def _start_thread(self, target, *args) -> None:
+        # Each run gets its own stop flag, so a quick stop()/start() cannot
+        # revive the previous worker.
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=target, args=args + (self._stop,),
+                                        name="launch-monitor", daemon=True)
+        self._thread.start()
+
+    def _check(self, pid: int, name: str, exe: str, detect_ms: Optional[float] = None) -> None:
+        self.launches_seen += 1
+        rules = self.rules
+        rule = rules.match_exe(name) or (rules.match_exe(os.path.basename(exe).lower()) if exe else None)
+        if rule is None:
+            return
+        try:
+            self.on_blocked(Launch(pid, name, exe, rule, detect_ms))
+        except Exception:
+            logger.exception("Blocked launch handler failed")
+
+    # -- poll ----------------------------------------------------------------
+
+    def _on_delta(self, added, removed) -> None:
+        for info in added:
+            self._check(info.pid, info.name, info.exe)
+
+    # -- netlink -------------------------------------------------------------
+
+    def _open_netlink(self) -> bool:
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, _NETLINK_CONNECTOR)
+        except (AttributeError, OSError) as e:
+            logger.info(f"Netlink proc connector unavailable: {e}")
+            return False
+        try:
+            # Port id 0: the kernel assigns one, so monitors never collide
+            sock.bind((0, _CN_IDX_PROC))
+            self._socket = sock
+            self._send_netlink(_PROC_CN_MCAST_LISTEN)
+        except OSError as e:
+            # EPERM without CAP_NET_ADMIN
+            logger.info(f"Netlink proc connector unavailable: {e}")
+            sock.close()
+            self._socket = None
+            return False
+        sock.settimeout(1.0)
+        return True
+
+    def _send_netlink(self, op: int) -> None:
+        payload = struct.pack("=I", op)
+        cn_msg = _CN_MSG_HEADER.pack(_CN_IDX_PROC, _CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = _NLMSG_HEADER.pack(_NLMSG_HEADER.size + len(cn_msg), _NLMSG_DONE, 0, 0,
+                                    self._socket.getsockname()[0])
+        self._socket.send(header + cn_msg)
+
+    def _netlink_loop(self, sock: socket.socket, stop: threading.Event) -> None:
+        describe = self.processes.source.describe
+        offset = _NLMSG_HEADER.size + _CN_MSG_HEADER.size
+        while not stop.is_set():
+            try:
+                data = sock.recv(4096)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                logger.warning(f"Netlink launch monitoring stopped: {e}")
+                break
+            if len(data) < offset + _PROC_EVENT_HEADER.size + _EXEC_EVENT.size:
+                continue
+            what, _, stamp_ns = _PROC_EVENT_HEADER.unpack_from(data, offset)
+            if what != _PROC_EVENT_EXEC:
+                continue
+            _, tgid = _EXEC_EVENT.unpack_from(data, offset + _PROC_EVENT_HEADER.size)
+            info = describe(tgid)
+            if info is None:
+                continue
+            # The event is stamped with the kernel's CLOCK_MONOTONIC.
+            detect_ms = (time.monotonic_ns() - stamp_ns) / 1e6
+            self._check(info.pid, info.name, info.exe, detect_ms)
+        sock.close()
+
+    # -- WMI -----------------------------------------------------------------
+
+    def _wmi_loop(self, stop: threading.Event) -> None:
+        try:
+            import pythoncom
+            import wmi
+            pythoncom.CoInitialize()
+            connection = wmi.WMI()
+            try:
+                watcher = connection.watch_for(raw_wql="SELECT * FROM Win32_ProcessStartTrace")
+            except wmi.x_wmi:
+                logger.info("Process start trace needs admin; using WMI creation events")
+                watcher = connection.watch_for(notification_type="Creation", wmi_class="Win32_Process",
+                                               delay_secs=WMI_WITHIN_SECONDS)
+        except Exception as e:
+            logger.warning(f"WMI launch monitoring failed, launches are caught by the foreground poll only: {e}")
+            return
+        while not stop.is_set():
+            try:
+                event = watcher(timeout_ms=1000)
+            except wmi.x_wmi_timed_out:
+                continue
+            except Exception as e:
+                logger.warning(f"WMI launch monitoring stopped: {e}")
+                return
+            pid = int(getattr(event, "ProcessID", None) or getattr(event, "ProcessId", 0) or 0)
+            name = (getattr(event, "ProcessName", None) or getattr(event, "Name", "") or "").lower()
+            exe = getattr(event, "ExecutablePath", None) or ""
+            self._check(pid, name, exe)
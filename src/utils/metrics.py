@@ -0,0 +1,46 @@
+"""
+metrics.py
+
+Small in-process latency metrics (last N samples with percentiles).
+"""
+
+from __future__ import annotations
+import logging
+from collections import deque
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyStats:
+    """Rolling window of latency samples in milliseconds."""
+
+    def __init__(self, name: str, maxlen: int = 256):
+        self.name = name
+        self.samples = deque(maxlen=maxlen)
+        self.count = 0
+
+    def add(self, ms: float) -> None:
+        self.samples.append(ms)
+        self.count += 1
+        logger.debug(f"{self.name}: {ms:.1f} ms")
+
+    @property
+    def last(self) -> Optional[float]:
+        return self.samples[-1] if self.samples else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {
+            "count": self.count,
+            "last": self.last,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": max(self.samples) if self.samples else None,
+        }
@@ -0,0 +1,369 @@
+"""
+processes.py
+
+One shared, incrementally refreshed process table.
+
+Blocking, launch detection and enforcement all ask about running processes;
+ProcessTable answers from a single snapshot instead of each of them walking
+the process list.
+
+A refresh only lists pids (os.listdir("/proc") on Linux, psutil.pids()
+elsewhere) and diffs the set against the previous one. Processes are
+described (name, exe) lazily: on lookup, or right away for new pids while
+someone is subscribed, since subscribers are sent (added, removed) deltas of
+ProcessInfo after each refresh. With nobody subscribed no deltas are built
+and no periodic refresh runs; lookups refresh at most once per
+min_interval_ms.
+
+A description holds for a pid and an identity: the process start time, plus
+on Linux the comm that exec() replaces. Pids are reused (on Windows within
+seconds), so each refresh re-reads the identity of the described pids, and
+get() re-reads it on every hit; a pid whose identity changed is removed and
+added again.
+
+psutil is imported only when the psutil source is loaded (not on Linux).
+"""
+
+from __future__ import annotations
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Periodic refresh while subscribed, and the oldest snapshot a lookup accepts.
+DEFAULT_REFRESH_MS = 2000
+DEFAULT_MIN_INTERVAL_MS = 1000
+# Describing fewer new pids than this one by one beats a full process_iter().
+BULK_DESCRIBE_MIN = 16
+
+
+class ProcessInfo(NamedTuple):
+    pid: int
+    name: str    # lowercased process name, e.g. "chrome.exe" or "firefox"
+    exe: str     # full executable path, "" if not readable
+    started: float = 0.0   # start time (a pid plus this names one process), 0 if unknown
+
+
+Delta = Tuple[List[ProcessInfo], List[ProcessInfo]]   # (added, removed)
+
+
+class ProcSource:
+    """Linux: pids from /proc, names from /proc/<pid>/stat and exe links."""
+
+    name = "proc"
+
+    def __init__(self, root: str = "/proc"):
+        self.root = root
+
+    def pids(self) -> Set[int]:
+        return {int(entry) for entry in os.listdir(self.root) if entry.isdigit()}
+
+    def _stat(self, pid: int) -> Optional[Tuple[str, float]]:
+        """(comm, start time in clock ticks since boot), None if gone."""
+        try:
+            with open(os.path.join(self.root, str(pid), "stat"), "rb") as f:
+                stat = f.read()
+        except OSError:
+            return None
+        # comm is in parentheses and may itself contain ") "
+        head, _, tail = stat.rpartition(b")")
+        fields = tail.split()
+        try:
+            # Field 22 (starttime); fields[0] is field 3
+            return head.partition(b"(")[2].decode("utf-8", "replace"), float(fields[19])
+        except (IndexError, ValueError):
+            return None
+
+    def identities(self, pids: Iterable[int]) -> Dict[int, Tuple[str, float]]:
+        # exec() keeps the pid and start time but replaces comm
+        return {pid: stat for pid, stat in ((pid, self._stat(pid)) for pid in pids) if stat is not None}
+
+    def describe(self, pid: int) -> Optional[ProcessInfo]:
+        stat = self._stat(pid)
+        if stat is None:
+            return None   # already gone
+        comm, started = stat
+        try:
+            exe = os.readlink(os.path.join(self.root, str(pid), "exe"))
+        except OSError:
+            exe = ""      # other users' processes and kernel threads
+        # comm is cut to 15 characters; prefer the exe name when it is readable
+        name = os.path.basename(exe) if exe else comm
+        return ProcessInfo(pid, name.lower(), exe, started)
+
+    def describe_all(self, pids: Iterable[int]) -> List[ProcessInfo]:
+        return [info for info in map(self.describe, pids) if info is not None]
+
+
+class PsutilSource:
+    """Other platforms: psutil, with process_iter(attrs) for bulk reads."""
+
+    name = "psutil"
+
+    def __init__(self):
+        import psutil
+        self._psutil = psutil
+
+    def pids(self) -> Set[int]:
+        return set(self._psutil.pids())
+
+    def identities(self, pids: Iterable[int]) -> Dict[int, float]:
+        started = {}
+        for pid in pids:
+            try:
+                started[pid] = self._psutil.Process(pid).create_time()
+            except (self._psutil.NoSuchProcess, self._psutil.ZombieProcess):
+                continue
+            except self._psutil.AccessDenied:
+                started[pid] = 0.0
+        return started
+
+    def describe(self, pid: int) -> Optional[ProcessInfo]:
+        try:
+            info = self._psutil.Process(pid).as_dict(attrs=["name", "exe", "create_time"], ad_value="")
+        except (self._psutil.NoSuchProcess, self._psutil.ZombieProcess):
+            return None
+        return self._info(pid, info)
+
+    def describe_all(self, pids: Iterable[int]) -> List[ProcessInfo]:
+        wanted = set(pids)
+        if len(wanted) <= BULK_DESCRIBE_MIN:
+            return [info for info in map(self.describe, wanted) if info is not None]
+        return [self._info(p.info["pid"], p.info)
+                for p in self._psutil.process_iter(attrs=["pid", "name", "exe", "create_time"], ad_value="")
+                if p.info["pid"] in wanted]
+
+    @staticmethod
+    def _info(pid: int, info: Dict) -> ProcessInfo:
+        # Same naming as ProcSource: the exe's file name when it is readable
+        exe = info["exe"] or ""
+        return ProcessInfo(pid, (os.path.basename(exe) if exe else info["name"] or "").lower(), exe,
+                           info["create_time"] or 0.0)
+
+
+class NullSource:
+    name = "none"
+
+    def pids(self) -> Set[int]:
+        return set()
+
+    def identities(self, pids: Iterable[int]) -> Dict[int, object]:
+        return {}
+
+    def describe(self, pid: int) -> Optional[ProcessInfo]:
+        return None
+
+    def describe_all(self, pids: Iterable[int]) -> List[ProcessInfo]:
+        return []
+
+
+def load_process_source():
+    """/proc where it exists, else psutil, else a source that sees nothing."""
+    if os.path.isdir("/proc/self"):
+        return ProcSource()
+    try:
+        return PsutilSource()
+    except ImportError as e:
+        logger.warning(f"Process list unavailable: {e}")
+        return NullSource()
+
+
+class ProcessTable:
+    def __init__(self, source=None, scheduler=None,
+                 refresh_ms: int = DEFAULT_REFRESH_MS,
+                 min_interval_ms: int = DEFAULT_MIN_INTERVAL_MS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.source = source if source is not None else load_process_source()
+        self.scheduler = scheduler
+        self.refresh_ms = refresh_ms
+        self.min_interval_ms = min_interval_ms
+        self._clock = clock
+        self._pids: Set[int] = set()
+        self._info: Dict[int, ProcessInfo] = {}
+        # Identity each description was taken under (see the module docstring)
+        self._identity: Dict[int, object] = {}
+        self._by_exe: Dict[str, Set[int]] = {}
+        self._subscribers: List[Callable[[List[ProcessInfo], List[ProcessInfo]], None]] = []
+        self._subscriber_rates: List[int] = []
+        self._unpublished: List[ProcessInfo] = []
+        self.refreshed_at: Optional[float] = None
+        self.refreshes = 0
+        self.described = 0
+
+    # -- indexes -------------------------------------------------------------
+
+    def _index(self, info: ProcessInfo, identity) -> None:
+        self._info[info.pid] = info
+        self._identity[info.pid] = identity
+        self._by_exe.setdefault(info.name, set()).add(info.pid)
+        self.described += 1
+
+    def _unindex(self, pid: int) -> Optional[ProcessInfo]:
+        info = self._info.pop(pid, None)
+        self._identity.pop(pid, None)
+        if info is not None:
+            pids = self._by_exe.get(info.name)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self._by_exe[info.name]
+        return info
+
+    def _describe(self, pids: Iterable[int]) -> List[ProcessInfo]:
+        """Describe and index pids; the identity is read first, so a process
+        that exec()s meanwhile is caught by the next refresh."""
+        pids = list(pids)
+        if not pids:
+            return []
+        identities = self.source.identities(pids)
+        described = []
+        for info in self.source.describe_all(pids):
+            if info.pid in self._pids and info.pid in identities:
+                self._index(info, identities[info.pid])
+                described.append(info)
+        return described
+
+    def _describe_pending(self) -> None:
+        self._describe(self._pids.difference(self._info))
+
+    def _replaced(self, pids: Iterable[int]) -> Set[int]:
+        """Described pids whose identity changed (reused, or exec()ed)."""
+        identities = self.source.identities(pids)
+        return {pid for pid in pids if identities.get(pid) != self._identity.get(pid)}
+
+    # -- refresh -------------------------------------------------------------
+
+    def _fresh(self) -> bool:
+        return (self.refreshed_at is not None
+                and (self._clock() - self.refreshed_at) * 1000 < self.min_interval_ms)
+
+    def refresh(self, force: bool = False) -> Delta:
+        """Re-list pids and apply the difference; returns the published delta."""
+        if not force and self._fresh():
+            return [], []
+        try:
+            current = self.source.pids()
+        except OSError as e:
+            logger.warning(f"Could not list processes: {e}")
+            return [], []
+        self.refreshed_at = self._clock()
+        self.refreshes += 1
+        gone = self._pids - current
+        replaced = self._replaced(current.intersection(self._info))
+        new = (current - self._pids) | replaced
+        self._pids = current
+        removed = [info for info in map(self._unindex, gone | replaced) if info is not None]
+        if not self._subscribers:
+            # Nobody wants deltas: new pids are described when looked up.
+            self._unpublished.clear()
+            return [], []
+        added = self._describe(new)
+        if replaced:
+            # Only a description that actually changed is news (comm is
+            # also renamed without an exec())
+            same = set(added).intersection(removed)
+            added = [info for info in added if info not in same]
+            removed = [info for info in removed if info not in same]
+        added = [info for info in self._unpublished if info.pid in current] + added
+        self._unpublished.clear()
+        if added or removed:
+            for callback in list(self._subscribers):
+                try:
+                    callback(added, removed)
+                except Exception:
+                    logger.exception("Process subscriber failed")
+        return added, removed
+
+    # -- subscriptions -------------------------------------------------------
+
+    def subscribe(self, callback: Callable[[List[ProcessInfo], List[ProcessInfo]], None],
+                  refresh_ms: Optional[int] = None) -> Callable[[], None]:
+        """Call callback(added, removed) after each refresh that changes something.
+
+        refresh_ms asks for a faster periodic refresh than the default; the
+        fastest subscriber sets the rate. Returns a function that
+        unsubscribes. The periodic refresh runs on the scheduler only while
+        there is at least one subscriber.
+        """
+        if not self._subscribers:
+            self.refresh(force=True)
+            self._describe_pending()
+        self._subscribers.append(callback)
+        self._subscriber_rates.append(refresh_ms or self.refresh_ms)
+        self._schedule_refresh()
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                index = self._subscribers.index(callback)
+                del self._subscribers[index]
+                del self._subscriber_rates[index]
+                self._schedule_refresh()
+        return unsubscribe
+
+    def _schedule_refresh(self) -> None:
+        if self.scheduler is None:
+            return
+        if not self._subscribers:
+            self.scheduler.cancel("processes.refresh")
+            return
+        interval = min(self._subscriber_rates)
+        job = self.scheduler.jobs.get("processes.refresh")
+        if job is None or job.interval_ms != interval:
+            # A subscriber that wants it this often also accepts the snapshot
+            # being that old.
+            self.scheduler.add("processes.refresh", lambda: self.refresh(force=True), interval,
+                               tolerance_ms=interval // 4)
+
+    @property
+    def subscribed(self) -> bool:
+        return bool(self._subscribers)
+
+    # -- lookups -------------------------------------------------------------
+
+    def get(self, pid: int) -> Optional[ProcessInfo]:
+        info = self._info.get(pid)
+        if info is not None:
+            if pid not in self._replaced([pid]):
+                return info
+            # Reused or exec()ed since it was described
+            if self._subscribers:
+                # A refresh publishes the swap as removed + added
+                self.refresh(force=True)
+                info = self._info.get(pid)
+                if info is not None:
+                    return info
+            else:
+                self._unindex(pid)
+        if pid not in self._pids:
+            self.refresh()
+            if pid not in self._pids:
+                # Newer than the snapshot (or gone); describe it directly.
+                self._pids.add(pid)
+                described = self._describe([pid])
+                if not described:
+                    self._pids.discard(pid)
+                    return None
+                if self._subscribers:
+                    self._unpublished.append(described[0])
+                return described[0]
+        described = self._describe([pid])
+        if not described:
+            self._pids.discard(pid)
+            return None
+        return described[0]
+
+    def pids_for_exe(self, exe: str) -> Set[int]:
+        """Pids running exe (a path or file name; case-insensitive)."""
+        self.refresh()
+        self._describe_pending()
+        return set(self._by_exe.get(os.path.basename(exe).lower(), ()))
+
+    def processes(self) -> List[ProcessInfo]:
+        self.refresh()
+        self._describe_pending()
+        return sorted(self._info.values())
+
+    def __len__(self) -> int:
+        return len(self._pids)
@@ -0,0 +1,102 @@
+"""
+reminders.py
+
+Health reminders (eye strain, posture, hydration, breaks) as scheduler jobs.
+
+Intervals come from the "health" section of config/settings.json (minutes);
+the eye strain and posture reminders can also be switched off from the
+settings screen (userPreferences). Reminders are in the "session" group, so
+they are cancelled when a session ends and start over with the next one.
+"""
+
+from __future__ import annotations
+import json
+import logging
+import os
+from functools import partial
+from typing import Callable, Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+HEALTH_SETTINGS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "config", "settings.json",
+)
+
+DEFAULT_HEALTH = {
+    "enabled": True,
+    "eye_strain_interval": 20,
+    "posture_reminder_interval": 30,
+    "hydration_reminder_interval": 60,
+    "break_reminder_interval": 25,
+    "mute_reminders": False,
+}
+
+# A reminder may run this late to share a wakeup with other jobs.
+MAX_TOLERANCE_MS = 60 * 1000
+
+
+class Reminder(NamedTuple):
+    key: str
+    interval_setting: str
+    preference: Optional[str]   # userPreferences flag that can turn it off
+    message: str
+
+
+REMINDERS = (
+    Reminder("eye_strain", "eye_strain_interval", "eyeStrainReminders",
+             "Eye break: look at something 20 feet away for 20 seconds."),
+    Reminder("posture", "posture_reminder_interval", "postureTips",
+             "Posture check: sit back, relax your shoulders, screen at eye level."),
+    Reminder("hydration", "hydration_reminder_interval", None,
+             "Time for a glass of water."),
+    Reminder("break", "break_reminder_interval", None,
+             "Break time: stand up and move for a few minutes."),
+)
+
+
+def load_health_settings(path: str = HEALTH_SETTINGS_FILE) -> Dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return health_settings(json.load(f))
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Using default health reminder settings: {e}")
+    return dict(DEFAULT_HEALTH)
+
+
+def health_settings(data: Dict) -> Dict:
+    """Health settings from an already parsed settings.json."""
+    settings = dict(DEFAULT_HEALTH)
+    settings.update(data.get("health", {}))
+    return settings
+
+
+def job_name(reminder: Reminder) -> str:
+    return f"reminder.{reminder.key}"
+
+
+def sync_reminders(scheduler, health: Dict, prefs: Dict, show: Callable[[str], None]) -> None:
+    """Add, retime or cancel reminder jobs to match the current settings.
+
+    Jobs whose interval and show are unchanged are left alone, so toggling
+    one reminder does not restart the others. A job made with another show
+    (an earlier dashboard's) is replaced.
+    """
+    active = health.get("enabled", True) and not health.get("mute_reminders", False)
+    for reminder in REMINDERS:
+        name = job_name(reminder)
+        try:
+            interval_ms = int(float(health.get(reminder.interval_setting, 0)) * 60 * 1000)
+        except (TypeError, ValueError):
+            interval_ms = 0
+        wanted = active and interval_ms > 0
+        if reminder.preference:
+            wanted = wanted and prefs.get(reminder.preference, True)
+        job = scheduler.jobs.get(name)
+        if not wanted:
+            if job is not None:
+                scheduler.cancel(name)
+        elif (job is None or job.interval_ms != interval_ms
+              or getattr(job.callback, "func", None) != show):
+            scheduler.add(name, partial(show, reminder.message), interval_ms,
+                          tolerance_ms=min(MAX_TOLERANCE_MS, interval_ms // 10), group="session")
@@ -0,0 +1,200 @@
+"""
+rollups.py
+
+Daily and ISO-week focus rollups kept next to sessionHistory in the state file.
+
+The rollups are updated incrementally (one session or one distraction at a
+time), so the dashboard and summary read totals, per-day/per-week figures and
+streaks in O(1) no matter how long the history is. Scanning the full history
+only happens in the repair command:
+
+    python -m src.utils.rollups --repair
+"""
+
+from __future__ import annotations
+import argparse
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+STATE_KEY = "focusRollups"
+
+# Formats that sessionHistory timestamps have been written in so far
+# (QDateTime.toString() default, then ISO 8601).
+_TIMESTAMP_FORMATS = ("%a %b %d %H:%M:%S %Y",)
+
+
+def _empty_bucket() -> Dict[str, int]:
+    return {"focusSeconds": 0, "sessions": 0, "distractions": 0}
+
+
+def day_key(day: date) -> str:
+    return day.isoformat()
+
+
+def week_key(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def parse_session_time(value: Any) -> Optional[datetime]:
+    """Parse a sessionHistory timestamp, returning None if it is unreadable."""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    if not isinstance(value, str) or not value:
+        return None
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def session_end_time(session: Dict[str, Any]) -> Optional[datetime]:
+    """Best effort end time of a history entry."""
+    for key in ("endedAtEpoch", "endedAt", "startTime"):
+        parsed = parse_session_time(session.get(key))
+        if parsed is not None:
+            return parsed
+    return None
+
+
+class FocusRollups:
+    """Per-day and per-ISO-week aggregates stored in-place in the state dict."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self.data = data if data is not None else {}
+        self.data.setdefault("days", {})
+        self.data.setdefault("weeks", {})
+        self.data.setdefault("totals", _empty_bucket())
+        self.data.setdefault("streak", {"current": 0, "best": 0, "lastDay": None})
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "FocusRollups":
+        """Bind to state["focusRollups"], creating it if missing."""
+        return cls(state.setdefault(STATE_KEY, {}))
+
+    # Incremental updates
+
+    def _buckets(self, day: date):
+        days = self.data["days"]
+        weeks = self.data["weeks"]
+        d = days.get(day_key(day))
+        if d is None:
+            d = days[day_key(day)] = _empty_bucket()
+        w = weeks.get(week_key(day))
+        if w is None:
+            w = weeks[week_key(day)] = _empty_bucket()
+        return d, w, self.data["totals"]
+
+    def add_session(self, elapsed_seconds: int, when: Optional[datetime] = None,
+                    distractions: int = 0) -> None:
+        """Account for a finished session.
+
+        Distractions recorded live through add_distraction() must not be passed
+        again here; `distractions` is only used when rebuilding from history.
+        """
+        day = (when or datetime.now()).date()
+        for bucket in self._buckets(day):
+            bucket["focusSeconds"] += int(elapsed_seconds)
+            bucket["sessions"] += 1
+            bucket["distractions"] += int(distractions)
+        self._extend_streak(day)
+
+    def add_distraction(self, when: Optional[datetime] = None, count: int = 1) -> None:
+        day = (when or datetime.now()).date()
+        for bucket in self._buckets(day):
+            bucket["distractions"] += count
+
+    def _extend_streak(self, day: date) -> None:
+        streak = self.data["streak"]
+        last = streak.get("lastDay")
+        last_day = date.fromisoformat(last) if last else None
+        if last_day is not None and day <= last_day:
+            return
+        if last_day is not None and day - last_day == timedelta(days=1):
+            streak["current"] += 1
+        else:
+            streak["current"] = 1
+        streak["lastDay"] = day_key(day)
+        streak["best"] = max(streak["best"], streak["current"])
+
+    # O(1) reads
+
+    def day(self, day: Optional[date] = None) -> Dict[str, int]:
+        return dict(self.data["days"].get(day_key(day or date.today()), _empty_bucket()))
+
+    def week(self, day: Optional[date] = None) -> Dict[str, int]:
+        return dict(self.data["weeks"].get(week_key(day or date.today()), _empty_bucket()))
+
+    def totals(self) -> Dict[str, int]:
+        return dict(self.data["totals"])
+
+    def current_streak(self, today: Optional[date] = None) -> int:
+        """Consecutive days with a session, ending today or yesterday."""
+        streak = self.data["streak"]
+        last = streak.get("lastDay")
+        if not last:
+            return 0
+        gap = (today or date.today()) - date.fromisoformat(last)
+        return streak["current"] if gap <= timedelta(days=1) else 0
+
+    def best_streak(self) -> int:
+        return self.data["streak"]["best"]
+
+    # Repair
+
+    def clear(self) -> None:
+        self.data.clear()
+        self.__init__(self.data)
+
+    def rebuild(self, history: Iterable[Dict[str, Any]]) -> int:
+        """Recompute every aggregate from sessionHistory. Returns sessions counted."""
+        self.clear()
+        sessions = [(session_end_time(s), s) for s in history]
+        # Streaks must be extended in chronological order; undated entries
+        # still count towards the totals.
+        sessions.sort(key=lambda item: item[0] or datetime.min)
+        for when, session in sessions:
+            elapsed = int(session.get("elapsedSeconds", 0) or 0)
+            distractions = int(session.get("distractionAttempts", 0) or 0)
+            if when is None:
+                totals = self.data["totals"]
+                totals["focusSeconds"] += elapsed
+                totals["sessions"] += 1
+                totals["distractions"] += distractions
+            else:
+                self.add_session(elapsed, when, distractions)
+        return len(sessions)
+
+
+def repair(state: Dict[str, Any]) -> int:
+    """Rebuild state["focusRollups"] from state["sessionHistory"]."""
+    return FocusRollups.from_state(state).rebuild(state.get("sessionHistory", []))
+
+
+def main(argv=None) -> int:
+    from src.utils.store import DATA_FILE, load_state, save_state
+
+    parser = argparse.ArgumentParser(description="Maintain ZenFlow focus rollups.")
+    parser.add_argument("--repair", action="store_true",
+                        help="rebuild rollups from the full session history")
+    args = parser.parse_args(argv)
+
+    state = load_state()
+    if args.repair:
+        count = repair(state)
+        save_state(state)
+        print(f"Rebuilt rollups from {count} sessions in {DATA_FILE}")
+    rollups = FocusRollups.from_state(state)
+    totals = rollups.totals()
+    print(f"Total focus: {totals['focusSeconds']}s over {totals['sessions']} sessions, "
+          f"{totals['distractions']} distractions, best streak {rollups.best_streak()} days")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""
+rules.py
+
+Session block rules compiled for matching.
+
+A sessionRules["blockedApps"] entry blocks any exe name or window title that
+contains it, case-insensitively. CompiledRules turns all entries into one
+regular expression, so a check is a single scan however many entries there
+are, and caches the verdict per exe name.
+
+sessionRules["enforcement"] optionally maps an entry to what happens when a
+matching app runs: OVERLAY (the default) covers it with the block overlay,
+SUSPEND freezes its processes until the session ends or the app is allowed
+once, TERMINATE closes it. See src/utils/enforcement.py.
+
+A CompiledRules is not changed after it is built (the verdict cache only
+grows, one dict assignment at a time), so the launch monitor's worker thread
+can keep using the instance it was given while the UI compiles a new one.
+"""
+
+from __future__ import annotations
+import re
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+OVERLAY = "overlay"
+SUSPEND = "suspend"
+TERMINATE = "terminate"
+POLICIES = (OVERLAY, SUSPEND, TERMINATE)
+
+# Bound on the exe -> verdict cache.
+_MATCH_CACHE_SIZE = 1024
+
+RulesKey = Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]]
+
+
+def rules_key(state: Dict) -> RulesKey:
+    """(blocked entries, non-overlay policies), both sorted and lowercased."""
+    rules = state.get("sessionRules", {})
+    blocked = tuple(sorted({app.lower() for app in rules.get("blockedApps", []) if app}))
+    policies = {entry.lower(): policy for entry, policy in rules.get("enforcement", {}).items()
+                if policy in POLICIES and policy != OVERLAY}
+    return blocked, tuple(sorted((entry, policies[entry]) for entry in blocked if entry in policies))
+
+
+class CompiledRules:
+    def __init__(self, blocked: Iterable[str] = (), policies: Iterable[Tuple[str, str]] = ()):
+        blocked = tuple(sorted({entry.lower() for entry in blocked if entry}))
+        self._policies: Mapping[str, str] = dict(policies)
+        self.key: RulesKey = (blocked, tuple(sorted(self._policies.items())))
+        # Longest first, so "youtube music" wins over "youtube"
+        entries = sorted(blocked, key=len, reverse=True)
+        self._pattern = re.compile("|".join(map(re.escape, entries))) if entries else None
+        self._exe_cache: Dict[str, Optional[str]] = {}
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def match(self, text: str) -> Optional[str]:
+        """The blocked entry found in text (an exe name or title), or None."""
+        if self._pattern is None or not text:
+            return None
+        found = self._pattern.search(text.lower())
+        return found.group(0) if found else None
+
+    def match_exe(self, exe: str) -> Optional[str]:
+        """match() for exe names, cached per name."""
+        try:
+            return self._exe_cache[exe]
+        except KeyError:
+            pass
+        verdict = self.match(exe)
+        if len(self._exe_cache) >= _MATCH_CACHE_SIZE:
+            self._exe_cache = {}
+        self._exe_cache[exe] = verdict
+        return verdict
+
+    def policy(self, entry: Optional[str]) -> str:
+        """Enforcement policy for a blocked entry returned by match()."""
+        return self._policies.get(entry, OVERLAY) if entry else OVERLAY
+
+    @property
+    def enforces(self) -> bool:
+        """True if any entry suspends or terminates instead of overlaying."""
+        return bool(self._policies)
+
+
+def compile_rules(state: Dict) -> CompiledRules:
+    return CompiledRules(*rules_key(state))
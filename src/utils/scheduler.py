@@ -0,0 +1,321 @@
+"""
+scheduler.py
+
+One scheduler for every periodic job (monitoring polls, session tick, tips,
+health reminders), driven by a single wakeup source.
+
+Jobs are kept in a hierarchical timer wheel: LEVELS levels of 64 slots, the
+first at RESOLUTION_MS per slot and each next level 64 times coarser. Adding,
+cancelling and pausing a job is O(1); finding the next wakeup scans at most
+64 slots per level and one slot's jobs, however many jobs exist. Wakeups
+land only when a job is due, never on a wheel cascade.
+
+Each job has a tolerance: it may run up to that long after it is due. The
+wheel is keyed by that latest acceptable time, and when the driver wakes
+up, every job that is already due (including ones whose latest time is
+still ahead) runs in the same wakeup. A periodic job's tolerance is capped
+at its interval, or it would run only once per tolerance. Jobs belong to a
+group so a whole group can be paused and resumed with the session, keeping
+the time left on each job.
+
+The scheduler does not own a timer. A driver (a single-shot QTimer in the
+UI) sleeps next_wakeup_ms() and calls run_due(); on_change is called
+whenever the next wakeup may have moved.
+"""
+
+from __future__ import annotations
+import logging
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+RESOLUTION_MS = 10
+# A time this close below a tick boundary counts as reached: a driver that
+# sleeps exactly next_wakeup_ms() must not land a float ulp short of it.
+_TICK_EPSILON = 1e-6
+LEVELS = 4          # 64**4 ticks of 10 ms: about 46 hours before overflow
+_BITS = 6
+_SLOTS = 1 << _BITS
+_MASK = _SLOTS - 1
+
+
+class TimerWheel:
+    """Hierarchical timer wheel over integer ticks."""
+
+    def __init__(self, current: int = 0):
+        self.current = current
+        self._slots: List[List[Set]] = [[set() for _ in range(_SLOTS)] for _ in range(LEVELS)]
+        self._overflow: Set = set()
+        self._where: Dict[object, tuple] = {}
+        self._ticks: Dict[object, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def __contains__(self, item) -> bool:
+        return item in self._ticks
+
+    def tick_of(self, item) -> int:
+        return self._ticks[item]
+
+    def insert(self, item, tick: int) -> None:
+        if item in self._ticks:
+            self.remove(item)
+        tick = max(tick, self.current)
+        self._ticks[item] = tick
+        self._place(item, tick)
+
+    def _place(self, item, tick: int) -> None:
+        # Level = lowest level whose higher digits match the current tick.
+        for level in range(LEVELS):
+            if tick >> (_BITS * (level + 1)) == self.current >> (_BITS * (level + 1)):
+                index = (tick >> (_BITS * level)) & _MASK
+                self._slots[level][index].add(item)
+                self._where[item] = (level, index)
+                return
+        self._overflow.add(item)
+        self._where[item] = (LEVELS, 0)
+
+    def remove(self, item) -> None:
+        where = self._where.pop(item, None)
+        if where is None:
+            return
+        del self._ticks[item]
+        level, index = where
+        if level == LEVELS:
+            self._overflow.discard(item)
+        else:
+            self._slots[level][index].discard(item)
+
+    def _events(self) -> Iterator[int]:
+        """Ticks at which something happens (a fire or a cascade), in order."""
+        for level in range(LEVELS):
+            shift = _BITS * level
+            digit = (self.current >> shift) & _MASK
+            base = (self.current >> (shift + _BITS)) << (shift + _BITS)
+            # Level 0 may hold items due at the current tick; above that the
+            # current digit's slot has already been cascaded.
+            for index in range(digit if level == 0 else digit + 1, _SLOTS):
+                if self._slots[level][index]:
+                    yield base | (index << shift)
+                    break
+        if self._overflow:
+            top = _BITS * LEVELS
+            yield min((tick >> top) << top for tick in (self._ticks[i] for i in self._overflow))
+
+    def next_tick(self) -> Optional[int]:
+        return min(self._events(), default=None)
+
+    def next_expiry(self) -> Optional[int]:
+        """Earliest item tick; unlike next_tick() this skips cascade-only ticks."""
+        best = None
+        for level in range(LEVELS):
+            shift = _BITS * level
+            digit = (self.current >> shift) & _MASK
+            for index in range(digit if level == 0 else digit + 1, _SLOTS):
+                slot = self._slots[level][index]
+                if slot:
+                    # The first occupied slot of a level holds that level's earliest items.
+                    first = min(self._ticks[item] for item in slot)
+                    best = first if best is None else min(best, first)
+                    break
+        if self._overflow:
+            first = min(self._ticks[item] for item in self._overflow)
+            best = first if best is None else min(best, first)
+        return best
+
+    def advance(self, tick: int) -> List:
+        """Move to tick and return the items that expired on the way."""
+        expired = []
+        while True:
+            event = self.next_tick()
+            if event is None or event > tick:
+                break
+            self.current = max(self.current, event)
+            self._cascade()
+            slot = self._slots[0][self.current & _MASK]
+            for item in list(slot):
+                if self._ticks[item] <= self.current:
+                    slot.discard(item)
+                    del self._where[item]
+                    del self._ticks[item]
+                    expired.append(item)
+        self.current = max(self.current, tick)
+        return expired
+
+    def _cascade(self) -> None:
+        top = _BITS * LEVELS
+        for item in [i for i in self._overflow if self._ticks[i] >> top == self.current >> top]:
+            self._overflow.discard(item)
+            self._place(item, self._ticks[item])
+        for level in range(LEVELS - 1, 0, -1):
+            shift = _BITS * level
+            if self.current & ((1 << shift) - 1):
+                continue
+            slot = self._slots[level][(self.current >> shift) & _MASK]
+            items = list(slot)
+            slot.clear()
+            for item in items:
+                self._place(item, self._ticks[item])
+
+    def upcoming(self, tick: int) -> List:
+        """Items keyed at or before tick, without removing them."""
+        found = []
+        for level in range(LEVELS):
+            shift = _BITS * level
+            base = (self.current >> (shift + _BITS)) << (shift + _BITS)
+            for index in range((self.current >> shift) & _MASK, _SLOTS):
+                if (base | (index << shift)) > tick:
+                    break
+                found.extend(item for item in self._slots[level][index] if self._ticks[item] <= tick)
+        return found
+
+
+class Job:
+    __slots__ = ("name", "callback", "interval_ms", "tolerance_ms", "group",
+                 "due", "remaining_ms", "runs")
+
+    def __init__(self, name: str, callback: Callable[[], None], interval_ms: Optional[int],
+                 tolerance_ms: int, group: Optional[str]):
+        self.name = name
+        self.callback = callback
+        self.interval_ms = interval_ms   # None = one-shot
+        self.tolerance_ms = tolerance_ms
+        self.group = group
+        self.due = 0.0                   # monotonic seconds
+        self.remaining_ms: Optional[float] = None   # set while paused
+        self.runs = 0
+
+    @property
+    def paused(self) -> bool:
+        return self.remaining_ms is not None
+
+
+class Scheduler:
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._epoch = clock()
+        self.wheel = TimerWheel(self._tick(self._epoch))
+        self.jobs: Dict[str, Job] = {}
+        self.on_change: Optional[Callable[[], None]] = None
+        self.wakeups = 0
+        self.runs = 0
+
+    def _tick(self, at: float) -> int:
+        return int((at - self._epoch) * 1000 / RESOLUTION_MS + _TICK_EPSILON)
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
+
+    def _arm(self, job: Job) -> None:
+        latest = job.due + job.tolerance_ms / 1000
+        self.wheel.insert(job, -(-int((latest - self._epoch) * 1000) // RESOLUTION_MS))
+
+    def add(self, name: str, callback: Callable[[], None], interval_ms: Optional[int] = None,
+            delay_ms: Optional[float] = None, tolerance_ms: int = 0,
+            group: Optional[str] = None) -> Job:
+        """Schedule callback every interval_ms (or once after delay_ms).
+
+        Re-adding a name replaces that job. The first run is after delay_ms,
+        or after one interval if no delay is given. tolerance_ms is capped
+        at interval_ms.
+        """
+        self.cancel(name, notify=False)
+        if interval_ms:
+            tolerance_ms = min(tolerance_ms, interval_ms)
+        job = Job(name, callback, interval_ms, tolerance_ms, group)
+        first = delay_ms if delay_ms is not None else interval_ms
+        job.due = self._clock() + (first or 0) / 1000
+        self.jobs[name] = job
+        self._arm(job)
+        self._changed()
+        return job
+
+    def cancel(self, name: str, notify: bool = True) -> None:
+        job = self.jobs.pop(name, None)
+        if job is not None:
+            self.wheel.remove(job)
+            if notify:
+                self._changed()
+
+    def cancel_group(self, group: str) -> None:
+        for name in [n for n, job in self.jobs.items() if job.group == group]:
+            self.cancel(name, notify=False)
+        self._changed()
+
+    def pause(self, group: str) -> None:
+        """Stop a group's jobs, remembering the time left on each."""
+        now = self._clock()
+        for job in self.jobs.values():
+            if job.group == group and not job.paused:
+                self.wheel.remove(job)
+                job.remaining_ms = max(0.0, (job.due - now) * 1000)
+        self._changed()
+
+    def resume(self, group: str) -> None:
+        now = self._clock()
+        for job in self.jobs.values():
+            if job.group == group and job.paused:
+                job.due = now + job.remaining_ms / 1000
+                job.remaining_ms = None
+                self._arm(job)
+        self._changed()
+
+    def next_wakeup_ms(self) -> Optional[float]:
+        """Milliseconds until the driver should call run_due(), or None."""
+        tick = self.wheel.next_expiry()
+        if tick is None:
+            return None
+        at = self._epoch + tick * RESOLUTION_MS / 1000
+        return max(0.0, (at - self._clock()) * 1000)
+
+    def run_due(self) -> List[str]:
+        """Run every job that is due now; returns the names that ran."""
+        now = self._clock()
+        tick = self._tick(now)
+        self.wakeups += 1
+        due = self.wheel.advance(tick)
+        # Coalesce: also run jobs already due whose tolerance is not used up.
+        due += [job for job in self.wheel.upcoming(tick + self._max_tolerance_ticks())
+                if job.due <= now]
+        ran = []
+        for job in sorted(due, key=lambda j: j.due):
+            if self.jobs.get(job.name) is not job:
+                continue   # cancelled or replaced by an earlier callback
+            self.wheel.remove(job)
+            if job.interval_ms:
+                job.due += job.interval_ms / 1000
+                if job.due <= now:
+                    # Fell behind (stall or suspend): skip the missed runs.
+                    job.due = now + job.interval_ms / 1000
+                self._arm(job)
+            else:
+                del self.jobs[job.name]
+            job.runs += 1
+            self.runs += 1
+            ran.append(job.name)
+            try:
+                job.callback()
+            except Exception:
+                logger.exception(f"Scheduled job {job.name} failed")
+        self._changed()
+        return ran
+
+    def _max_tolerance_ticks(self) -> int:
+        return max((job.tolerance_ms for job in self.jobs.values()), default=0) // RESOLUTION_MS + 1
+
+    def schedule(self) -> List[Dict]:
+        """Upcoming runs, soonest first (paused jobs last)."""
+        now = self._clock()
+        rows = [{
+            "name": job.name,
+            "group": job.group,
+            "dueInMs": round(job.remaining_ms if job.paused else (job.due - now) * 1000),
+            "intervalMs": job.interval_ms,
+            "toleranceMs": job.tolerance_ms,
+            "paused": job.paused,
+            "runs": job.runs,
+        } for job in self.jobs.values()]
+        return sorted(rows, key=lambda row: (row["paused"], row["dueInMs"]))
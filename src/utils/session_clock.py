@@ -0,0 +1,88 @@
+"""
+session_clock.py
+
+Elapsed time for a focus session.
+
+Elapsed time is derived from a monotonic clock anchored at session start, so
+timer jitter and event-loop stalls never accumulate as drift. Where the OS
+has a monotonic clock that keeps counting through suspend (CLOCK_BOOTTIME on
+Linux) it is used directly. Otherwise each reading is reconciled against the
+wall clock: when the wall clock moved at least SUSPEND_GAP_SECONDS further
+than the monotonic clock since the previous reading, the difference is taken
+as time spent suspended and added back (and kept in suspended_seconds).
+"""
+
+from __future__ import annotations
+import time
+from typing import Callable, Optional
+
+# Smaller wall/monotonic disagreements are clock slewing, not suspend.
+SUSPEND_GAP_SECONDS = 2.0
+
+
+def _suspend_aware_clock() -> Optional[Callable[[], float]]:
+    boottime = getattr(time, "CLOCK_BOOTTIME", None)
+    if boottime is None:
+        return None
+    try:
+        time.clock_gettime(boottime)
+    except OSError:
+        return None
+    return lambda: time.clock_gettime(boottime)
+
+
+class SessionClock:
+    def __init__(self, monotonic: Optional[Callable[[], float]] = None,
+                 wall: Callable[[], float] = time.time):
+        boottime = _suspend_aware_clock() if monotonic is None else None
+        self._monotonic = monotonic or boottime or time.monotonic
+        # With a suspend-aware clock there is nothing to reconcile.
+        self._reconcile = boottime is None
+        self._wall = wall
+        self._started: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+        self._last = (0.0, 0.0)
+        self.suspended_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._started is not None and self._stopped_at is None
+
+    def start(self, elapsed: float = 0.0) -> None:
+        """Start counting, optionally from elapsed seconds already done."""
+        now = self._monotonic()
+        self._started = now - elapsed
+        self._stopped_at = None
+        self._last = (now, self._wall())
+        self.suspended_seconds = 0.0
+
+    def stop(self) -> None:
+        if self.running:
+            self._check_suspend()
+            self._stopped_at = self._monotonic()
+
+    def _check_suspend(self) -> None:
+        if not self._reconcile:
+            return
+        now, wall = self._monotonic(), self._wall()
+        last_mono, last_wall = self._last
+        gap = (wall - last_wall) - (now - last_mono)
+        if gap >= SUSPEND_GAP_SECONDS:
+            self.suspended_seconds += gap
+        self._last = (now, wall)
+
+    def elapsed(self) -> float:
+        """Seconds since start(), including time the machine was suspended."""
+        if self._started is None:
+            return 0.0
+        if self._stopped_at is not None:
+            return self._stopped_at - self._started + self.suspended_seconds
+        self._check_suspend()
+        return self._monotonic() - self._started + self.suspended_seconds
+
+    def seconds(self) -> int:
+        return int(self.elapsed())
+
+    def ms_to_next_second(self) -> int:
+        """Delay that lands the next tick just past a whole elapsed second."""
+        return 1000 - int(self.elapsed() * 1000) % 1000
@@ -0,0 +1,46 @@
+"""
+startup.py
+
+Startup phase timing.
+
+main() and MainWindow wrap each startup phase (imports, config, window
+imports, state load, window build, watcher start) in StartupTimer.phase().
+The timings are written to the startup log in one line once the main window
+is shown.
+"""
+
+from __future__ import annotations
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("zenflow.startup")
+
+
+class StartupTimer:
+    def __init__(self, started_at: Optional[float] = None):
+        # perf_counter() value taken as early as possible in the process
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name: str, ms: float) -> None:
+        self.phases.append((name, ms))
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def summary(self) -> str:
+        parts = ", ".join(f"{name} {ms:.1f} ms" for name, ms in self.phases)
+        return f"ready after {self.elapsed_ms():.1f} ms ({parts})"
+
+    def log(self) -> None:
+        logger.info(f"Startup {self.summary()}")
@@ -0,0 +1,76 @@
+"""
+store.py
+
+Loading and saving of the ZenFlow state file (zenflow_data.json).
+
+Kept free of Qt imports so maintenance commands (for example the rollup
+repair in src.utils.rollups) and the core daemon (src/core) can read and
+write the state without a GUI.
+
+Files live next to the package unless ZENFLOW_DATA_DIR names another
+directory. The UI passes its directory on to the daemon it starts this way.
+"""
+
+import os
+import json
+
+DATA_DIR = os.environ.get("ZENFLOW_DATA_DIR") or os.path.dirname(os.path.dirname(__file__))
+DATA_FILE = os.path.join(DATA_DIR, "zenflow_data.json")
+# Append-only log of distraction events, written in batches (see distraction_log.py)
+EVENTS_FILE = os.path.join(os.path.dirname(DATA_FILE), "zenflow_events.jsonl")
+# Installed applications found by app discovery, keyed by directory mtime
+APPS_CACHE_FILE = os.path.join(os.path.dirname(DATA_FILE), "zenflow_apps.json")
+# Rendered app icons and logo, one PNG per size and device pixel ratio (see src/icons.py)
+ICON_CACHE_DIR = os.path.join(os.path.dirname(DATA_FILE), "icon_cache")
+# Shared secret the UI proves to the core daemon (see src/core/protocol.py)
+DAEMON_KEY_FILE = os.path.join(os.path.dirname(DATA_FILE), "zenflow_daemon.key")
+DAEMON_LOG_FILE = os.path.join(os.path.dirname(DATA_FILE), "zenflow_daemon.log")
+
+
+def default_state():
+    return {
+        "selectedCategories": [],
+        "sessionRules": {},
+        "activeSessionData": {},
+        "sessionHistory": [],
+        "userPreferences": {
+            "defaultSessionMinutes": 50,
+            "postureTips": True,
+            "eyeStrainReminders": True,
+            "presets": {},
+        },
+    }
+
+
+def load_state():
+    if not os.path.exists(DATA_FILE):
+        return default_state()
+    try:
+        with open(DATA_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default_state()
+
+
+def save_state(state):
+    # Written to a temporary file and renamed over the old one, so a reader
+    # in another process (UI or daemon) never sees a half-written file.
+    tmp = f"{DATA_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, DATA_FILE)
+
+
+def history_version(state):
+    """Counter bumped whenever sessionHistory changes; used as a cache key."""
+    return state.get("historyVersion", 0)
+
+
+def bump_history_version(state):
+    state["historyVersion"] = history_version(state) + 1
+    return state["historyVersion"]
+
+
+def history_page(state, offset, limit):
+    """Sessions [offset, offset + limit) of sessionHistory, newest first."""
+    return state.get("sessionHistory", [])[offset:offset + limit]
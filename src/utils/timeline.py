@@ -0,0 +1,143 @@
+"""
+timeline.py
+
+Per-app / per-domain focus timeline for a session.
+
+Foreground samples arrive every poll tick, but only transitions are stored:
+consecutive samples with the same (app, domain) extend the open segment, so
+a stable foreground costs no memory per tick. Closed segments live in
+array-backed columns (start, end, app id, domain id) and per-id totals are
+kept as an index, so "time per app/domain" queries never rescan segments.
+"""
+
+from __future__ import annotations
+import time
+from array import array
+from typing import Dict, List, Optional
+
+NO_DOMAIN = -1
+
+
+class _Interner:
+    def __init__(self, names: Optional[List[str]] = None):
+        self.names: List[str] = list(names or [])
+        self._ids = {name: i for i, name in enumerate(self.names)}
+
+    def id(self, name: str) -> int:
+        ident = self._ids.get(name)
+        if ident is None:
+            ident = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return ident
+
+
+class FocusTimeline:
+    """Run-length-encoded foreground segments with per-app/domain totals."""
+
+    def __init__(self):
+        self.apps = _Interner()
+        self.domains = _Interner()
+        self.starts = array("d")
+        self.ends = array("d")
+        self.app_ids = array("i")
+        self.domain_ids = array("i")
+        self._app_seconds: Dict[int, float] = {}
+        self._domain_seconds: Dict[int, float] = {}
+        # Open segment: (start, app id, domain id)
+        self._open = None
+        self._wall_anchor = time.time() - time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.starts) + (1 if self._open else 0)
+
+    def observe(self, app: Optional[str], domain: Optional[str] = None,
+                now: Optional[float] = None) -> bool:
+        """Record the current foreground. Returns True if a new segment started."""
+        now = time.monotonic() if now is None else now
+        if not app:
+            self.close(now)
+            return False
+        app_id = self.apps.id(app)
+        domain_id = self.domains.id(domain) if domain else NO_DOMAIN
+        if self._open is not None and self._open[1] == app_id and self._open[2] == domain_id:
+            return False
+        self.close(now)
+        self._open = (now, app_id, domain_id)
+        return True
+
+    def close(self, now: Optional[float] = None) -> None:
+        """Close the open segment (e.g. when the session ends or the screen locks)."""
+        if self._open is None:
+            return
+        now = time.monotonic() if now is None else now
+        start, app_id, domain_id = self._open
+        self._open = None
+        if now <= start:
+            return
+        self.starts.append(start)
+        self.ends.append(now)
+        self.app_ids.append(app_id)
+        self.domain_ids.append(domain_id)
+        duration = now - start
+        self._app_seconds[app_id] = self._app_seconds.get(app_id, 0.0) + duration
+        if domain_id != NO_DOMAIN:
+            self._domain_seconds[domain_id] = self._domain_seconds.get(domain_id, 0.0) + duration
+
+    def current(self):
+        """(app, domain, seconds so far) of the open segment, or None."""
+        if self._open is None:
+            return None
+        start, app_id, domain_id = self._open
+        domain = self.domains.names[domain_id] if domain_id != NO_DOMAIN else None
+        return self.apps.names[app_id], domain, time.monotonic() - start
+
+    def _totals(self, index, names, open_id, now):
+        totals = {names[i]: secs for i, secs in index.items()}
+        if self._open is not None and open_id != NO_DOMAIN:
+            name = names[open_id]
+            totals[name] = totals.get(name, 0.0) + max(0.0, now - self._open[0])
+        return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+    def time_per_app(self, now: Optional[float] = None) -> Dict[str, float]:
+        now = time.monotonic() if now is None else now
+        open_id = self._open[1] if self._open else NO_DOMAIN
+        return self._totals(self._app_seconds, self.apps.names, open_id, now)
+
+    def time_per_domain(self, now: Optional[float] = None) -> Dict[str, float]:
+        now = time.monotonic() if now is None else now
+        open_id = self._open[2] if self._open else NO_DOMAIN
+        return self._totals(self._domain_seconds, self.domains.names, open_id, now)
+
+    def to_dict(self, now: Optional[float] = None) -> Dict:
+        """Compact form stored on the session history entry.
+
+        With now, the open segment is included as if it ended then (it stays
+        open here).
+        """
+        segments = list(zip(self.starts, self.ends, self.app_ids, self.domain_ids))
+        if now is not None and self._open is not None and now > self._open[0]:
+            start, app_id, domain_id = self._open
+            segments.append((start, now, app_id, domain_id))
+        t0 = segments[0][0] if segments else 0.0
+        return {
+            "t0": round(self._wall_anchor + t0, 3),
+            "apps": list(self.apps.names),
+            "domains": list(self.domains.names),
+            "segments": [[round(s - t0, 2), round(e - t0, 2), a, d] for s, e, a, d in segments],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FocusTimeline":
+        """Rebuild a timeline saved by to_dict(), possibly in another process.
+
+        Segments are moved onto this process's monotonic clock, so the
+        timeline can go on recording and to_dict() keeps the wall times.
+        """
+        timeline = cls()
+        timeline.apps = _Interner(data.get("apps", []))
+        timeline.domains = _Interner(data.get("domains", []))
+        offset = data.get("t0", timeline._wall_anchor) - timeline._wall_anchor
+        for start, end, app_id, domain_id in data.get("segments", []):
+            timeline._open = (start + offset, app_id, domain_id)
+            timeline.close(end + offset)
+        return timeline
@@ -0,0 +1,132 @@
+"""
+transitions.py
+
+Flap suppression for the blocked overlay.
+
+Each watcher (desktop poll, browser tab events) reports its current verdict
+per source; the controller turns the combined verdict into at most one
+overlay state change and one distraction per real block:
+
+- show dwell: a block must persist this long before the overlay appears
+- hide hysteresis: the overlay stays up until the block has been clear this long
+- coalesce window: re-blocking the same app within this window is a flap,
+  not a new distraction
+
+Suppressed flips are counted in suppressed_flaps.
+"""
+
+from __future__ import annotations
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+DEFAULT_SHOW_DWELL_MS = 0
+DEFAULT_HIDE_HYSTERESIS_MS = 1000
+DEFAULT_COALESCE_MS = 10000
+
+
+class Transition(NamedTuple):
+    action: str                 # "show" or "hide"
+    name: Optional[str] = None  # app/site shown on the overlay
+    source: Optional[str] = None
+    new_distraction: bool = False
+
+
+class OverlayTransitionController:
+    def __init__(self, show_dwell_ms: int = DEFAULT_SHOW_DWELL_MS,
+                 hide_hysteresis_ms: int = DEFAULT_HIDE_HYSTERESIS_MS,
+                 coalesce_ms: int = DEFAULT_COALESCE_MS):
+        self.configure(show_dwell_ms, hide_hysteresis_ms, coalesce_ms)
+        # source -> (name, verdict label) while that source reports a block
+        self._verdicts: Dict[str, Tuple[str, str]] = {}
+        self._latest_source: Optional[str] = None
+        self.visible = False
+        self.shown_name: Optional[str] = None
+        self._blocked_since: Optional[float] = None
+        self._clear_since: Optional[float] = None
+        self._last_distraction: Dict[str, float] = {}
+        self.suppressed_flaps = 0
+        self.distractions = 0
+
+    def configure(self, show_dwell_ms: int, hide_hysteresis_ms: int, coalesce_ms: int) -> None:
+        self.show_dwell = max(0, show_dwell_ms) / 1000.0
+        self.hide_hysteresis = max(0, hide_hysteresis_ms) / 1000.0
+        self.coalesce = max(0, coalesce_ms) / 1000.0
+
+    def reset_counters(self) -> None:
+        self.suppressed_flaps = 0
+        self.distractions = 0
+        self._last_distraction.clear()
+
+    def update(self, source: str, blocked_name: Optional[str], label: Optional[str] = None,
+               now: Optional[float] = None) -> Optional[Transition]:
+        """Report one source's verdict (None = not blocked) and evaluate."""
+        if blocked_name:
+            if self._verdicts.get(source, (None,))[0] != blocked_name:
+                self._latest_source = source
+            self._verdicts[source] = (blocked_name, label or source)
+        else:
+            self._verdicts.pop(source, None)
+        return self.evaluate(now)
+
+    def _current_block(self):
+        if not self._verdicts:
+            return None
+        source = self._latest_source if self._latest_source in self._verdicts else next(iter(self._verdicts))
+        return self._verdicts[source]
+
+    def evaluate(self, now: Optional[float] = None) -> Optional[Transition]:
+        """Apply dwell/hysteresis timing; call periodically even without new verdicts."""
+        now = time.monotonic() if now is None else now
+        block = self._current_block()
+
+        if block is not None:
+            name, label = block
+            if self._clear_since is not None:
+                # Came back before the hysteresis window elapsed: overlay stayed up.
+                self.suppressed_flaps += 1
+                self._clear_since = None
+            if self.visible:
+                if name == self.shown_name:
+                    return None
+                self.shown_name = name
+                return Transition("show", name, label, self._count(name, now))
+            if self._blocked_since is None:
+                self._blocked_since = now
+            if now - self._blocked_since < self.show_dwell:
+                return None
+            self._blocked_since = None
+            self.visible = True
+            self.shown_name = name
+            return Transition("show", name, label, self._count(name, now))
+
+        if self._blocked_since is not None:
+            # Cleared before the show dwell elapsed: never shown.
+            self.suppressed_flaps += 1
+            self._blocked_since = None
+        if not self.visible:
+            return None
+        if self._clear_since is None:
+            self._clear_since = now
+        if now - self._clear_since < self.hide_hysteresis:
+            return None
+        self._clear_since = None
+        self.visible = False
+        self.shown_name = None
+        return Transition("hide")
+
+    def _count(self, name: str, now: float) -> bool:
+        last = self._last_distraction.get(name)
+        self._last_distraction[name] = now
+        if last is not None and now - last < self.coalesce:
+            self.suppressed_flaps += 1
+            return False
+        self.distractions += 1
+        return True
+
+    def dismissed(self) -> None:
+        """The overlay was closed by the user; forget current verdicts."""
+        self._verdicts.clear()
+        self.visible = False
+        self.shown_name = None
+        self._blocked_since = None
+        self._clear_since = None
@@ -7,17 +7,19 @@ Each message is expected to be JSON: {"url": "...", "title": "..."}.
 Events are pushed into a Queue for the main thread to handle:
     {"type": "web_foreground", "url": "...", "title": "..."}
 
-Requires: pip install websockets
+Requires: pip install websockets. asyncio and websockets are imported on the
+watcher thread when it starts, so importing this module is cheap and the app
+still starts (without browser tab tracking) if websockets is missing.
 """
 
 from __future__ import annotations
-import asyncio
 import json
+import logging
 import threading
 from queue import Queue
 from typing import Dict, Any
 
-import websockets
+logger = logging.getLogger(__name__)
 
 
 class WebWatcher:
@@ -41,9 +43,18 @@ class WebWatcher:
         self._stop_flag = True
 
     def _run_loop(self) -> None:
+        try:
+            import websockets  # noqa: F401 (used by _async_main)
+        except ImportError as e:
+            logger.warning(f"Browser tab tracking disabled: {e}")
+            return
+        import asyncio
         asyncio.run(self._async_main())
 
     async def _async_main(self) -> None:
+        import asyncio
+        import websockets
+
         async def handler(websocket):
             async for message in websocket:
                 try:
@@ -0,0 +1,16 @@
+"""Keep the tests off the real data files and display."""
+
+import os
+import tempfile
+
+import pytest
+
+# Read by src.utils.store at import time
+os.environ["ZENFLOW_DATA_DIR"] = tempfile.mkdtemp(prefix="zenflow-tests-")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,45 @@
+"""Stand-ins shared by the tests."""
+
+from src.utils.processes import ProcessInfo
+
+
+class FakeSource:
+    """pid -> (name, identity); identity stands in for start time (and comm)."""
+
+    name = "fake"
+
+    def __init__(self, procs=None):
+        self.procs = dict(procs or {})
+
+    def pids(self):
+        return set(self.procs)
+
+    def identities(self, pids):
+        return {pid: self.procs[pid][1] for pid in pids if pid in self.procs}
+
+    def describe(self, pid):
+        if pid not in self.procs:
+            return None
+        name, started = self.procs[pid]
+        return ProcessInfo(pid, name, f"/apps/{name}", started)
+
+    def describe_all(self, pids):
+        return [info for info in map(self.describe, pids) if info is not None]
+
+
+class Foreground:
+    """Foreground backend that always reports the same window."""
+
+    def __init__(self, window):
+        self.window = window
+
+    def foreground(self):
+        return self.window
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
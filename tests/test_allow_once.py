@@ -0,0 +1,47 @@
+"""Allow Once lifts what the daemon blocked, not the overlay's display name."""
+
+from src.core.daemon import FocusDaemon
+from src.utils.foreground import ForegroundWindow
+
+from tests.fakes import Foreground
+
+
+def make_daemon(window, rules):
+    daemon = FocusDaemon(None, idle_exit_ms=None)
+    daemon.state["sessionRules"] = rules
+    daemon.state["activeSessionData"] = {"startTime": "test"}
+    daemon.overlay_transitions.configure(0, 0, 0)
+    daemon._apply_state()
+    daemon.foreground_backend = Foreground(window)
+    sent = []
+    daemon._broadcast = sent.append
+    return daemon, sent
+
+
+def last_overlay(sent):
+    return [message for message in sent if message["event"] == "overlay"][-1]
+
+
+def test_budget_block_is_allowed_by_budget_key():
+    daemon, sent = make_daemon(ForegroundWindow("discord.exe", "general", 4242),
+                               {"allowedApps": [], "blockedApps": [], "budgets": {"discord": 0}})
+    daemon._check_active_window()
+    overlay = last_overlay(sent)
+    assert overlay["name"] == "Discord (daily limit reached)"
+    assert overlay["target"] == {"budget": "discord"}
+
+    daemon._op_allow_budget(None, {"key": "discord"})
+    daemon._check_active_window()
+    assert last_overlay(sent)["action"] == "hide"
+
+
+def test_app_block_is_allowed_by_exe():
+    daemon, sent = make_daemon(ForegroundWindow("steam.exe", "library", 4243),
+                               {"allowedApps": [], "blockedApps": ["steam"]})
+    daemon._check_active_window()
+    overlay = last_overlay(sent)
+    assert (overlay["name"], overlay["target"]) == ("Steam", {"exe": "steam.exe"})
+
+    daemon._op_allow_exe(None, {"name": "steam.exe"})
+    daemon._check_active_window()
+    assert last_overlay(sent)["action"] == "hide"
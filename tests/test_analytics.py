@@ -0,0 +1,58 @@
+"""Session analytics: values that depend on today, and many categories."""
+
+import time
+from datetime import datetime
+
+from src.utils import analytics
+from src.utils.analytics import CATEGORIES, SessionAnalytics
+
+DAY = 86400
+
+
+def sessions_on(days_ago, now, categories=("Coding",)):
+    return [{"elapsedSeconds": 600, "endedAtEpoch": now - DAY * k,
+             "selectedCategories": list(categories)} for k in days_ago]
+
+
+def test_current_streak_lapses_when_the_day_changes(monkeypatch):
+    now = time.time()
+    clock = {"now": now}
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(clock["now"], tz)
+
+    monkeypatch.setattr(analytics, "datetime", Clock)
+    stats = SessionAnalytics(sessions_on(range(3), now))
+    assert stats.streaks() == {"current": 3, "best": 3}
+    # Same history, two days later: the cached value must not be reused
+    clock["now"] = now + 2 * DAY
+    assert stats.streaks() == {"current": 0, "best": 3}
+    assert stats.streaks(today=now) == {"current": 3, "best": 3}
+
+
+def test_sixty_four_categories_fit_the_bitmask():
+    extra = [f"tag{i}" for i in range(64 - len(CATEGORIES))]
+    stats = SessionAnalytics(sessions_on([0], time.time(), extra))
+    assert stats.category_masks.dtype.kind == "u"
+    assert stats.category_share()[extra[-1]] == 1 / len(extra)
+
+
+def test_more_categories_than_mask_bits():
+    now = time.time()
+    history = [{"elapsedSeconds": 60, "endedAtEpoch": now - i,
+                "selectedCategories": [f"tag{i}", "Coding"]} for i in range(70)]
+    stats = SessionAnalytics(history)
+    assert len(stats.categories) > 64
+    share = stats.category_share()
+    assert abs(share["Coding"] - 0.5) < 1e-9
+    assert abs(share["tag69"] - 0.5 / 70) < 1e-9
+    assert abs(sum(share.values()) - 1.0) < 1e-9
+    assert stats.category_matrix().shape == (70, len(stats.categories))
+
+
+def test_empty_history():
+    stats = SessionAnalytics([])
+    assert stats.category_share() == {}
+    assert stats.streaks() == {"current": 0, "best": 0}
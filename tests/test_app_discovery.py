@@ -0,0 +1,51 @@
+"""App discovery rescans a directory when anything in it changed."""
+
+import os
+
+import pytest
+
+from src.utils.app_discovery import discover
+
+
+def write_entry(path, name, mtime):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"[Desktop Entry]\nType=Application\nName={name}\nExec=/usr/bin/{name.lower()} %U\n")
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def apps_dir(tmp_path, monkeypatch):
+    home = tmp_path / "share"
+    (home / "applications").mkdir(parents=True)
+    monkeypatch.setenv("XDG_DATA_HOME", str(home))
+    monkeypatch.setenv("XDG_DATA_DIRS", str(tmp_path / "none"))
+    return home / "applications"
+
+
+def names(apps):
+    return [app.name for app in apps]
+
+
+def test_unchanged_directory_comes_from_the_cache(apps_dir, tmp_path):
+    cache = str(tmp_path / "apps.json")
+    write_entry(apps_dir / "editor.desktop", "Editor", 10**18)
+    apps, stats = discover(cache, platform="linux")
+    assert names(apps) == ["Editor"]
+    assert stats == {"scanned": 1, "cached": 0}
+    apps, stats = discover(cache, platform="linux")
+    assert names(apps) == ["Editor"]
+    assert stats == {"scanned": 0, "cached": 1}
+
+
+def test_file_edited_in_place_is_read_again(apps_dir, tmp_path):
+    cache = str(tmp_path / "apps.json")
+    entry = apps_dir / "editor.desktop"
+    write_entry(entry, "Editor", 10**18)
+    discover(cache, platform="linux")
+    dir_mtime = os.stat(apps_dir).st_mtime_ns
+
+    write_entry(entry, "Better Editor", dir_mtime + 10**9)
+    assert os.stat(apps_dir).st_mtime_ns == dir_mtime   # the directory did not change
+    apps, stats = discover(cache, platform="linux")
+    assert names(apps) == ["Better Editor"]
+    assert stats["scanned"] == 1
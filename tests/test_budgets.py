@@ -0,0 +1,123 @@
+"""Daily budgets: a wrong counter blocks an app for the rest of the day."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from src.utils import budgets
+from src.utils.budgets import STATE_KEY, UsageBudgets
+
+
+class FakeTime:
+    """Stands in for the time module: monotonic and wall clocks move together."""
+
+    def __init__(self, wall):
+        self.mono = 1000.0
+        self.wall = wall
+
+    def monotonic(self):
+        return self.mono
+
+    def time(self):
+        return self.wall
+
+    def advance(self, seconds):
+        self.mono += seconds
+        self.wall += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime(datetime(2026, 3, 14, 12, 0).timestamp())
+    monkeypatch.setattr(budgets, "time", clock)
+    return clock
+
+
+def make(clock, **minutes):
+    return UsageBudgets({"userPreferences": {"budgets": minutes}})
+
+
+def test_usage_accumulates_on_transitions(clock):
+    usage = make(clock, youtube=15, reddit=5)
+    usage.observe("youtube")
+    clock.advance(60)
+    usage.observe("youtube")    # same identity: nothing accounted yet
+    assert usage.usage["seconds"] == {}
+    assert usage.used("youtube") == 60
+
+    usage.observe("reddit")
+    clock.advance(30)
+    usage.observe(None)
+    clock.advance(500)           # time outside any budget is not counted
+    usage.observe("youtube")
+    clock.advance(40)
+    usage.observe(None)
+    assert usage.usage["seconds"] == {"youtube": 100.0, "reddit": 30.0}
+    assert usage.remaining("reddit") == 5 * 60 - 30
+    assert usage.remaining("unknown") == float("inf")
+
+
+def test_exhausted_at_the_limit(clock):
+    usage = make(clock, youtube=1)
+    usage.observe("youtube")
+    clock.advance(59.9)
+    assert not usage.exhausted("youtube")
+    clock.advance(0.1)
+    assert usage.exhausted("youtube")
+    assert not usage.exhausted(None)
+    assert not usage.exhausted("reddit")
+
+
+def test_counters_reset_at_midnight(clock):
+    clock.wall = datetime(2026, 3, 14, 23, 58).timestamp()
+    usage = make(clock, youtube=1)
+    usage.observe("youtube")
+    clock.advance(90)
+    usage.observe(None)
+    assert usage.exhausted("youtube")
+
+    usage.observe("youtube")
+    clock.advance(60)            # 00:00:30
+    usage.observe("youtube")
+    assert usage.usage["seconds"] == {}
+    # The new day counts from the first poll after midnight; nothing from
+    # yesterday carries over
+    assert usage.used("youtube") == 0
+    clock.advance(30)
+    assert usage.used("youtube") == 30
+    assert not usage.exhausted("youtube")
+
+
+def test_checkpoint_survives_a_restart(clock):
+    state = {"userPreferences": {"budgets": {"youtube": 15}}}
+    usage = UsageBudgets(state)
+    usage.observe("youtube")
+    clock.advance(120)
+    usage.checkpoint()
+    assert usage.usage["seconds"] == {"youtube": 120.0}
+    assert usage.used("youtube") == 120      # the open segment restarted, not doubled
+
+    saved = json.loads(json.dumps(state))
+    restored = UsageBudgets(saved)
+    assert restored.used("youtube") == 120
+    restored.observe("youtube")
+    clock.advance(60)
+    restored.observe(None)
+    assert restored.usage["seconds"] == {"youtube": 180.0}
+
+
+def test_a_checkpoint_from_another_day_is_dropped(clock):
+    state = {STATE_KEY: {"day": "2000-01-01", "seconds": {"youtube": 900.0}},
+             "userPreferences": {"budgets": {"youtube": 15}}}
+    usage = UsageBudgets(state)
+    assert usage.used("youtube") == 0
+    assert state[STATE_KEY]["seconds"] == {}
+
+
+def test_session_limits_win_and_bad_values_are_skipped(clock):
+    usage = UsageBudgets({"userPreferences": {"budgets": {"YouTube": 30, "reddit": "lots"}},
+                          "sessionRules": {"budgets": {"youtube": 10}}})
+    assert usage.limits == {"youtube": 600.0}
+    assert usage.match("chrome.exe", "www.youtube.com") == "youtube"
+    assert usage.match("steam.exe") is None
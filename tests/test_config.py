@@ -0,0 +1,194 @@
+"""AppConfig: batches, change notification and typed settings."""
+
+import json
+import os
+
+import pytest
+
+from src.utils.config import AppConfig, changed_keys
+
+
+@pytest.fixture
+def config(tmp_path):
+    return AppConfig(str(tmp_path / "config.json"))
+
+
+def saved(config):
+    with open(config.config_file) as f:
+        return json.load(f)
+
+
+def listen(config, prefix=""):
+    calls = []
+    config.subscribe(calls.append, prefix)
+    return calls
+
+
+# -- changed_keys ------------------------------------------------------------
+
+def test_changed_keys_reports_leaf_paths():
+    old = {"a": {"b": 1, "c": 2}, "d": 3}
+    new = {"a": {"b": 1, "c": 5, "e": 6}, "f": 7}
+    assert changed_keys(old, new) == {"a.c", "a.e", "d", "f"}
+
+
+def test_changed_keys_dict_replaced_by_value():
+    assert changed_keys({"a": {"b": 1}}, {"a": 2}) == {"a"}
+    assert changed_keys({"a": [1]}, {"a": [1]}) == set()
+
+
+# -- set / batch -------------------------------------------------------------
+
+def test_set_saves_and_notifies_once(config):
+    calls = listen(config, "settings")
+    config.set("settings.theme", "dark")
+    assert saved(config)["settings"]["theme"] == "dark"
+    assert calls == [frozenset({"settings.theme"})]
+
+
+def test_setting_the_same_value_does_nothing(config):
+    calls = listen(config)
+    mtime = os.stat(config.config_file).st_mtime_ns
+    config.set("settings.theme", config.get("settings.theme"))
+    assert calls == []
+    assert os.stat(config.config_file).st_mtime_ns == mtime
+
+
+def test_batch_saves_once_with_every_changed_key(config, monkeypatch):
+    saves = []
+    real_save = config.save
+    monkeypatch.setattr(config, "save", lambda: saves.append(1) or real_save())
+    calls = listen(config)
+    with config.batch():
+        config.set("settings.theme", "dark")
+        config.set("settings.notifications", False)
+        # Reads inside the batch see the new values
+        assert config.get("settings.theme") == "dark"
+    assert saves == [1]
+    assert calls == [frozenset({"settings.theme", "settings.notifications"})]
+
+
+def test_nested_batches_join_the_outer_one(config):
+    calls = listen(config)
+    with config.batch():
+        with config.batch():
+            config.set("settings.theme", "dark")
+        assert calls == []
+        assert saved(config)["settings"]["theme"] == "light"
+        config.set("settings.auto_start", True)
+    assert calls == [frozenset({"settings.theme", "settings.auto_start"})]
+
+
+def test_exception_rolls_the_batch_back(config):
+    calls = listen(config)
+    before = saved(config)
+    with pytest.raises(RuntimeError):
+        with config.batch():
+            config.set("settings.theme", "dark")
+            with config.batch():
+                config.set("settings.auto_start", True)
+            raise RuntimeError("boom")
+    assert config.get("settings.theme") == "light"
+    assert config.get("settings.auto_start") is False
+    assert saved(config) == before
+    assert calls == []
+
+
+def test_failed_save_rolls_back_and_notifies_nobody(config, monkeypatch):
+    calls = listen(config)
+    before = saved(config)
+    setting = config.setting("settings.theme", "light", str)
+    assert setting.value == "light"
+
+    def fail(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail)
+    with config.batch():
+        config.set("settings.theme", "dark")
+        config.set("settings.auto_start", True)
+
+    assert calls == []
+    assert config.get("settings.theme") == "light"
+    assert setting.value == "light"
+    assert saved(config) == before
+    assert not os.path.exists(config.config_file + ".tmp")
+
+
+def test_unserializable_value_is_not_kept(config):
+    calls = listen(config)
+    config.set("settings.theme", object())
+    assert config.get("settings.theme") == "light"
+    assert saved(config)["settings"]["theme"] == "light"
+    assert calls == []
+    assert not os.path.exists(config.config_file + ".tmp")
+
+
+# -- subscribe ---------------------------------------------------------------
+
+def test_listeners_only_hear_keys_under_their_prefix(config):
+    theme = listen(config, "settings.theme")
+    prefs = listen(config, "user_preferences")
+    config.set("settings.theme", "dark")
+    config.set("settings.auto_start", True)
+    assert theme == [frozenset({"settings.theme"})]
+    assert prefs == []
+
+
+def test_replacing_a_parent_reaches_listeners_below_it(config):
+    theme = listen(config, "settings.theme")
+    config.set("settings", {"theme": "dark"})
+    assert theme and "settings.theme" in theme[0]
+
+
+def test_unsubscribe_and_failing_listener(config):
+    def broken(keys):
+        raise ValueError("listener bug")
+    config.subscribe(broken)
+    calls = []
+    unsubscribe = config.subscribe(calls.append)
+    config.set("settings.theme", "dark")   # the broken listener does not stop the others
+    unsubscribe()
+    config.set("settings.theme", "light")
+    assert calls == [frozenset({"settings.theme"})]
+
+
+def test_apply_reports_only_differences_and_restores_defaults(config):
+    config.set("settings.theme", "dark")
+    calls = listen(config)
+    changed = config.apply({"settings": {"auto_start": True}})
+    # theme was dropped from the file: back to its default
+    assert changed == {"settings.theme", "settings.auto_start"}
+    assert config.get("settings.theme") == "light"
+    assert calls == [frozenset(changed)]
+    assert config.apply({"settings": {"auto_start": True}}) == set()
+
+
+# -- Setting -----------------------------------------------------------------
+
+@pytest.mark.parametrize("raw, kind, expected", [
+    ("true", bool, True),
+    (" Off ", bool, False),
+    (0, bool, False),
+    ("maybe", bool, "default"),
+    ("12", int, 12),
+    (3.7, int, 3),
+    (True, int, "default"),     # a bool is not a number here
+    ("1.5", float, 1.5),
+    ("fast", float, "default"),
+    (5, str, "5"),
+    ([1], str, "default"),
+    (None, int, "default"),
+    ({"a": 1}, dict, {"a": 1}),
+])
+def test_setting_converts_or_falls_back(config, raw, kind, expected):
+    config.set("settings.value", raw)
+    assert config.setting("settings.value", "default", kind).value == expected
+
+
+def test_setting_missing_key_and_refresh(config):
+    splash = config.setting("settings.splash_ms", 500, int)
+    assert splash.value == 500
+    config.set("settings.splash_ms", "250")
+    assert splash.value == 250
+    config.set("settings", {})
+    assert splash.value == 500
@@ -0,0 +1,57 @@
+"""A session the daemon kept running keeps its breakdown and timeline when
+the window is opened again."""
+
+import json
+import time
+
+from src.screens.focus_dashboard_screen import FocusDashboardScreen
+from src.utils.timeline import FocusTimeline
+
+
+def new_state():
+    return {
+        "sessionRules": {"allowedApps": [], "blockedApps": ["steam"]},
+        "activeSessionData": {"startTime": time.ctime(), "startEpoch": time.time() - 120,
+                              "distractionAttempts": 0},
+    }
+
+
+def test_reopened_window_restores_breakdown_and_timeline(qapp):
+    state = new_state()
+    first = FocusDashboardScreen(None, state)
+    first.start_session()
+    first.timeline.observe("code.exe", now=time.monotonic() - 60)
+    first.timeline.observe("chrome.exe", "docs.python.org", now=time.monotonic() - 30)
+    first.record_distraction("Steam", "desktop")
+    first.record_distraction("Steam", "desktop")
+    first.record_distraction("reddit.com", "web")
+    first.flush_distractions()
+    first.checkpoint_session()
+    first.detach_session()
+
+    # The state goes through the store as JSON before the next window reads it
+    state = json.loads(json.dumps(state))
+    second = FocusDashboardScreen(None, state)
+    second.start_session()
+    second.record_distraction("Steam", "launch")
+
+    assert second.distraction_count == 4
+    assert second.distraction_log.breakdown() == {"Steam": 3, "reddit.com": 1}
+    per_app = second.timeline.time_per_app()
+    assert per_app["code.exe"] >= 29
+    assert per_app["chrome.exe"] >= 29
+    second.detach_session()
+
+
+def test_timeline_round_trip_keeps_wall_times():
+    timeline = FocusTimeline()
+    now = time.monotonic()
+    timeline.observe("a", now=now - 10)
+    timeline.observe("b", now=now - 4)
+    saved = timeline.to_dict(now=now)
+    restored = FocusTimeline.from_dict(saved)
+    assert restored.to_dict() == saved
+    assert round(restored.time_per_app()["a"]) == 6
+    # Still recording after the restore
+    restored.observe("c", now=time.monotonic())
+    assert restored.current()[0] == "c"
@@ -0,0 +1,103 @@
+"""Enforcer: pid reuse must never freeze or kill an unrelated program."""
+
+from src.core.daemon import FocusDaemon
+from src.utils.enforcement import Enforcer
+from src.utils.foreground import ForegroundWindow
+from src.utils.processes import ProcessTable
+from src.utils.rules import SUSPEND, TERMINATE
+
+from tests.fakes import Clock, FakeSource, Foreground
+
+
+class RecordingBackend:
+    name = "recording"
+
+    def __init__(self):
+        self.calls = []
+
+    def suspend(self, pid):
+        self.calls.append(("suspend", pid))
+
+    def resume(self, pid):
+        self.calls.append(("resume", pid))
+
+    def terminate(self, pid):
+        self.calls.append(("terminate", pid))
+
+
+def make_enforcer(procs):
+    source, clock = FakeSource(procs), Clock()
+    table = ProcessTable(source, clock=clock)
+    backend = RecordingBackend()
+    return source, table, backend, Enforcer(table, backend=backend)
+
+
+def test_stale_pid_is_not_suspended():
+    source, table, backend, enforcer = make_enforcer({1234: ("discord.exe", 1.0)})
+    stale = table.pids_for_exe("discord.exe")
+    # discord exits and code.exe gets its pid before the next refresh
+    source.procs = {1234: ("code.exe", 2.0)}
+    assert not enforcer.enforce(SUSPEND, "discord.exe", "discord", stale)
+    assert backend.calls == []
+    assert enforcer.suspended == {}
+
+
+def test_stale_pid_is_not_terminated():
+    source, table, backend, enforcer = make_enforcer({1234: ("discord.exe", 1.0)})
+    source.procs = {1234: ("code.exe", 2.0)}
+    assert not enforcer.enforce(TERMINATE, "discord.exe", "discord", {1234})
+    assert backend.calls == []
+
+
+def test_resume_matches_start_time_not_name():
+    source, table, backend, enforcer = make_enforcer({1234: ("discord.exe", 1.0)})
+    assert enforcer.enforce(SUSPEND, "discord.exe", "discord")
+    assert enforcer.suspended[1234].started == 1.0
+    assert enforcer.resume_all() == 1
+    assert backend.calls == [("suspend", 1234), ("resume", 1234)]
+
+
+def test_resume_skips_a_pid_reused_after_suspend():
+    source, table, backend, enforcer = make_enforcer({1234: ("discord.exe", 1.0)})
+    enforcer.enforce(SUSPEND, "discord.exe", "discord")
+    # Killed while suspended; a new discord.exe reuses the pid
+    source.procs = {1234: ("discord.exe", 5.0)}
+    assert enforcer.resume_all() == 0
+    assert ("resume", 1234) not in backend.calls
+
+
+def test_adopts_rows_saved_without_start_time():
+    source, table, backend, enforcer = make_enforcer({1234: ("discord.exe", 1.0)})
+    enforcer.adopt([[1234, "discord.exe", "discord"]])
+    assert enforcer.resume_all() == 1
+    enforcer.enforce(SUSPEND, "discord.exe", "discord")
+    assert enforcer.snapshot() == [[1234, "discord.exe", "discord", 1.0]]
+
+
+def test_nothing_is_suspended_again_after_the_session_ends():
+    source = FakeSource({4243: ("steam.exe", 1.0)})
+    daemon = FocusDaemon(None, idle_exit_ms=None)
+    daemon.processes = ProcessTable(source, clock=Clock())
+    backend = RecordingBackend()
+    daemon.enforcer = Enforcer(daemon.processes, backend=backend)
+    daemon.foreground_backend = Foreground(ForegroundWindow("steam.exe", "library", 4243))
+    daemon.overlay_transitions.configure(0, 0, 0)
+    sent = []
+    daemon._broadcast = sent.append
+    daemon.state["sessionRules"] = {"allowedApps": [], "blockedApps": ["steam"],
+                                    "enforcement": {"steam": SUSPEND}}
+    daemon.state["activeSessionData"] = {"startTime": "test"}
+    daemon._apply_state()
+
+    daemon._check_active_window()
+    assert backend.calls == [("suspend", 4243)]
+
+    daemon.state["activeSessionData"] = {}
+    daemon._apply_state()
+    sent.clear()
+    # The rules stay in state and the desktop poll keeps running
+    daemon._check_active_window()
+    daemon._check_active_window()
+    assert not daemon.session_active
+    assert backend.calls == [("suspend", 4243), ("resume", 4243)]
+    assert not [m for m in sent if m["event"] == "overlay" and m["action"] == "show"]
@@ -0,0 +1,72 @@
+"""ProcessTable: pid reuse and exec() must not leave stale descriptions."""
+
+import os
+
+import pytest
+
+from src.utils.processes import ProcessInfo, ProcessTable, ProcSource
+
+from tests.fakes import Clock, FakeSource
+
+
+def make_table(procs):
+    source, clock = FakeSource(procs), Clock()
+    return source, clock, ProcessTable(source, clock=clock)
+
+
+def test_get_redescribes_a_reused_pid_on_a_cache_hit():
+    source, clock, table = make_table({1234: ("discord.exe", 1.0)})
+    assert table.get(1234).name == "discord.exe"
+    source.procs = {1234: ("code.exe", 2.0)}
+    # Still within min_interval_ms: no refresh, but the hit is checked
+    assert table.get(1234) == ProcessInfo(1234, "code.exe", "/apps/code.exe", 2.0)
+
+
+def test_refresh_drops_a_reused_pid_from_the_exe_index():
+    source, clock, table = make_table({1234: ("discord.exe", 1.0)})
+    assert table.pids_for_exe("discord.exe") == {1234}
+    source.procs = {1234: ("code.exe", 2.0)}
+    clock.now += 5
+    assert table.pids_for_exe("discord.exe") == set()
+    assert table.pids_for_exe("code.exe") == {1234}
+
+
+def test_subscribers_see_a_reused_pid_as_removed_and_added():
+    source, clock, table = make_table({1234: ("discord.exe", 1.0)})
+    deltas = []
+    table.subscribe(lambda added, removed: deltas.append((added, removed)))
+    source.procs = {1234: ("steam.exe", 3.0)}
+    table.refresh(force=True)
+    added, removed = deltas[-1]
+    assert [info.name for info in added] == ["steam.exe"]
+    assert [info.name for info in removed] == ["discord.exe"]
+
+
+def test_exec_keeping_pid_and_start_time_is_caught():
+    # ProcSource's identity includes comm, which exec() replaces
+    source, clock, table = make_table({77: ("bash", (100.0, "bash"))})
+    deltas = []
+    table.subscribe(lambda added, removed: deltas.append((added, removed)))
+    source.procs = {77: ("steam", (100.0, "steam"))}
+    table.refresh(force=True)
+    assert [info.name for info in deltas[-1][0]] == ["steam"]
+
+
+def test_unchanged_description_is_not_republished():
+    source, clock, table = make_table({5: ("app", 1.0)})
+    deltas = []
+    table.subscribe(lambda added, removed: deltas.append((added, removed)))
+    # A new identity that describes the same process (e.g. a comm rename
+    # back and forth) publishes nothing
+    source.procs = {5: ("app", 1.0)}
+    table._identity[5] = "stale"
+    table.refresh(force=True)
+    assert deltas == []
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs /proc")
+def test_proc_source_reads_start_time():
+    source = ProcSource()
+    me = source.describe(os.getpid())
+    assert me.started > 0
+    assert source.identities([os.getpid()])[os.getpid()][1] == me.started
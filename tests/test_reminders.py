@@ -0,0 +1,46 @@
+"""Reminder jobs follow the settings and the screen that shows them."""
+
+from src.utils.reminders import DEFAULT_HEALTH, sync_reminders
+from src.utils.scheduler import Scheduler
+
+from tests.fakes import Clock
+
+
+class Screen:
+    def __init__(self):
+        self.shown = []
+
+    def show(self, message):
+        self.shown.append(message)
+
+
+def test_unchanged_reminders_are_not_restarted():
+    scheduler = Scheduler(Clock())
+    screen = Screen()
+    sync_reminders(scheduler, DEFAULT_HEALTH, {}, screen.show)
+    break_job = scheduler.jobs["reminder.break"]
+
+    sync_reminders(scheduler, DEFAULT_HEALTH, {"postureTips": False}, screen.show)
+    assert "reminder.posture" not in scheduler.jobs
+    assert scheduler.jobs["reminder.break"] is break_job
+
+    sync_reminders(scheduler, dict(DEFAULT_HEALTH, break_reminder_interval=10), {}, screen.show)
+    assert scheduler.jobs["reminder.break"].interval_ms == 10 * 60 * 1000
+
+
+def test_a_new_screen_replaces_jobs_bound_to_the_old_one():
+    scheduler = Scheduler(Clock())
+    old, new = Screen(), Screen()
+    sync_reminders(scheduler, DEFAULT_HEALTH, {}, old.show)
+    sync_reminders(scheduler, DEFAULT_HEALTH, {}, new.show)
+
+    scheduler.jobs["reminder.hydration"].callback()
+    assert old.shown == []
+    assert new.shown == ["Time for a glass of water."]
+
+
+def test_muted_reminders_are_cancelled():
+    scheduler = Scheduler(Clock())
+    sync_reminders(scheduler, DEFAULT_HEALTH, {}, Screen().show)
+    sync_reminders(scheduler, dict(DEFAULT_HEALTH, mute_reminders=True), {}, Screen().show)
+    assert not [name for name in scheduler.jobs if name.startswith("reminder.")]
@@ -0,0 +1,189 @@
+"""TimerWheel and Scheduler, driven by a fake clock."""
+
+import random
+
+import pytest
+
+from src.utils.scheduler import LEVELS, RESOLUTION_MS, Scheduler, TimerWheel
+
+from tests.fakes import Clock
+
+TICKS_46H = 64 ** LEVELS
+
+
+# -- TimerWheel --------------------------------------------------------------
+
+@pytest.mark.parametrize("tick", [
+    1, 63, 64, 65,                      # level 0 -> 1
+    4095, 4096, 4097,                   # level 1 -> 2
+    64 ** 3 - 1, 64 ** 3, 64 ** 3 + 1,  # level 2 -> 3
+    TICKS_46H - 1, TICKS_46H, TICKS_46H + 1, 3 * TICKS_46H + 17,   # overflow
+])
+def test_item_expires_exactly_at_its_tick(tick):
+    wheel = TimerWheel()
+    wheel.insert("job", tick)
+    assert wheel.next_expiry() == tick
+    assert wheel.advance(tick - 1) == []
+    assert "job" in wheel
+    assert wheel.advance(tick) == ["job"]
+    assert len(wheel) == 0
+
+
+@pytest.mark.parametrize("start", [0, 63, 4095, 64 ** 3 - 5, TICKS_46H - 3])
+def test_step_by_step_across_cascades(start):
+    wheel = TimerWheel(start)
+    ticks = {f"j{i}": start + offset for i, offset in enumerate([1, 2, 64, 65, 4096, 4100, 70000])}
+    for item, tick in ticks.items():
+        wheel.insert(item, tick)
+    fired = {}
+    # Walk the driver's way: jump from one expiry to the next
+    while wheel.next_expiry() is not None:
+        at = wheel.next_expiry()
+        for item in wheel.advance(at):
+            fired[item] = at
+    assert fired == ticks
+
+
+def test_random_ticks_expire_in_order():
+    rng = random.Random(40)
+    wheel = TimerWheel(rng.randrange(10 ** 6))
+    ticks = {i: wheel.current + rng.choice([rng.randrange(64), rng.randrange(5000),
+                                            rng.randrange(10 ** 6), rng.randrange(10 ** 8)])
+             for i in range(500)}
+    for item, tick in ticks.items():
+        wheel.insert(item, tick)
+    order = []
+    for target in sorted(set(ticks.values())):
+        expired = wheel.advance(target)
+        assert all(ticks[item] == target for item in expired)
+        order.extend(expired)
+    assert sorted(order) == sorted(ticks)
+
+
+def test_remove_and_reinsert():
+    wheel = TimerWheel()
+    wheel.insert("a", 5000)
+    wheel.insert("a", 10)       # re-inserting moves it
+    wheel.insert("b", TICKS_46H + 5)
+    wheel.remove("b")
+    assert wheel.advance(TICKS_46H * 2) == ["a"]
+
+
+# -- Scheduler ---------------------------------------------------------------
+
+def make_scheduler():
+    clock = Clock()
+    clock.now = 1000.0
+    return clock, Scheduler(clock)
+
+
+def drive(scheduler, clock, seconds):
+    """Sleep exactly next_wakeup_ms() and run, like the UI driver."""
+    end = clock.now + seconds
+    wakeups = 0
+    while True:
+        delay = scheduler.next_wakeup_ms()
+        if delay is None or clock.now + delay / 1000 > end:
+            break
+        clock.now += delay / 1000
+        scheduler.run_due()
+        wakeups += 1
+        assert wakeups < 100000, "driver is spinning"
+    clock.now = end
+    return wakeups
+
+
+def test_periodic_job_runs_every_interval():
+    clock, scheduler = make_scheduler()
+    job = scheduler.add("tick", lambda: None, 1000)
+    drive(scheduler, clock, 10.0)
+    assert job.runs == 10
+
+
+def test_one_shot_delay_runs_once():
+    clock, scheduler = make_scheduler()
+    job = scheduler.add("once", lambda: None, delay_ms=250)
+    drive(scheduler, clock, 5.0)
+    assert job.runs == 1
+    assert "once" not in scheduler.jobs
+
+
+def test_jobs_past_the_wheel_span():
+    clock, scheduler = make_scheduler()
+    far = scheduler.add("far", lambda: None, delay_ms=50 * 3600 * 1000)
+    assert scheduler.next_wakeup_ms() == pytest.approx(50 * 3600 * 1000, abs=RESOLUTION_MS)
+    drive(scheduler, clock, 50 * 3600 - 1)
+    assert far.runs == 0
+    drive(scheduler, clock, 2)
+    assert far.runs == 1
+
+
+def test_coalesces_due_jobs_into_one_wakeup():
+    clock, scheduler = make_scheduler()
+    slack = scheduler.add("slack", lambda: None, delay_ms=1000, tolerance_ms=500)
+    strict = scheduler.add("strict", lambda: None, delay_ms=1200)
+    clock.now += scheduler.next_wakeup_ms() / 1000
+    assert sorted(scheduler.run_due()) == ["slack", "strict"]
+    assert (slack.runs, strict.runs, scheduler.wakeups) == (1, 1, 1)
+
+
+def test_tolerance_lets_a_job_wait_for_another_wakeup():
+    clock, scheduler = make_scheduler()
+    scheduler.add("a", lambda: None, 1000, tolerance_ms=300)
+    scheduler.add("b", lambda: None, 1100, tolerance_ms=300)
+    wakeups = drive(scheduler, clock, 11.5)
+    a, b = scheduler.jobs["a"], scheduler.jobs["b"]
+    assert (a.runs, b.runs) == (11, 10)
+    # Some runs shared a wakeup
+    assert wakeups < a.runs + b.runs
+
+
+def test_tolerance_is_capped_at_the_interval():
+    clock, scheduler = make_scheduler()
+    job = scheduler.add("fast", lambda: None, 10, tolerance_ms=100)
+    assert job.tolerance_ms == 10
+    drive(scheduler, clock, 1.0)
+    assert job.runs >= 50
+
+
+def test_missed_runs_are_skipped():
+    clock, scheduler = make_scheduler()
+    job = scheduler.add("tick", lambda: None, 1000)
+    clock.now += 10.5       # stalled (suspend, debugger)
+    scheduler.run_due()
+    assert job.runs == 1
+    assert scheduler.next_wakeup_ms() == pytest.approx(1000, abs=RESOLUTION_MS)
+
+
+def test_pause_keeps_the_time_left():
+    clock, scheduler = make_scheduler()
+    job = scheduler.add("reminder", lambda: None, 10000, group="session")
+    clock.now += 4.0
+    scheduler.pause("session")
+    assert scheduler.next_wakeup_ms() is None
+    clock.now += 60.0
+    assert scheduler.run_due() == []
+    scheduler.resume("session")
+    assert scheduler.next_wakeup_ms() == pytest.approx(6000, abs=RESOLUTION_MS)
+    drive(scheduler, clock, 6.0)
+    assert job.runs == 1
+
+
+def test_readding_a_name_restarts_its_delay():
+    clock, scheduler = make_scheduler()
+    calls = []
+    scheduler.add("debounce", lambda: calls.append(1), delay_ms=300)
+    for _ in range(5):
+        drive(scheduler, clock, 0.2)
+        scheduler.add("debounce", lambda: calls.append(1), delay_ms=300)
+    drive(scheduler, clock, 1.0)
+    assert calls == [1]
+
+
+def test_callback_may_cancel_a_job_due_in_the_same_wakeup():
+    clock, scheduler = make_scheduler()
+    second = scheduler.add("second", lambda: None, delay_ms=100)
+    scheduler.add("first", lambda: scheduler.cancel("second"), delay_ms=50, tolerance_ms=100)
+    clock.now += 0.1
+    assert scheduler.run_due() == ["first"]
+    assert second.runs == 0
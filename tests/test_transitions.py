@@ -0,0 +1,109 @@
+"""Overlay flap suppression: dwell, hysteresis and distraction coalescing."""
+
+from src.utils.transitions import OverlayTransitionController, Transition
+
+
+def controller(dwell_ms=0, hysteresis_ms=0, coalesce_ms=0):
+    return OverlayTransitionController(dwell_ms, hysteresis_ms, coalesce_ms)
+
+
+def test_block_must_last_the_dwell_before_showing():
+    overlay = controller(dwell_ms=500)
+    assert overlay.update("desktop", "Steam", "desktop", now=10.0) is None
+    assert overlay.evaluate(now=10.4) is None
+    assert overlay.evaluate(now=10.5) == Transition("show", "Steam", "desktop", True)
+    assert overlay.visible
+    assert overlay.evaluate(now=11.0) is None   # already shown
+
+
+def test_block_cleared_within_the_dwell_is_never_shown():
+    overlay = controller(dwell_ms=500)
+    overlay.update("desktop", "Steam", now=10.0)
+    assert overlay.update("desktop", None, now=10.2) is None
+    assert not overlay.visible
+    assert overlay.suppressed_flaps == 1
+    assert overlay.distractions == 0
+    # The next block waits a full dwell again
+    overlay.update("desktop", "Steam", now=11.0)
+    assert overlay.evaluate(now=11.4) is None
+
+
+def test_overlay_holds_until_clear_for_the_hysteresis():
+    overlay = controller(hysteresis_ms=1000)
+    overlay.update("desktop", "Steam", now=0.0)
+    assert overlay.update("desktop", None, now=1.0) is None
+    assert overlay.evaluate(now=1.9) is None
+    assert overlay.visible
+    assert overlay.evaluate(now=2.0) == Transition("hide")
+    assert not overlay.visible and overlay.shown_name is None
+
+
+def test_block_back_within_the_hysteresis_is_one_flap():
+    overlay = controller(hysteresis_ms=1000)
+    overlay.update("desktop", "Steam", now=0.0)
+    overlay.update("desktop", None, now=1.0)
+    assert overlay.update("desktop", "Steam", now=1.5) is None
+    assert overlay.suppressed_flaps == 1
+    # The clear timer starts over
+    overlay.update("desktop", None, now=2.0)
+    assert overlay.evaluate(now=2.9) is None
+    assert overlay.evaluate(now=3.0) == Transition("hide")
+    assert overlay.distractions == 1
+
+
+def test_reblock_within_the_coalesce_window_is_not_a_new_distraction():
+    overlay = controller(coalesce_ms=10000)
+    assert overlay.update("desktop", "Steam", now=0.0).new_distraction
+    assert overlay.update("desktop", None, now=1.0) == Transition("hide")
+    again = overlay.update("desktop", "Steam", now=5.0)
+    assert again == Transition("show", "Steam", "desktop", False)
+    assert (overlay.distractions, overlay.suppressed_flaps) == (1, 1)
+
+    overlay.update("desktop", None, now=6.0)
+    # Measured from the last block, so a steady flapper never counts again
+    assert not overlay.update("desktop", "Steam", now=14.0).new_distraction
+    overlay.update("desktop", None, now=16.0)
+    assert overlay.update("desktop", "Steam", now=26.0).new_distraction
+    assert overlay.distractions == 2
+
+
+def test_coalescing_is_per_app():
+    overlay = controller(coalesce_ms=10000)
+    overlay.update("desktop", "Steam", now=0.0)
+    switched = overlay.update("desktop", "Discord", now=1.0)
+    assert switched == Transition("show", "Discord", "desktop", True)
+    assert overlay.distractions == 2
+
+
+def test_latest_source_wins_and_the_other_remains():
+    overlay = controller(coalesce_ms=10000)
+    overlay.update("desktop", "Steam", "desktop", now=0.0)
+    assert overlay.update("web", "reddit.com", "web", now=1.0).name == "reddit.com"
+    assert overlay.update("web", None, now=2.0) == Transition("show", "Steam", "desktop", False)
+    assert overlay.update("desktop", None, now=3.0) == Transition("hide")
+
+
+def test_reset_counters_forgets_counts_and_coalescing():
+    overlay = controller(dwell_ms=500, coalesce_ms=10000)
+    overlay.update("desktop", "Steam", now=0.0)
+    overlay.update("desktop", None, now=0.1)
+    overlay.update("desktop", "Steam", now=1.0)
+    overlay.evaluate(now=1.5)
+    assert (overlay.distractions, overlay.suppressed_flaps) == (1, 1)
+
+    overlay.reset_counters()
+    assert (overlay.distractions, overlay.suppressed_flaps) == (0, 0)
+    overlay.update("desktop", None, now=2.0)
+    overlay.update("desktop", "Steam", now=3.0)
+    # Within the old coalesce window, but the new session counts it
+    assert overlay.evaluate(now=3.5).new_distraction
+    assert overlay.distractions == 1
+
+
+def test_dismissed_overlay_shows_again_on_the_next_block():
+    overlay = controller(hysteresis_ms=1000)
+    overlay.update("desktop", "Steam", now=0.0)
+    overlay.dismissed()
+    assert not overlay.visible
+    assert overlay.evaluate(now=0.5) is None
+    assert overlay.update("desktop", "Steam", now=1.0).action == "show"
@@ -0,0 +1,123 @@
+"""Tray mode deletes the screens, frees memory and replays what it missed.
+
+The window runs with the core daemon embedded, as in the tray benchmark.
+"""
+
+import gc
+import os
+import time
+
+import pytest
+from PyQt5 import sip
+from PyQt5.QtCore import QEvent
+
+from src.screens.registry import SCREENS, process_rss_kb, trim_process_memory
+
+
+def pump(app, seconds=0.0):
+    end = time.monotonic() + seconds
+    while True:
+        app.processEvents()
+        if time.monotonic() >= end:
+            break
+        time.sleep(0.005)
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+@pytest.fixture
+def window(qapp, tmp_path):
+    from src.main_window import MainWindow
+    from src.tray import TrayIcon
+    from src.utils.config import AppConfig
+
+    config = AppConfig(str(tmp_path / "config.json"))
+    config.set("settings.core_daemon", "embedded")
+    window = MainWindow(config)
+    if window.tray is None:
+        # No system tray offscreen; the icon just stays invisible
+        window.tray = TrayIcon(window)
+    window.show()
+    pump(qapp, 0.5)
+    window.state["sessionRules"] = {"allowedApps": ["code"], "blockedApps": ["steam"]}
+    window.state["activeSessionData"] = {"startTime": time.ctime(), "startEpoch": time.time(),
+                                         "distractionAttempts": 0}
+    for name in SCREENS:
+        if name not in ("splash", "dashboard"):
+            window._show_screen(name)
+            pump(qapp)
+    window.show_dashboard()
+    pump(qapp, 0.1)
+    yield window
+    watcher = window.core._embedded.web_watcher
+    window.quit_app()
+    pump(qapp, 0.1)
+    # Free the browser extension port for the next test's daemon
+    if watcher._thread is not None:
+        watcher._thread.join(timeout=2.0)
+
+
+def test_enter_tray_mode_deletes_the_screens(qapp, window):
+    screens = [getattr(window, spec.attribute) for spec in SCREENS.values()]
+    screens = [screen for screen in screens if screen is not None]
+    assert len(screens) > 1
+
+    window.enter_tray_mode()
+    pump(qapp)
+
+    assert window.in_tray
+    assert all(getattr(window, spec.attribute) is None for spec in SCREENS.values())
+    assert all(sip.isdeleted(screen) for screen in screens)
+    assert window.stacked_widget.count() == 0
+
+
+def test_distraction_in_the_tray_is_replayed_on_reopen(qapp, window):
+    window.enter_tray_mode()
+    pump(qapp)
+    window._record_distraction("Steam", "launch")
+
+    window.show_from_tray()
+    pump(qapp)
+
+    assert not window.in_tray
+    assert window.dashboard_screen.distraction_count == 1
+    assert window.dashboard_screen.distraction_log.breakdown().get("Steam") == 1
+
+
+def test_tray_mode_does_not_grow_rss(qapp, window, record_property):
+    before = process_rss_kb()
+    if before is None:
+        pytest.skip("RSS needs psutil")
+    window.enter_tray_mode()
+    pump(qapp, 0.1)
+    trim_process_memory()
+    after = process_rss_kb()
+
+    saved = before - after
+    record_property("tray_rss_saved_kb", saved)
+    print(f"tray mode: {before} KB -> {after} KB ({saved:+d} KB freed, pid {os.getpid()})")
+    assert after <= before
+
+
+def test_dashboard_jobs_do_not_outlive_it(qapp, window):
+    window.dashboard_screen._end_session()
+    pump(qapp)
+    window.enter_tray_mode()
+    pump(qapp)
+    window.show_from_tray()
+    pump(qapp)
+
+    window.state["activeSessionData"] = {"startTime": time.ctime(), "startEpoch": time.time(),
+                                         "distractionAttempts": 0}
+    window.show_dashboard()
+    pump(qapp)
+
+    dashboard = window.dashboard_screen
+    jobs = [job for job in window.scheduler.jobs.values() if job.group == "session"]
+    assert {"session.tip", "reminder.break"} <= {job.name for job in jobs}
+    for job in jobs:
+        # Called directly, so a job bound to a deleted widget raises here
+        dashboard.tip_label.clear()
+        job.callback()
+        if job.name != "session.tick":
+            assert dashboard.tip_label.text()